@@ -19,6 +19,10 @@ class FakeBrowserWidget(QWidget):
         self.list = QListWidget(self); v.addWidget(self.list, 1)
         self.q.returnPressed.connect(self.search)
 
+    def reset(self):
+        self.q.clear()
+        self.list.clear()
+
     def search(self):
         text = (self.q.text() or "").strip()
         self.list.clear()
@@ -0,0 +1,412 @@
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from PySide6.QtWidgets import (
+    QWidget, QHBoxLayout, QVBoxLayout, QLineEdit, QCheckBox, QToolButton, QLabel, QTextEdit
+)
+from PySide6.QtCore import Qt, QObject, QPoint, QRunnable, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QColor, QKeySequence, QShortcut, QTextCharFormat, QTextCursor
+from core.theme import set_style_state
+
+# Treffer werden in Paketen dieser Größe an den GUI-Thread gemeldet
+SEARCH_BATCH = 500
+# Obergrenze gesammelter Treffer (Suche bricht danach ab)
+MAX_MATCHES = 200_000
+# Mehr hervorgehobene Treffer als das passt nicht in einen Viewport
+MAX_VISIBLE_SELECTIONS = 1000
+SEARCH_DEBOUNCE_MS = 200
+
+MATCH_COLOR = "#ffe58a"
+CURRENT_COLOR = "#f4a300"
+
+_ASTRAL = re.compile("[\U00010000-\U0010FFFF]")
+
+
+def _utf16_mapper(text: str):
+    """Python-Index -> QTextDocument-Position (Zeichen außerhalb der BMP zählen doppelt)."""
+    if text.isascii():
+        return lambda i: i
+    astral = [m.start() for m in _ASTRAL.finditer(text)]
+    if not astral:
+        return lambda i: i
+    return lambda i: i + bisect_left(astral, i)
+
+
+class _SearchSignals(QObject):
+    batch = Signal(int, object, object)            # Such-Nr., Starts, Enden
+    finished = Signal(int, int, bool)              # Such-Nr., Treffer, abgeschnitten
+    replaced = Signal(int, int, int, str, int)     # Such-Nr., Start, Ende, neuer Text, Anzahl
+
+
+class _SearchTask(QRunnable):
+    """Regex-Suche über einen Text-Snapshot; optional Ersetzen-Text für Alle ersetzen."""
+    def __init__(self, search_id, text, regex, signals, cancelled, replacement=None):
+        super().__init__()
+        self.search_id = search_id
+        self.text = text
+        self.regex = regex
+        self.signals = signals
+        self.cancelled = cancelled
+        self.replacement = replacement
+
+    def run(self):
+        try:
+            if self.replacement is None:
+                self._find()
+            else:
+                self._replace()
+        except (re.error, IndexError):
+            # z.B. ungültige Gruppenreferenz im Ersetzen-Text
+            self.signals.finished.emit(self.search_id, -1, False)
+
+    def _matches(self):
+        for m in self.regex.finditer(self.text):
+            if self.cancelled.is_set():
+                return
+            if m.start() == m.end():
+                continue  # leere Treffer (z.B. ^) nicht markieren
+            yield m
+
+    def _find(self):
+        u16 = _utf16_mapper(self.text)
+        starts, ends = [], []
+        count = 0
+        truncated = False
+        for m in self._matches():
+            starts.append(u16(m.start()))
+            ends.append(u16(m.end()))
+            count += 1
+            if len(starts) >= SEARCH_BATCH:
+                self.signals.batch.emit(self.search_id, starts, ends)
+                starts, ends = [], []
+            if count >= MAX_MATCHES:
+                truncated = True
+                break
+        if self.cancelled.is_set():
+            return
+        if starts:
+            self.signals.batch.emit(self.search_id, starts, ends)
+        self.signals.finished.emit(self.search_id, count, truncated)
+
+    def _replace(self):
+        # Nur der Bereich vom ersten bis zum letzten Treffer wird neu aufgebaut
+        parts = []
+        first = last = None
+        count = 0
+        for m in self._matches():
+            if first is None:
+                first = m.start()
+            else:
+                parts.append(self.text[last:m.start()])
+            parts.append(m.expand(self.replacement))
+            last = m.end()
+            count += 1
+        if self.cancelled.is_set():
+            return
+        if first is None:
+            self.signals.replaced.emit(self.search_id, 0, 0, "", 0)
+            return
+        u16 = _utf16_mapper(self.text)
+        self.signals.replaced.emit(self.search_id, u16(first), u16(last), "".join(parts), count)
+
+
+class FindBar(QWidget):
+    """Suchen/Ersetzen-Leiste für ein QPlainTextEdit (Ctrl+F / Ctrl+H).
+
+    Gesucht wird auf einem Worker-Thread über einen Snapshot des Dokuments,
+    Treffer kommen paketweise zurück. Hervorgehoben werden nur die gerade
+    sichtbaren Treffer (extraSelections), Alle ersetzen ist ein einzelner
+    Undo-Schritt.
+    """
+    def __init__(self, edit, parent=None):
+        super().__init__(parent)
+        self.edit = edit
+        self.doc = edit.document()
+        self._starts = []
+        self._ends = []
+        self._current = -1
+        self._search_id = 0
+        self._revision = -1
+        self._cancelled = threading.Event()
+        self._shown_key = None
+
+        # Signale leben ohne Parent, damit laufende Tasks nie in ein gelöschtes Objekt senden
+        self._signals = _SearchSignals()
+        self._signals.batch.connect(self._on_batch)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.replaced.connect(self._on_replaced)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(SEARCH_DEBOUNCE_MS)
+        self._debounce.timeout.connect(self.search)
+
+        v = QVBoxLayout(self)
+        v.setContentsMargins(4, 2, 4, 2)
+        v.setSpacing(2)
+        find_row = QHBoxLayout()
+        self.find_edit = QLineEdit(self)
+        self.find_edit.setPlaceholderText("Suchen")
+        self.find_edit.textChanged.connect(self._debounce.start)
+        self.find_edit.returnPressed.connect(self.find_next)
+        self.regex_box = QCheckBox("Regex", self)
+        self.case_box = QCheckBox("Groß/klein", self)
+        self.regex_box.toggled.connect(self.search)
+        self.case_box.toggled.connect(self.search)
+        prev_btn = QToolButton(self)
+        prev_btn.setText("Zurück")
+        prev_btn.clicked.connect(self.find_previous)
+        next_btn = QToolButton(self)
+        next_btn.setText("Weiter")
+        next_btn.clicked.connect(self.find_next)
+        self.status = QLabel(self)
+        self.status.setObjectName("findstatus")
+        close_btn = QToolButton(self)
+        close_btn.setText("✕")
+        close_btn.clicked.connect(self.close_bar)
+        for w in (self.find_edit, self.regex_box, self.case_box, prev_btn, next_btn, self.status):
+            find_row.addWidget(w)
+        find_row.setStretch(0, 1)
+        find_row.addWidget(close_btn)
+        v.addLayout(find_row)
+
+        self.replace_row = QWidget(self)
+        replace_row = QHBoxLayout(self.replace_row)
+        replace_row.setContentsMargins(0, 0, 0, 0)
+        self.replace_edit = QLineEdit(self.replace_row)
+        self.replace_edit.setPlaceholderText("Ersetzen durch")
+        replace_btn = QToolButton(self.replace_row)
+        replace_btn.setText("Ersetzen")
+        replace_btn.clicked.connect(self.replace_current)
+        replace_all_btn = QToolButton(self.replace_row)
+        replace_all_btn.setText("Alle ersetzen")
+        replace_all_btn.clicked.connect(self.replace_all)
+        replace_row.addWidget(self.replace_edit, 1)
+        replace_row.addWidget(replace_btn)
+        replace_row.addWidget(replace_all_btn)
+        v.addWidget(self.replace_row)
+
+        QShortcut(QKeySequence("Escape"), self, activated=self.close_bar,
+                  context=Qt.WidgetWithChildrenShortcut)
+        QShortcut(QKeySequence("Shift+Return"), self.find_edit, activated=self.find_previous,
+                  context=Qt.WidgetShortcut)
+
+        self._match_format = QTextCharFormat()
+        self._match_format.setBackground(QColor(MATCH_COLOR))
+        self._current_format = QTextCharFormat()
+        self._current_format.setBackground(QColor(CURRENT_COLOR))
+
+        self.doc.contentsChange.connect(self._on_doc_changed)
+        self.edit.updateRequest.connect(self._refresh_selections)
+        self.hide()
+
+    # ---- Öffnen / Schließen ----
+    def open_find(self, replace=False):
+        # schreibgeschützt (große Datei, Live-Log): nur suchen
+        self.replace_row.setVisible(replace and not self.edit.isReadOnly())
+        selected = self.edit.textCursor().selectedText()
+        if selected and " " not in selected:
+            self.find_edit.setText(selected)
+        self.show()
+        self.find_edit.setFocus()
+        self.find_edit.selectAll()
+        self.search()
+
+    def close_bar(self):
+        self._cancel()
+        self._clear_matches()
+        self.hide()
+        self.edit.setFocus()
+
+    # ---- Suche ----
+    def _compile(self):
+        pattern = self.find_edit.text()
+        if not pattern:
+            return None
+        if not self.regex_box.isChecked():
+            pattern = re.escape(pattern)
+        flags = re.MULTILINE | (0 if self.case_box.isChecked() else re.IGNORECASE)
+        try:
+            return re.compile(pattern, flags)
+        except re.error as e:
+            self._set_status(f"Ungültiger Ausdruck: {e.msg}", error=True)
+            return None
+
+    def _cancel(self):
+        self._debounce.stop()
+        self._cancelled.set()
+        self._pool.clear()
+        self._cancelled = threading.Event()
+        self._search_id += 1
+
+    def _start(self, regex, replacement=None):
+        self._cancel()
+        self._revision = self.doc.revision()
+        task = _SearchTask(self._search_id, self.doc.toPlainText(), regex,
+                           self._signals, self._cancelled, replacement)
+        self._pool.start(task)
+
+    def search(self):
+        """Neue Suche mit dem aktuellen Muster starten (alte wird abgebrochen)."""
+        self._clear_matches()
+        if self.isHidden():
+            return
+        regex = self._compile()
+        if regex is None:
+            self._cancel()
+            if not self.find_edit.text():
+                self._set_status("")
+            return
+        self._set_status("Suche …")
+        self._start(regex)
+
+    def _on_batch(self, search_id, starts, ends):
+        if search_id != self._search_id:
+            return
+        self._starts.extend(starts)
+        self._ends.extend(ends)
+        self._set_status(f"{len(self._starts)} Treffer …")
+        # nur neu zeichnen, wenn das Paket den sichtbaren Bereich berührt
+        lo, hi = self._visible_range()
+        if starts[0] <= hi and ends[-1] >= lo:
+            self._refresh_selections()
+
+    def _on_finished(self, search_id, count, truncated):
+        if search_id != self._search_id:
+            return
+        if count < 0:
+            self._set_status("Ersetzen fehlgeschlagen", error=True)
+        elif count == 0:
+            self._set_status("Keine Treffer")
+        else:
+            self._set_status(f"{count}{'+' if truncated else ''} Treffer")
+
+    def _on_doc_changed(self, position, removed, added):
+        if self.isHidden():
+            return
+        # Positionen sind veraltet -> neu suchen, sobald das Tippen aufhört
+        self._clear_matches()
+        if self.find_edit.text():
+            self._debounce.start()
+
+    # ---- Navigation ----
+    def _select(self, index):
+        self._current = index
+        cursor = QTextCursor(self.doc)
+        cursor.setPosition(self._starts[index])
+        cursor.setPosition(self._ends[index], QTextCursor.KeepAnchor)
+        self.edit.setTextCursor(cursor)
+        self.edit.ensureCursorVisible()
+        self._shown_key = None
+        self._refresh_selections()
+        self._set_status(f"{index + 1} von {len(self._starts)}")
+
+    def find_next(self):
+        if not self._starts:
+            return
+        pos = self.edit.textCursor().selectionEnd()
+        idx = bisect_left(self._starts, pos)
+        self._select(idx % len(self._starts))
+
+    def find_previous(self):
+        if not self._starts:
+            return
+        pos = self.edit.textCursor().selectionStart()
+        idx = bisect_left(self._starts, pos) - 1
+        self._select(idx % len(self._starts))
+
+    # ---- Ersetzen ----
+    def replace_current(self):
+        if self.edit.isReadOnly():
+            self.replace_row.hide()
+            return
+        regex = self._compile()
+        cursor = self.edit.textCursor()
+        if regex is None or not cursor.hasSelection():
+            self.find_next()
+            return
+        m = regex.fullmatch(cursor.selectedText())
+        if m is None:
+            self.find_next()
+            return
+        try:
+            new = m.expand(self.replace_edit.text())
+        except (re.error, IndexError) as e:
+            self._set_status(f"Ungültige Ersetzung: {e}", error=True)
+            return
+        cursor.insertText(new)
+        self.edit.setTextCursor(cursor)
+        self.search()
+
+    def replace_all(self):
+        if self.edit.isReadOnly():
+            self.replace_row.hide()
+            return
+        regex = self._compile()
+        if regex is None:
+            return
+        self._set_status("Ersetze …")
+        self._start(regex, self.replace_edit.text())
+
+    def _on_replaced(self, search_id, start, end, text, count):
+        if search_id != self._search_id:
+            return
+        if self.edit.isReadOnly():
+            return  # inzwischen schreibgeschützt (z.B. Live-Log eingeschaltet)
+        if self.doc.revision() != self._revision:
+            self._set_status("Dokument wurde geändert – bitte erneut ersetzen", error=True)
+            return
+        if count:
+            # ein einziger Edit vom ersten bis zum letzten Treffer = ein Undo-Schritt
+            cursor = QTextCursor(self.doc)
+            cursor.beginEditBlock()
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.KeepAnchor)
+            cursor.insertText(text)
+            cursor.endEditBlock()
+        self._clear_matches()
+        self._set_status(f"{count} ersetzt")
+
+    # ---- Hervorhebung ----
+    def _visible_range(self):
+        edit = self.edit
+        first = edit.firstVisibleBlock().position()
+        vp = edit.viewport()
+        block = edit.cursorForPosition(QPoint(vp.width(), vp.height())).block()
+        return first, block.position() + block.length()
+
+    def _refresh_selections(self, *_):
+        if not self._starts:
+            if self._shown_key is not None:
+                self._shown_key = None
+                self.edit.setExtraSelections([])
+            return
+        lo, hi = self._visible_range()
+        a = max(0, bisect_right(self._ends, lo) - 1)
+        b = min(bisect_left(self._starts, hi), a + MAX_VISIBLE_SELECTIONS)
+        key = (a, b, self._current)
+        if key == self._shown_key:
+            return  # setExtraSelections selbst löst wieder updateRequest aus
+        self._shown_key = key
+        selections = []
+        for i in range(a, b):
+            sel = QTextEdit.ExtraSelection()
+            cursor = QTextCursor(self.doc)
+            cursor.setPosition(self._starts[i])
+            cursor.setPosition(self._ends[i], QTextCursor.KeepAnchor)
+            sel.cursor = cursor
+            sel.format = self._current_format if i == self._current else self._match_format
+            selections.append(sel)
+        self.edit.setExtraSelections(selections)
+
+    def _clear_matches(self):
+        self._starts = []
+        self._ends = []
+        self._current = -1
+        self._refresh_selections()
+
+    def _set_status(self, text, error=False):
+        self.status.setText(text)
+        set_style_state(self.status, "error", error)
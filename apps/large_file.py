@@ -0,0 +1,260 @@
+import mmap
+import threading
+from bisect import bisect_right
+from collections import deque
+from pathlib import Path
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from PySide6.QtGui import QTextCursor
+
+# Ab dieser Größe öffnet Notepad Dateien im Large-File-Modus
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+# Byte-Abstand der Zeilen-Checkpoints im Index
+INDEX_STRIDE = 1024 * 1024
+# Pro Nachladen angefügte Datenmenge (sichtbarer Bereich + Prefetch)
+PREFETCH_BYTES = 256 * 1024
+# Höchstens so viele Prefetch-Bereiche stehen gleichzeitig im Editor (~1 MB)
+WINDOW_CHUNKS = 4
+
+
+def is_large_file(path) -> bool:
+    try:
+        return Path(path).stat().st_size >= LARGE_FILE_THRESHOLD
+    except OSError:
+        return False
+
+
+class _IndexSignals(QObject):
+    progress = Signal(int)               # 0..100
+    finished = Signal(int, object)       # Gesamtzeilen, Checkpoints [(zeile, offset)]
+
+
+class _LineIndexTask(QRunnable):
+    """Zählt Zeilen und legt etwa jedes MB einen Checkpoint (Zeile, Offset) an."""
+    def __init__(self, mm, signals, cancelled: threading.Event):
+        super().__init__()
+        self.mm = mm
+        self.signals = signals
+        self.cancelled = cancelled
+
+    def run(self):
+        mm = self.mm
+        size = len(mm)
+        checkpoints = [(0, 0)]
+        lines = 0
+        pos = 0
+        last_pct = -1
+        try:
+            while pos < size:
+                if self.cancelled.is_set():
+                    return
+                end = min(size, pos + INDEX_STRIDE)
+                # Checkpoint am nächsten Zeilenanfang nach der Stride-Grenze
+                nl = mm.find(b"\n", end) if end < size else -1
+                stop = size if nl < 0 else nl + 1
+                lines += mm[pos:stop].count(b"\n")
+                pos = stop
+                if pos < size:
+                    checkpoints.append((lines, pos))
+                pct = pos * 100 // size
+                if pct != last_pct:
+                    last_pct = pct
+                    self.signals.progress.emit(pct)
+        except (ValueError, OSError):
+            # mmap wurde während des Abbruchs geschlossen
+            return
+        if size and mm[size - 1:size] != b"\n":
+            lines += 1
+        self.signals.finished.emit(lines, checkpoints)
+
+
+class LargeFileLoader(QObject):
+    """Memory-mapped Datei, die blockweise (an Zeilengrenzen) ausgelesen wird.
+
+    Der Zeilenindex entsteht auf einem Worker-Thread (progress/indexed) und
+    rechnet danach zwischen Zeilennummer und Byte-Offset um; read_forward()
+    und read_backward() liefern Prefetch-Bereiche als Text.
+    """
+    progress = Signal(int)
+    indexed = Signal(int)
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._file = self.path.open("rb")
+        self.mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.total_lines = None
+        self.checkpoints = []
+        self._cancelled = threading.Event()
+        self._signals = _IndexSignals(self)
+        self._signals.progress.connect(self.progress)
+        self._signals.finished.connect(self._on_indexed)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._pool.start(_LineIndexTask(self.mm, self._signals, self._cancelled))
+
+    def _on_indexed(self, lines, checkpoints):
+        self.total_lines = lines
+        self.checkpoints = checkpoints
+        self.indexed.emit(lines)
+
+    @property
+    def size(self):
+        return len(self.mm) if self.mm is not None else 0
+
+    def read_forward(self, start, size=PREFETCH_BYTES):
+        """(Text, Ende) ab `start` bis zur nächsten Zeilengrenze nach `size` Bytes."""
+        mm = self.mm
+        end = min(len(mm), start + size)
+        if end < len(mm):
+            nl = mm.find(b"\n", end)
+            end = len(mm) if nl < 0 else nl + 1
+        return self._decode(start, end), end
+
+    def read_backward(self, end, size=PREFETCH_BYTES):
+        """(Text, Anfang) der ganzen Zeilen, die höchstens `size` Bytes vor `end` beginnen."""
+        start = max(0, end - size)
+        if start > 0:
+            nl = self.mm.rfind(b"\n", 0, start)
+            start = nl + 1 if nl >= 0 else 0
+        return self._decode(start, end), start
+
+    def _decode(self, start, end):
+        text = self.mm[start:end].decode("utf-8", errors="replace")
+        return text[:-1] if text.endswith("\n") else text
+
+    def offset_of_line(self, line):
+        """Byte-Offset des Anfangs von Zeile `line` (0-basiert; braucht den Index)."""
+        cp_line, offset = self.checkpoints[bisect_right(self.checkpoints, (line, float("inf"))) - 1]
+        for _ in range(line - cp_line):
+            nl = self.mm.find(b"\n", offset)
+            if nl < 0:
+                break
+            offset = nl + 1
+        return offset
+
+    def line_of_offset(self, offset):
+        """Zeilennummer (0-basiert) zum Byte-Offset `offset` (braucht den Index)."""
+        pos = bisect_right([cp_offset for _, cp_offset in self.checkpoints], offset) - 1
+        cp_line, cp_offset = self.checkpoints[pos]
+        return cp_line + self.mm[cp_offset:offset].count(b"\n")
+
+    def cancel(self):
+        """Nur die Indexierung abbrechen; die Datei bleibt lesbar."""
+        self._cancelled.set()
+        self._pool.waitForDone()
+
+    def close(self):
+        """Indexierung abbrechen und Datei freigeben."""
+        self.cancel()
+        if self.mm is not None:
+            self.mm.close()
+            self.mm = None
+            self._file.close()
+
+
+class LargeFileView(QObject):
+    """Begrenzter Ausschnitt einer LargeFileLoader-Datei in einem QPlainTextEdit.
+
+    Im Editor stehen höchstens WINDOW_CHUNKS Prefetch-Bereiche. Erreicht die
+    Scrollposition einen Rand, wird dort nachgeladen und auf der anderen
+    Seite verworfen; der Speicher bleibt unabhängig von der Dateigröße.
+    Undo ist dabei aus, sonst hielte der Undo-Stack die verworfenen Zeilen.
+    """
+    def __init__(self, loader, edit, parent=None):
+        super().__init__(parent)
+        self.loader = loader
+        self.edit = edit
+        self.doc = edit.document()
+        self._chunks = deque()  # [Anfang, Ende, Zeilen] in Dokumentreihenfolge
+        self._filling = False   # eigene Änderungen verschieben die Scrollbar -> nicht erneut füllen
+        self._undo = self.doc.isUndoRedoEnabled()
+        self.doc.setUndoRedoEnabled(False)
+        self._bar = edit.verticalScrollBar()
+        self._bar.valueChanged.connect(self.fill)
+
+    @property
+    def start(self):
+        return self._chunks[0][0] if self._chunks else 0
+
+    @property
+    def end(self):
+        return self._chunks[-1][1] if self._chunks else 0
+
+    def show_from(self, offset=0):
+        """Ausschnitt ab Byte `offset` (Zeilenanfang) anzeigen."""
+        text, end = self.loader.read_forward(offset)
+        self._filling = True
+        try:
+            self.edit.setPlainText(text)
+            self._chunks = deque([[offset, end, text.count("\n") + 1]])
+        finally:
+            self._filling = False
+        self.fill()
+
+    def goto_line(self, line):
+        """Zeile `line` (0-basiert) in den Ausschnitt holen und den Cursor dorthin setzen."""
+        offset = self.loader.offset_of_line(line)
+        if not self.start <= offset < self.end:
+            self.show_from(self.loader.offset_of_line(max(0, line - 20)))
+        block_no = line - self.loader.line_of_offset(self.start)
+        block = self.doc.findBlockByNumber(max(0, min(block_no, self.doc.blockCount() - 1)))
+        cursor = QTextCursor(block)
+        self.edit.setTextCursor(cursor)
+        self.edit.centerCursor()
+
+    def fill(self, *_):
+        if self._filling:
+            return
+        self._filling = True
+        try:
+            self._fill()
+        finally:
+            self._filling = False
+
+    def _fill(self):
+        bar = self._bar
+        # unten: nachladen, solange weniger als 2 Seiten Vorrat
+        while self.end < self.loader.size and bar.value() >= bar.maximum() - 2 * bar.pageStep():
+            before = bar.maximum()
+            text, end = self.loader.read_forward(self.end)
+            self._insert(QTextCursor.End, "\n" + text)
+            self._chunks.append([self.end, end, text.count("\n") + 1])
+            if len(self._chunks) > WINDOW_CHUNKS:
+                self._drop_first()
+            if bar.maximum() == before:
+                break
+        # oben: vorherigen Bereich holen, wenn der Anfang fast erreicht ist
+        while self.start > 0 and bar.value() <= bar.pageStep():
+            text, start = self.loader.read_backward(self.start)
+            lines = text.count("\n") + 1
+            value = bar.value()
+            self._insert(QTextCursor.Start, text + "\n")
+            self._chunks.appendleft([start, self.start, lines])
+            bar.setValue(value + lines)
+            if len(self._chunks) > WINDOW_CHUNKS:
+                self._drop_last()
+
+    def _insert(self, where, text):
+        cursor = QTextCursor(self.doc)
+        cursor.movePosition(where)
+        cursor.insertText(text)
+
+    def _drop_first(self):
+        lines = self._chunks.popleft()[2]
+        value = self._bar.value()
+        cursor = QTextCursor(self.doc)
+        cursor.setPosition(self.doc.findBlockByNumber(lines).position(), QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        self._bar.setValue(max(0, value - lines))
+
+    def _drop_last(self):
+        lines = self._chunks.pop()[2]
+        last_kept = self.doc.findBlockByNumber(self.doc.blockCount() - lines - 1)
+        cursor = QTextCursor(self.doc)
+        cursor.setPosition(last_kept.position() + last_kept.length() - 1)
+        cursor.movePosition(QTextCursor.End, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+
+    def close(self):
+        self._bar.valueChanged.disconnect(self.fill)
+        self.doc.setUndoRedoEnabled(self._undo)
@@ -0,0 +1,100 @@
+import re
+from PySide6.QtCore import QObject
+from PySide6.QtGui import QColor, QFont, QTextCharFormat, QTextLayout
+from apps.text_edits import _utf16_len
+
+# Regeln werden einmal kompiliert: Level am Zeilenanfang (Einrückung erlaubt)
+_LEVEL_RE = re.compile(r"^\s*\[(INFO|WARN|ERROR)\]")
+LEVEL_COLORS = {
+    "INFO": ("#1f6feb", False),
+    "WARN": ("#b35900", True),
+    "ERROR": ("#c42b1c", True),
+}
+
+_DIRTY = -1   # Standard-userState neuer Blöcke
+_CLEAN = 1
+
+
+def _level_formats():
+    formats = {}
+    for level, (color, bold) in LEVEL_COLORS.items():
+        fmt = QTextCharFormat()
+        fmt.setForeground(QColor(color))
+        if bold:
+            fmt.setFontWeight(QFont.Bold)
+        formats[level] = fmt
+    return formats
+
+
+class LogLevelHighlighter(QObject):
+    """Färbt [INFO]/[WARN]/[ERROR]-Zeilen eines QPlainTextEdit inkrementell.
+
+    Anders als QSyntaxHighlighter wird nie das ganze Dokument bearbeitet:
+    Edits markieren nur die betroffenen Blöcke als "dirty", formatiert
+    werden ausschließlich sichtbare dirty-Blöcke (bei Edit, Scroll, Resize).
+    """
+    def __init__(self, edit, parent=None):
+        super().__init__(parent or edit)
+        self.edit = edit
+        self.doc = edit.document()
+        self._formats = _level_formats()
+        self._applying = False
+        self._busy = False
+        self.doc.contentsChange.connect(self._on_change)
+        self.edit.updateRequest.connect(self._on_update_request)
+
+    def _on_change(self, position, removed, added):
+        if self._applying:
+            return
+        # Blöcke zwischen erstem und letztem sind neu eingefügt und haben
+        # ohnehin userState -1; nur die Randblöcke können alten Zustand tragen
+        for block in (self.doc.findBlock(position), self.doc.findBlock(position + added)):
+            if block.isValid():
+                block.setUserState(_DIRTY)
+
+    def _on_update_request(self, rect, dy):
+        self.highlight_visible()
+
+    def highlight_visible(self):
+        """Alle sichtbaren, noch nicht formatierten Blöcke formatieren."""
+        # markContentsDirty löst synchron ein neues updateRequest aus
+        if self._busy:
+            return
+        self._busy = True
+        try:
+            self._highlight_visible()
+        finally:
+            self._busy = False
+
+    def _highlight_visible(self):
+        edit = self.edit
+        block = edit.firstVisibleBlock()
+        offset = edit.contentOffset()
+        bottom = edit.viewport().height()
+        while block.isValid():
+            top = edit.blockBoundingGeometry(block).translated(offset).top()
+            if top > bottom:
+                break
+            if block.userState() != _CLEAN and block.isVisible():
+                self._apply(block)
+            block = block.next()
+
+    def _apply(self, block):
+        text = block.text()
+        ranges = []
+        m = _LEVEL_RE.match(text)
+        if m:
+            rng = QTextLayout.FormatRange()
+            rng.start = 0
+            rng.length = _utf16_len(text)
+            rng.format = self._formats[m.group(1)]
+            ranges.append(rng)
+        layout = block.layout()
+        if ranges or layout.formats():
+            layout.setFormats(ranges)
+            self._applying = True
+            try:
+                self.doc.markContentsDirty(block.position(), block.length())
+            finally:
+                self._applying = False
+        block.setUserState(_CLEAN)
@@ -1,13 +1,73 @@
-from pathlib import Path
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPlainTextEdit, QFileDialog, QMessageBox
-from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QPlainTextEdit, QFileDialog, QMessageBox,
+    QProgressBar, QToolButton, QInputDialog
+)
+from PySide6.QtCore import QCoreApplication, Signal
 from PySide6.QtGui import QTextCursor, QShortcut
 from PySide6.QtGui import QKeySequence
-from datetime import datetime
+from apps.text_edits import DocumentEditor
+from apps.log_highlighter import LogLevelHighlighter
+from apps.find_bar import FindBar
+from apps.large_file import LargeFileLoader, LargeFileView, is_large_file
+from core.systemlog import SANDBOX, SYSTEMLOG, LogTail
+from core.config import STATE
+from core.storage import EditJournal, get_writer
+from core.clock import get_clock
+from core.scheduler import get_scheduler
+from core.scenario import get_scenario_engine
+from core.theme import ensure_theme, set_style_state
 
-SANDBOX = Path(__file__).resolve().parents[1] / "sandbox"
 SANDBOX.mkdir(parents=True, exist_ok=True)
-SYSTEMLOG = SANDBOX / "systemlog.txt"
+
+# Live-Log: maximale Anzahl angezeigter Zeilen (ältere fallen oben heraus)
+LIVE_LOG_MAX_BLOCKS = 2000
+
+# Journal-Dateien offener Notepads (pro Benutzer durchnummeriert)
+_OPEN_JOURNALS = set()
+
+
+def _claim_journal(user):
+    """Freien Journal-Pfad für diesen Benutzer reservieren."""
+    if not _OPEN_JOURNALS:
+        # sauberes Programmende -> keine Journale liegen lassen
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(_release_all_journals)
+    i = 0
+    while True:
+        name = f"notepad-{user}.journal" if i == 0 else f"notepad-{user}-{i}.journal"
+        path = STATE / name
+        if path not in _OPEN_JOURNALS:
+            _OPEN_JOURNALS.add(path)
+            return path
+        i += 1
+
+
+def _release_journal(path):
+    if path in _OPEN_JOURNALS:
+        _OPEN_JOURNALS.discard(path)
+        try:
+            get_writer().submit(_remove_file, path)
+        except RuntimeError:
+            # Programmende: Writer-Thread existiert nicht mehr
+            _remove_file(path)
+
+
+def _release_all_journals():
+    for path in list(_OPEN_JOURNALS):
+        _release_journal(path)
+    get_writer().wait()
+
+
+def _remove_file(path):
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+LINE_STABLE = "[INFO] Umgebung: stabil"
+LINE_UNSTABLE = "[WARN] Umgebung: instabil"
+LINE_UNTRUSTED = "[ERROR] Umgebung: nicht vertrauenswürdig"
 
 # Sound-Import
 try:
@@ -18,125 +78,206 @@ except Exception:
     SoundPlayer = None
 
 class NotepadWidget(QWidget):
-    def __init__(self, session=None, parent=None):
+    state_changed = Signal()   # Dokument oder Modus geändert (Sitzungs-Snapshot)
+    cursor_changed = Signal()  # nur der Cursor bewegt (eigener, kleiner Abschnitt)
+
+    def __init__(self, session=None, parent=None, prewarm=False):
         super().__init__(parent)
         self.session = session
+        self._started = False
         self.sound = SoundPlayer() if SOUND_AVAILABLE else None
         self.close_attempts = 0
-        self.manipulation_triggered = False
+        self.scheduler = get_scheduler()
+        self.scenario = get_scenario_engine()
+        _register_scenario_actions(self.scenario)
         
         v = QVBoxLayout(self)
         
         # Text-Editor
+        # Aussehen (inkl. invertierter Glitch-Variante) kommt aus core.theme
+        ensure_theme()
         self.edit = QPlainTextEdit(self)
-        self.edit.setStyleSheet("""
-            QPlainTextEdit {
-                background: #ffffff;
-                color: #000000;
-                font-family: 'Consolas', 'Courier New', monospace;
-                font-size: 11px;
-                border: none;
-            }
-        """)
+        self.edit.setObjectName("notepad")
         v.addWidget(self.edit, 1)
+        self.edit.document().contentsChanged.connect(self.state_changed)
+        self.edit.cursorPositionChanged.connect(self.cursor_changed)
+        # Skript-Edits laufen über gezielte Cursor-Operationen (kein setPlainText)
+        self.editor = DocumentEditor(self.edit.document(), watch=(LINE_STABLE, LINE_UNSTABLE))
+        # Log-Level-Farben: nur sichtbare, geänderte Blöcke werden formatiert
+        self.highlighter = LogLevelHighlighter(self.edit)
+        # Suchen/Ersetzen (Ctrl+F / Ctrl+H), Suche läuft im Hintergrund
+        self.find_bar = FindBar(self.edit, self)
+        v.insertWidget(0, self.find_bar)
+
+        # Fortschritt beim Indexieren großer Dateien (mit Abbrechen)
+        self._large_file = None
+        self._large_view = None
+        self.progress_row = QWidget(self)
+        row = QHBoxLayout(self.progress_row)
+        row.setContentsMargins(0, 0, 0, 0)
+        self.progress = QProgressBar(self.progress_row)
+        self.progress.setRange(0, 100)
+        self.progress.setFormat("Indexiere Datei … %p%")
+        cancel = QToolButton(self.progress_row)
+        cancel.setText("Abbrechen")
+        cancel.clicked.connect(self._cancel_large_file)
+        row.addWidget(self.progress, 1)
+        row.addWidget(cancel)
+        self.progress_row.hide()
+        v.addWidget(self.progress_row)
         
         # No bottom buttons: Notepad uses standard window chrome. Provide keyboard
         # shortcuts for New/Open/Save to keep functionality.
         QShortcut(QKeySequence("Ctrl+N"), self, activated=self.new_file)
         QShortcut(QKeySequence("Ctrl+O"), self, activated=self.load_file)
         QShortcut(QKeySequence("Ctrl+S"), self, activated=self.save_file)
-        
-        # Autoload systemlog.txt
-        self._autoload_systemlog()
-        
-        # Timer für Manipulation
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._manipulate_text)
-        self.timer.start(5000)  # Nach 5 Sekunden starten
-        
+        QShortcut(QKeySequence("Ctrl+L"), self, activated=self.toggle_live_log)
+        QShortcut(QKeySequence("Ctrl+G"), self, activated=self.goto_line)
+        QShortcut(QKeySequence("Ctrl+F"), self, activated=self.find_bar.open_find)
+        QShortcut(QKeySequence("Ctrl+H"), self, activated=lambda: self.find_bar.open_find(replace=True))
+        self._live_tail = None
+
+        # vorgewärmt (App-Pool): Sitzung erst bei der Übergabe starten (reset)
+        if not prewarm:
+            self._start_session()
+
+    def reset(self, path=None, text=None):
+        """Frischer Zustand für die Übergabe: startet eine vorgewärmte Instanz, sonst wie Ctrl+N.
+
+        Mit `path`/`text` (Taskleisten-Suche) wird direkt das gewünschte
+        Dokument geöffnet, ohne vorher systemlog.txt anzulegen.
+        """
+        if not self._started:
+            self._start_session(path=path, text=text)
+        elif path is not None:
+            self.open_path(path)
+        elif text is not None:
+            self.open_text(text)
+        else:
+            self.new_file()
+
+    def restore(self, state):
+        """Stand aus dem Sitzungs-Snapshot übernehmen (statt reset())."""
+        if self._started:
+            self.edit.setPlainText(state.get("text", ""))
+            self.journal.start()
+        else:
+            self._start_session(state)
+
+    def suspend(self):
+        """Fenster versteckt: Live-Log anhalten, Journal sofort schreiben.
+
+        Geplante Szenario-Aktionen hält der Desktop über den Scheduler an.
+        """
+        if self._live_tail is not None:
+            self._live_tail.stop()
+        if self._started:
+            self.journal.flush()
+
+    def resume(self):
+        if self._live_tail is not None:
+            self._live_tail.resume()
+
+    def snapshot_state(self):
+        """Zustand für den Sitzungs-Snapshot (None = noch nichts zu sichern)."""
+        if not self._started:
+            return None
+        state = {"close_attempts": self.close_attempts}
+        if self._live_tail is not None:
+            state["live"] = True
+        elif self._large_file is not None:
+            state["file"] = str(self._large_file.path)
+        else:
+            state["text"] = self.edit.toPlainText()
+        return state
+
+    def cursor_state(self):
+        """Cursorposition für den Sitzungs-Snapshot (ohne den Text neu zu sichern)."""
+        if not self._started:
+            return None
+        return {"cursor": self.edit.textCursor().position()}
+
+    def _start_session(self, state=None, path=None, text=None):
+        self._started = True
+        state = state or {}
+        opened = path is not None or text is not None
+        # Text-Trigger (on: text) sehen nur die jeweils geänderten Bereiche
+        self.scenario.watch_document(self.edit.document(), **self._scenario_context())
+
+        # Stand aus dem Sitzungs-Snapshot (wird öfter geschrieben als das Journal),
+        # sonst nach einem Crash das Absturz-Journal, sonst systemlog.txt frisch anlegen
+        # (außer die Suche öffnet gleich ein bestimmtes Dokument)
+        user = self.session.current_user if self.session else "Unknown"
+        self._journal_path = _claim_journal(user)
+        recovered = None if state or opened else EditJournal.recover(self._journal_path)
+        if "text" in state:
+            self.edit.setPlainText(state["text"])
+        elif text is not None:
+            self.edit.setPlainText(text)
+        elif recovered is not None:
+            self.edit.setPlainText(recovered)
+        elif not state and not opened:
+            self._autoload_systemlog()
+        self.journal = EditJournal(self.edit.document(), self._journal_path, parent=self)
+        self.journal.start()
+        journal_path = self._journal_path
+        self.destroyed.connect(lambda *_: _release_journal(journal_path))
+        if path is not None:
+            try:
+                self._load_path(path)
+            except Exception as e:
+                QMessageBox.warning(self, "Fehler", f"Fehler beim Öffnen: {e}")
+        elif state.get("live"):
+            self.set_live_log(True)
+        elif state.get("file"):
+            try:
+                # Datei kann seit dem Snapshot geschrumpft oder verschwunden sein
+                self._load_path(state["file"])
+            except (OSError, ValueError) as e:
+                print(f"⚠ Notepad: {state['file']} nicht wiederhergestellt ({e})")
+                self.journal.start()
+        if "cursor" in state and self._live_tail is None:
+            cursor = self.edit.textCursor()
+            cursor.setPosition(min(state["cursor"], self.edit.document().characterCount() - 1))
+            self.edit.setTextCursor(cursor)
+        self.close_attempts = state.get("close_attempts", 0)
+
+        # Skriptablauf (Manipulation, Glitch, ...) kommt aus config/scenario.yaml
+        self._emit_scenario("notepad.open")
+
     def _autoload_systemlog(self):
         """Lade oder erstelle systemlog.txt mit initialen Logs"""
         # Erstelle IMMER frischen Inhalt (keine alten Zustände laden)
-        initial_log = f"""[INFO] Sitzung gestartet: {datetime.now().strftime('%H:%M')}
+        initial_log = f"""[INFO] Sitzung gestartet: {get_clock().now().strftime('%H:%M')}
 [INFO] Benutzer: {self.session.current_user if self.session else 'Unknown'}
 [INFO] Umgebung: stabil
 """
         # Setze frischen Inhalt
         self.edit.setPlainText(initial_log)
         
-        # Speichere als neuen Ausgangspunkt
-        SANDBOX.mkdir(parents=True, exist_ok=True)
-        SYSTEMLOG.write_text(initial_log, encoding='utf-8')
-    
-    def _manipulate_text(self):
-        """Manipuliere Text basierend auf Zeit und Benutzer - volle FeatureNodepad Implementation"""
-        if self.manipulation_triggered:
-            return
-        
-        text = self.edit.toPlainText()
-        
-        # Phase 1: stabil → instabil
-        if "[INFO] Umgebung: stabil" in text:
-            text = text.replace(
-                "[INFO] Umgebung: stabil",
-                "[WARN] Umgebung: instabil"
-            )
-            self.edit.setPlainText(text)
-            QTimer.singleShot(2000, self._phase2_manipulation)
-            return
-        
-    def _phase2_manipulation(self):
-        """Phase 2: instabil → nicht vertrauenswürdig"""
-        text = self.edit.toPlainText()
-        
-        if "[WARN] Umgebung: instabil" in text:
-            text = text.replace(
-                "[WARN] Umgebung: instabil",
-                "[ERROR] Umgebung: nicht vertrauenswürdig"
-            )
-            self.edit.setPlainText(text)
-            self._trigger_glitch()
-            
-            # Username-Trigger für Milan
-            if self.session and self.session.current_user == "Milan":
-                QTimer.singleShot(1000, self._username_trigger)
-            
-            # Suggestive Phrasen nach 5 Sekunden
-            QTimer.singleShot(5000, self._suggestive_trigger)
-            
-            self.manipulation_triggered = True
-    
-    def _username_trigger(self):
-        """Spezielle Reaktion wenn Benutzer 'Milan' ist"""
-        text = self.edit.toPlainText()
-        trigger_text = """
-        [INFO] Willkommen zurück, Milan.
-        [INFO] Letzter Zugriff: 03:33 Uhr
-        [INFO] Beobachtung fortgesetzt."""
-
-        new_text = text + trigger_text
-        self.edit.setPlainText(new_text)
-        
-        # Sound abspielen wenn "Beobachtung" erwähnt wird
-        if self.sound:
-            try:
-                # observer.wav spielen (falls vorhanden)
-                from core.sound import ROOT
-                observer_sound = ROOT / "assets" / "sfx" / "observer.wav"
-                if observer_sound.exists():
-                    self.sound.play("observer")
-            except Exception:
-                pass
-    
-    def _suggestive_trigger(self):
-        """Füge suggestive Phrasen hinzu"""
-        text = self.edit.toPlainText()
-        trigger = """
-[INFO] Du hast dich erneut eingeloggt.
-[INFO] Du weißt, dass das nicht empfohlen wurde."""
-        
-        self.edit.setPlainText(text + trigger)
+        # Speichere als neuen Ausgangspunkt (atomar, im Hintergrund)
+        get_writer().write_text(SYSTEMLOG, initial_log)
     
+    def _scenario_context(self):
+        user = self.session.current_user if self.session else "Unknown"
+        return {"app": "notepad", "target": self, "user": user}
+
+    def _emit_scenario(self, event):
+        self.scenario.emit(event, **self._scenario_context())
+
+    # ---- Szenario-Aktionen (siehe _register_scenario_actions) ----
+    def scripted_replace_line(self, old, new):
+        """Zeile ersetzen; False (kein Treffer) hält die Trigger-Kette an."""
+        if self._live_tail is not None:
+            return None  # Live-Ansicht ist schreibgeschützt, Kette läuft weiter
+        # beliebige Zeilen aus scenario.yaml: beim ersten Mal einmalig in den Block-Index
+        self.editor.watch(old)
+        return self.editor.replace_line(old, new) > 0
+
+    def scripted_append(self, text):
+        if self._live_tail is None:
+            self.editor.append(text)
+
     def _trigger_glitch(self):
         """Visuelle Glitch-Effekte - Cursor springt, Text blinkt"""
         # Cursor springt zu zufälliger Position
@@ -144,58 +285,182 @@ class NotepadWidget(QWidget):
         cursor.movePosition(QTextCursor.End)
         self.edit.setTextCursor(cursor)
         
-        # Text-Inversion (schnelles Blinken) - mit Windows-Farben
-        original_style = self.edit.styleSheet()
-        
+        # Text-Inversion (schnelles Blinken): nur die Property wechselt
         def invert():
-            self.edit.setStyleSheet("""
-                QPlainTextEdit {
-                    background: #000000;
-                    color: #ffffff;
-                    font-family: 'Consolas', 'Courier New', monospace;
-                    font-size: 11px;
-                    border: none;
-                }
-            """)
-        
+            set_style_state(self.edit, "inverted", True)
+
         def restore():
-            self.edit.setStyleSheet(original_style)
-        
-        QTimer.singleShot(50, invert)
-        QTimer.singleShot(150, restore)
-        QTimer.singleShot(200, invert)
-        QTimer.singleShot(300, restore)
+            set_style_state(self.edit, "inverted", False)
+
+        for delay, step in ((50, invert), (150, restore), (200, invert), (300, restore)):
+            self.scheduler.schedule(delay, step, owner=self)
     
     def new_file(self):
+        self._close_large_file()
+        self.scenario.reset(self)
         self.edit.setPlainText("")
-        self.manipulation_triggered = False
-        self.timer.start(5000)
+        self.journal.start()
+        self._emit_scenario("notepad.new")
     
     def save_file(self):
+        if self._large_file is not None:
+            # Editor zeigt nur den bisher geladenen Teil der Datei
+            QMessageBox.information(self, "Schreibgeschützt",
+                "Große Dateien werden schreibgeschützt angezeigt.")
+            return
         fn, _ = QFileDialog.getSaveFileName(
             self, "Datei speichern", str(SANDBOX / "note.txt"), "Text (*.txt)"
         )
         if fn:
-            try:
-                with open(fn, "w", encoding="utf-8") as f:
-                    f.write(self.edit.toPlainText())
-                QMessageBox.information(self, "Gespeichert", f"Datei gespeichert:\n{fn}")
-            except Exception as e:
-                QMessageBox.warning(self, "Fehler", f"Fehler beim Speichern: {e}")
+            # Snapshot jetzt, Schreiben (temp + fsync + rename) im Hintergrund
+            get_writer().write_text(fn, self.edit.toPlainText(),
+                                    callback=lambda err: self._on_saved(fn, err))
+
+    def _on_saved(self, fn, error):
+        if error:
+            QMessageBox.warning(self, "Fehler", f"Fehler beim Speichern: {error}")
+        else:
+            QMessageBox.information(self, "Gespeichert", f"Datei gespeichert:\n{fn}")
     
     def load_file(self):
         fn, _ = QFileDialog.getOpenFileName(
             self, "Datei öffnen", str(SANDBOX), "Text (*.txt)"
         )
         if fn:
-            try:
-                with open(fn, "r", encoding="utf-8") as f:
-                    self.edit.setPlainText(f.read())
-                self.manipulation_triggered = False
-                self.timer.start(5000)
-            except Exception as e:
-                QMessageBox.warning(self, "Fehler", f"Fehler beim Öffnen: {e}")
+            self.open_path(fn)
+
+    def open_path(self, fn):
+        """Datei öffnen (Dialog, Taskleisten-Suche)."""
+        try:
+            self._stop_live_tail()
+            self._close_large_file()
+            self.scenario.reset(self)
+            self._load_path(fn)
+            self._emit_scenario("notepad.open")
+        except Exception as e:
+            QMessageBox.warning(self, "Fehler", f"Fehler beim Öffnen: {e}")
+
+    def _load_path(self, fn):
+        if is_large_file(fn):
+            self._open_large_file(fn)
+        else:
+            with open(fn, "r", encoding="utf-8") as f:
+                self.edit.setPlainText(f.read())
+            self.journal.start()
+
+    def open_text(self, text):
+        """Text ohne Datei anzeigen (Szenario-Dokumente aus der Suche)."""
+        self._stop_live_tail()
+        self._close_large_file()
+        self.scenario.reset(self)
+        self.edit.setPlainText(text)
+        self.journal.start()
+        self._emit_scenario("notepad.open")
     
+    # ---- Große Dateien (mmap, schrittweise Anzeige) ----
+    def _open_large_file(self, fn):
+        """Große Datei memory-mapped öffnen; Anzeige wird beim Scrollen nachgeladen."""
+        self.journal.discard()
+        self._large_file = LargeFileLoader(fn, self)
+        self._large_file.progress.connect(self.progress.setValue)
+        self._large_file.indexed.connect(self._on_large_file_indexed)
+        self.edit.setReadOnly(True)
+        # nur ein begrenzter Ausschnitt steht im Editor (LargeFileView)
+        self._large_view = LargeFileView(self._large_file, self.edit, self)
+        self._large_view.show_from(0)
+        self.progress.setValue(0)
+        self.progress_row.show()
+
+    def _on_large_file_indexed(self, lines):
+        self.progress_row.hide()
+        self.edit.setToolTip(f"{self._large_file.path.name}: {lines} Zeilen (Strg+G: Gehe zu)")
+
+    def _cancel_large_file(self):
+        # bricht nur das Indexieren ab; Anzeige und Scrollen laufen weiter
+        if self._large_file is not None:
+            self._large_file.cancel()
+        self.progress_row.hide()
+
+    def _close_large_file(self):
+        if self._large_file is None:
+            return
+        self._large_view.close()
+        self._large_view.deleteLater()
+        self._large_view = None
+        self._large_file.close()
+        self._large_file.deleteLater()
+        self._large_file = None
+        self.progress_row.hide()
+        self.edit.setToolTip("")
+        self.edit.setReadOnly(False)
+        self.journal.start()
+
+    def goto_line(self):
+        """Strg+G: zu einer Zeile springen (große Dateien über den Zeilenindex)."""
+        if self._large_file is not None:
+            total = self._large_file.total_lines
+            if total is None:
+                return  # Index noch nicht fertig (oder abgebrochen)
+        else:
+            total = self.edit.blockCount()
+        line, ok = QInputDialog.getInt(self, "Gehe zu", "Zeilennummer:", 1, 1, max(1, total))
+        if not ok:
+            return
+        if self._large_view is not None:
+            self._large_view.goto_line(line - 1)
+        else:
+            self.edit.setTextCursor(QTextCursor(self.edit.document().findBlockByNumber(line - 1)))
+            self.edit.centerCursor()
+
+    # ---- Live-Log (tail -f auf systemlog.txt) ----
+    def toggle_live_log(self):
+        self.set_live_log(self._live_tail is None)
+
+    def set_live_log(self, enabled: bool):
+        """Folge sandbox/systemlog.txt live; Anzeige auf LIVE_LOG_MAX_BLOCKS Zeilen begrenzt."""
+        if enabled == (self._live_tail is not None):
+            return
+        if enabled:
+            self.journal.discard()
+            self.edit.setPlainText("")
+            self.edit.setReadOnly(True)
+            self.edit.setMaximumBlockCount(LIVE_LOG_MAX_BLOCKS)
+            self._live_tail = LogTail(SYSTEMLOG, self)
+            self._live_tail.appended.connect(self._on_live_append)
+            self._live_tail.reset.connect(lambda: self.edit.setPlainText(""))
+            # nur die letzten Zeilen lesen, statt die ganze Datei einzulesen und zu kürzen
+            self._live_tail.start(last_lines=LIVE_LOG_MAX_BLOCKS)
+        else:
+            self._stop_live_tail()
+            # die Anzeige war auf die letzten Zeilen gekürzt -> vollständige Datei laden,
+            # sonst schreibt closeEvent den Ausschnitt über systemlog.txt
+            if SYSTEMLOG.exists() and is_large_file(SYSTEMLOG):
+                self._open_large_file(str(SYSTEMLOG))
+            else:
+                try:
+                    text = SYSTEMLOG.read_text(encoding="utf-8")
+                except OSError:
+                    text = ""
+                self.edit.setPlainText(text)
+                self.journal.start()
+
+    def _stop_live_tail(self):
+        """Live-Modus beenden, ohne die Anzeige neu zu laden (Öffnen, Schließen)."""
+        if self._live_tail is None:
+            return
+        self._live_tail.stop()
+        self._live_tail.deleteLater()
+        self._live_tail = None
+        self.edit.setMaximumBlockCount(0)
+        self.edit.setReadOnly(False)
+
+    def _on_live_append(self, text: str):
+        bar = self.edit.verticalScrollBar()
+        at_bottom = bar.value() >= bar.maximum() - 2
+        self.editor.append(text.rstrip("\n") if self.edit.document().isEmpty() else "\n" + text.rstrip("\n"))
+        if at_bottom:
+            bar.setValue(bar.maximum())
+
     def close_window(self):
         """Legacy helper: call close() to trigger closeEvent logic."""
         self.close()
@@ -209,9 +474,9 @@ class NotepadWidget(QWidget):
         self.close_attempts += 1
         if self.close_attempts < 3:
             # block and inform the user
-            text = self.edit.toPlainText()
             blocking_msg = "\n[INFO] Beenden nicht möglich. Sitzung läuft."
-            self.edit.setPlainText(text + blocking_msg)
+            if self._live_tail is None:  # Live-Ansicht zeigt nur die Datei
+                self.editor.append(blocking_msg)
             # try play sound
             if self.sound:
                 try:
@@ -220,15 +485,30 @@ class NotepadWidget(QWidget):
                     pass
             event.ignore()
         else:
-            # final close: stop timers, save and accept
-            try:
-                self.timer.stop()
-            except Exception:
-                pass
-            try:
-                with open(SYSTEMLOG, 'w', encoding='utf-8') as f:
-                    f.write(self.edit.toPlainText())
-            except Exception:
-                pass
+            # final close: stop scripted timers, save and accept
+            self.scenario.reset(self)
+            # im Live-Modus zeigt der Editor nur einen Ausschnitt -> nicht zurückschreiben
+            if self._live_tail is None and self._large_file is None:
+                get_writer().write_text(SYSTEMLOG, self.edit.toPlainText())
+            else:
+                self._stop_live_tail()
+            self._close_large_file()
+            # sauber beendet -> Journal wird nicht mehr gebraucht
+            self.journal.discard()
+            _release_journal(self._journal_path)
             event.accept()
 
+
+def _register_scenario_actions(engine):
+    """Notepad-Aktionen für scenario.yaml; Ziel ist context["target"]."""
+    def on_notepad(method):
+        def handler(context, **params):
+            target = context.get("target")
+            if not isinstance(target, NotepadWidget):
+                return False
+            return method(target, **params)
+        return handler
+
+    engine.register_action("notepad.replace_line", on_notepad(NotepadWidget.scripted_replace_line))
+    engine.register_action("notepad.append", on_notepad(NotepadWidget.scripted_append))
+    engine.register_action("notepad.glitch", on_notepad(NotepadWidget._trigger_glitch))
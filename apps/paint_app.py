@@ -7,17 +7,34 @@ class PaintWidget(QWidget):
         super().__init__(parent)
         self.setMouseTracking(True)
         self.stage = 0
-        self.layers = [QPixmap(800, 480) for _ in range(3)]
-        # Fallback: leere Stages mit einfachen Markierungen (später echte PNG-Layer aus assets/brushes laden)
-        for i, pm in enumerate(self.layers):
-            pm.fill(Qt.transparent)
-            p = QPainter(pm); p.setPen(Qt.black); p.drawText(20, 40, f"Stage {i+1}"); p.end()
+        self.layers = self._make_layers()
 
         v = QVBoxLayout(self)
         self.canvas = QLabel(self); self.canvas.setFixedSize(780, 460); v.addWidget(self.canvas, 0, Qt.AlignCenter)
         self._render()
 
+    @staticmethod
+    def _make_layers():
+        layers = [QPixmap(800, 480) for _ in range(3)]
+        # Fallback: leere Stages mit einfachen Markierungen (später echte PNG-Layer aus assets/brushes laden)
+        for i, pm in enumerate(layers):
+            pm.fill(Qt.transparent)
+            p = QPainter(pm); p.setPen(Qt.black); p.drawText(20, 40, f"Stage {i+1}"); p.end()
+        return layers
+
+    def suspend(self):
+        """Fenster versteckt: Layer und Leinwand freigeben (resume() baut sie neu)."""
+        self.layers = None
+        self.canvas.clear()
+
+    def resume(self):
+        if self.layers is None:
+            self.layers = self._make_layers()
+            self._render()
+
     def _render(self):
+        if self.layers is None:
+            return  # versteckt, wird bei resume() gezeichnet
         # Kombiniere Stages bis current stage
         out = QPixmap(780, 460); out.fill(Qt.white)
         p = QPainter(out)
@@ -26,6 +43,12 @@ class PaintWidget(QWidget):
         p.end()
         self.canvas.setPixmap(out)
 
+    def reset(self):
+        """Zurück auf Stage 1 (App-Pool); neu gerendert wird nur bei Bedarf."""
+        if self.stage != 0:
+            self.stage = 0
+            self._render()
+
     def mousePressEvent(self, ev): self._advance()
     def mouseMoveEvent(self, ev):  self._advance()
 
@@ -0,0 +1,97 @@
+from PySide6.QtGui import QTextCursor, QTextDocument
+
+
+def _utf16_len(text: str) -> int:
+    """Länge in QTextDocument-Positionen (UTF-16 Code Units)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+class DocumentEditor:
+    """Skript-Edits als gezielte QTextCursor-Operationen statt setPlainText().
+
+    Ein Block-Index merkt sich, in welchen Blöcken beobachtete Zeilen
+    (z.B. "[INFO] Umgebung: stabil") stehen. Gepflegt wird er über
+    `contentsChange`, d.h. nur die tatsächlich geänderten Blöcke werden
+    angesehen - Kosten proportional zur Edit-Größe, nicht zur Dokumentgröße.
+    Undo-Historie und Scroll-Position bleiben erhalten.
+    """
+    def __init__(self, document: QTextDocument, watch=()):
+        self.doc = document
+        self._watched = set()
+        self._index = {}  # Zeilentext -> {fragmentIndex: QTextBlock}
+        self.doc.contentsChange.connect(self._on_change)
+        self.watch(*watch)
+
+    # ---- Block-Index ----
+    def watch(self, *lines):
+        """Zeilen beobachten; bereits vorhandene Blöcke werden einmalig erfasst."""
+        new = {line.strip() for line in lines} - self._watched
+        if not new:
+            return
+        self._watched |= new
+        block = self.doc.firstBlock()
+        while block.isValid():
+            self._index_block(block, new)
+            block = block.next()
+
+    def _index_block(self, block, keys=None):
+        key = block.text().strip()
+        if key in (keys if keys is not None else self._watched):
+            self._index.setdefault(key, {})[block.fragmentIndex()] = block
+
+    def _on_change(self, position, removed, added):
+        block = self.doc.findBlock(position)
+        last = self.doc.findBlock(position + added)
+        while block.isValid():
+            self._index_block(block)
+            if block == last:
+                break
+            block = block.next()
+
+    def blocks(self, line: str):
+        """Alle Blöcke, deren Text (ohne Einrückung) `line` ist, in Dokumentreihenfolge."""
+        key = line.strip()
+        entries = self._index.get(key)
+        if not entries:
+            return []
+        valid = []
+        for frag, block in list(entries.items()):
+            if block.isValid() and block.text().strip() == key:
+                valid.append(block)
+            else:
+                del entries[frag]
+        valid.sort(key=lambda b: b.position())
+        return valid
+
+    def find_line(self, line: str):
+        found = self.blocks(line)
+        return found[0] if found else None
+
+    def contains_line(self, line: str) -> bool:
+        return self.find_line(line) is not None
+
+    # ---- Edits ----
+    def replace_line(self, old: str, new: str) -> int:
+        """Ersetze `old` in allen Blöcken, die diese Zeile enthalten (ein Undo-Schritt)."""
+        blocks = self.blocks(old)
+        if not blocks:
+            return 0
+        self.watch(new)
+        cursor = QTextCursor(self.doc)
+        cursor.beginEditBlock()
+        # von hinten nach vorne, damit frühere Positionen gültig bleiben
+        for block in reversed(blocks):
+            text = block.text()
+            idx = text.find(old.strip())
+            start = block.position() + _utf16_len(text[:idx])
+            cursor.setPosition(start)
+            cursor.setPosition(start + _utf16_len(old.strip()), QTextCursor.KeepAnchor)
+            cursor.insertText(new.strip())
+        cursor.endEditBlock()
+        return len(blocks)
+
+    def append(self, text: str):
+        """Text am Dokumentende anfügen, ohne den sichtbaren Cursor zu bewegen."""
+        cursor = QTextCursor(self.doc)
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
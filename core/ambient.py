@@ -0,0 +1,246 @@
+import threading
+from PySide6.QtCore import QObject, QIODevice
+
+# NumPy ist optional: ohne NumPy gibt es schlicht keine Ambient-Geräusche
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except Exception:
+    np = None
+    NUMPY_AVAILABLE = False
+
+try:
+    from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices
+    AUDIO_AVAILABLE = True
+except Exception:
+    AUDIO_AVAILABLE = False
+
+SAMPLE_RATE = 22050
+CHANNELS = 2
+BLOCK_FRAMES = 1024                 # pro Syntheseschritt erzeugte Frames (~46 ms)
+STEREO_DELAY = 7                    # Frames Verzögerung des rechten Kanals
+RING_BLOCKS = 8                     # Ringpuffer-Kapazität in Blöcken (~370 ms)
+LAYERS = ("drone", "hum", "static", "heartbeat")
+INTENSITY_LEVELS = {"low": 0.25, "medium": 0.5, "high": 0.85}
+
+# Impulsantwort des Rausch-Tiefpasses y += 0.35 * (x - y), auf 32 Taps gekürzt
+_STATIC_KERNEL = 0.35 * 0.65 ** np.arange(32) if NUMPY_AVAILABLE else None
+
+
+def intensity_value(value, default=0.5):
+    """'low'/'medium'/'high' oder Zahl 0..1 -> float 0..1"""
+    if isinstance(value, str):
+        return INTENSITY_LEVELS.get(value.strip().lower(), default)
+    try:
+        return min(1.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return default
+
+
+class AmbientSynth:
+    """Erzeugt Ambient-Blöcke (Drone, Netzbrummen, Rauschen, Herzschlag) mit NumPy.
+
+    Der Zustand (Phasen, Filter, Herzschlag-Position) wird zwischen den
+    Blöcken fortgeführt, damit es an den Blockgrenzen nicht knackt.
+    Intensität und Ebenen dürfen jederzeit geändert werden.
+    """
+    def __init__(self, sample_rate=SAMPLE_RATE, intensity=0.5, layers=LAYERS, volume=0.5, seed=None):
+        self.sample_rate = sample_rate
+        self.intensity = intensity_value(intensity)
+        self.layers = set(layers)
+        self.volume = volume
+        self._rng = np.random.default_rng(seed)
+        self._t = 0                 # Sample-Zähler
+        self._noise_tail = np.zeros(len(_STATIC_KERNEL) - 1)  # Rausch-Historie für den Filter
+        self._beat_pos = 0.0        # Position im Herzschlag-Zyklus (0..1)
+        self._right_tail = np.zeros(STEREO_DELAY)  # letzte Samples für den verzögerten Kanal
+
+    def set_intensity(self, value):
+        self.intensity = intensity_value(value, self.intensity)
+
+    def set_layers(self, layers):
+        self.layers = set(layers)
+
+    def render(self, frames=BLOCK_FRAMES):
+        """Nächster Block als int16-Array der Form (frames, 2)."""
+        sr = self.sample_rate
+        t = (self._t + np.arange(frames)) / sr
+        self._t += frames
+        k = self.intensity
+        mono = np.zeros(frames)
+        if "drone" in self.layers:
+            lfo = 0.6 + 0.4 * np.sin(2 * np.pi * 0.07 * t)
+            drone = (np.sin(2 * np.pi * 55.0 * t)
+                     + 0.6 * np.sin(2 * np.pi * 55.4 * t)
+                     + 0.3 * np.sin(2 * np.pi * 82.4 * t) * k)
+            mono += 0.25 * lfo * drone
+        if "hum" in self.layers:
+            hum = (np.sin(2 * np.pi * 50.0 * t)
+                   + 0.5 * np.sin(2 * np.pi * 100.0 * t)
+                   + 0.25 * np.sin(2 * np.pi * 150.0 * t))
+            mono += 0.06 * (0.5 + k) * hum
+        if "static" in self.layers:
+            mono += self._static(frames, k)
+        if "heartbeat" in self.layers:
+            mono += self._heartbeat(t, k)
+        mono *= self.volume
+        left = mono
+        # minimale Verzögerung -> Raumgefühl; Anfang kommt aus dem Vorgängerblock
+        delayed = np.concatenate([self._right_tail, mono])
+        right = delayed[:frames]
+        self._right_tail = delayed[frames:]
+        out = np.stack([left, right], axis=1)
+        return (np.clip(out, -1.0, 1.0) * 32767).astype(np.int16)
+
+    def _static(self, frames, k):
+        noise = self._rng.standard_normal(frames)
+        # Einpol-Tiefpass als kurzes FIR (0.65^32 ~ 1e-6); die letzten Samples
+        # des Vorgängerblocks werden mitgefaltet -> keine Sprünge an Blockgrenzen
+        taps = len(_STATIC_KERNEL)
+        padded = np.concatenate([self._noise_tail, noise])
+        self._noise_tail = noise[-(taps - 1):]
+        filtered = np.convolve(padded, _STATIC_KERNEL, mode="valid")
+        crackle = (self._rng.random(frames) < 0.0005 * (1 + 6 * k)) * self._rng.uniform(-0.6, 0.6, frames)
+        return 0.04 * k * filtered + crackle * k
+
+    def _heartbeat(self, t, k):
+        sr = self.sample_rate
+        bpm = 55 + 65 * k
+        step = bpm / 60.0 / sr
+        pos = (self._beat_pos + step * np.arange(1, len(t) + 1)) % 1.0
+        self._beat_pos = float(pos[-1])
+        # "lub" bei 0.0, "dub" bei 0.28 des Zyklus, jeweils exponentiell abklingend
+        beat_len = 60.0 / bpm
+        lub = np.exp(-pos * beat_len * 28)
+        dub_pos = np.where(pos >= 0.28, pos - 0.28, 1.0)
+        dub = 0.7 * np.exp(-dub_pos * beat_len * 32)
+        body = np.sin(2 * np.pi * 48.0 * t)
+        return (0.15 + 0.35 * k) * (lub + dub) * body
+
+
+class RingBuffer:
+    """Byte-Ringpuffer fester Größe (thread-sicher)."""
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._buf = bytearray(capacity)
+        self._read = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def free(self):
+        return self.capacity - self._size
+
+    def write(self, data: bytes):
+        with self._lock:
+            n = min(len(data), self.capacity - self._size)
+            start = (self._read + self._size) % self.capacity
+            first = min(n, self.capacity - start)
+            self._buf[start:start + first] = data[:first]
+            self._buf[:n - first] = data[first:n]
+            self._size += n
+            return n
+
+    def read(self, n: int):
+        with self._lock:
+            n = min(n, self._size)
+            first = min(n, self.capacity - self._read)
+            out = bytes(self._buf[self._read:self._read + first]) + bytes(self._buf[:n - first])
+            self._read = (self._read + n) % self.capacity
+            self._size -= n
+            return out
+
+
+class AmbientStream(QIODevice):
+    """Endloser Pull-Stream für QAudioSink: füllt den Ringpuffer blockweise nach."""
+    def __init__(self, synth: AmbientSynth, parent=None):
+        super().__init__(parent)
+        self.synth = synth
+        block_bytes = BLOCK_FRAMES * CHANNELS * 2
+        self.ring = RingBuffer(block_bytes * RING_BLOCKS)
+        self._block_bytes = block_bytes
+
+    def _fill(self):
+        while self.ring.free() >= self._block_bytes:
+            self.ring.write(self.synth.render(BLOCK_FRAMES).tobytes())
+
+    def isSequential(self):
+        return True
+
+    def bytesAvailable(self):
+        return self.ring.capacity + super().bytesAvailable()
+
+    def readData(self, maxlen):
+        if len(self.ring) < min(maxlen, self.ring.capacity):
+            self._fill()
+        return self.ring.read(maxlen)
+
+    def writeData(self, data):
+        return -1
+
+
+def ambient_params(settings: dict, scenario: dict):
+    """Ambient-Parameter aus settings.yaml (Abschnitt `ambient`) + scenario.yaml."""
+    cfg = (settings or {}).get("ambient") or {}
+    intensity = (scenario or {}).get("intensity", (settings or {}).get("intensity", "medium"))
+    return {
+        "enabled": bool(cfg.get("enabled", False)),
+        "intensity": cfg.get("intensity", intensity),
+        "layers": cfg.get("layers", list(LAYERS)),
+        "volume": float(cfg.get("volume", 0.5)),
+    }
+
+
+class AmbientPlayer(QObject):
+    """Spielt den Synth-Stream über einen QAudioSink; Parameter live änderbar."""
+    def __init__(self, intensity="medium", layers=LAYERS, volume=0.5, parent=None):
+        super().__init__(parent)
+        self.synth = AmbientSynth(intensity=intensity, layers=layers, volume=volume)
+        self.stream = AmbientStream(self.synth, self)
+        self.sink = None
+
+    def start(self):
+        if not AUDIO_AVAILABLE or self.sink is not None:
+            return False
+        device = QMediaDevices.defaultAudioOutput()
+        if device.isNull():
+            return False
+        fmt = QAudioFormat()
+        fmt.setSampleRate(self.synth.sample_rate)
+        fmt.setChannelCount(CHANNELS)
+        fmt.setSampleFormat(QAudioFormat.Int16)
+        self.sink = QAudioSink(device, fmt, self)
+        # kleiner Sink-Puffer: Parameteränderungen sind schnell hörbar
+        self.sink.setBufferSize(self.stream.ring.capacity // 2)
+        self.stream.open(QIODevice.ReadOnly)
+        self.sink.start(self.stream)
+        return True
+
+    def stop(self):
+        if self.sink is not None:
+            self.sink.stop()
+            self.sink = None
+        self.stream.close()
+
+    def set_intensity(self, value):
+        self.synth.set_intensity(value)
+
+    def set_layers(self, layers):
+        self.synth.set_layers(layers)
+
+    def apply(self, params: dict):
+        """Parameter aus ambient_params() live übernehmen."""
+        self.set_intensity(params["intensity"])
+        self.set_layers(params["layers"])
+        self.synth.volume = params["volume"]
+
+
+def create_ambient(settings: dict, scenario: dict, parent=None):
+    """AmbientPlayer gemäß Konfiguration starten (None wenn deaktiviert/nicht verfügbar)."""
+    params = ambient_params(settings, scenario)
+    if not (params["enabled"] and NUMPY_AVAILABLE and AUDIO_AVAILABLE):
+        return None
+    player = AmbientPlayer(params["intensity"], params["layers"], params["volume"], parent)
+    return player if player.start() else None
@@ -0,0 +1,63 @@
+import importlib
+from core.assets import ICONS_DIR
+from core.config import apps_config
+
+
+class AppRegistry:
+    """Apps aus config/apps.yaml (Reihenfolge = Manifest).
+
+    Das Modul einer App wird erst importiert, wenn sie zum ersten Mal
+    gebaut wird; Icons, Startmenü und Taskleiste kommen mit den Metadaten aus.
+    """
+    def __init__(self, apps=()):
+        self._apps = {a.id: a for a in apps}
+        self._classes = {}
+
+    def __iter__(self):
+        return iter(self._apps.values())
+
+    def __contains__(self, app_id):
+        return app_id in self._apps
+
+    def get(self, app_id):
+        try:
+            return self._apps[app_id]
+        except KeyError:
+            raise KeyError(f"Unbekannte App: {app_id}") from None
+
+    def icon_path(self, app_id):
+        icon = self.get(app_id).icon
+        return ICONS_DIR / icon if icon else None
+
+    def is_loaded(self, app_id) -> bool:
+        return app_id in self._classes
+
+    def widget_class(self, app_id):
+        cls = self._classes.get(app_id)
+        if cls is None:
+            module, _, name = self.get(app_id).entry.partition(":")
+            cls = getattr(importlib.import_module(module), name)
+            self._classes[app_id] = cls
+        return cls
+
+    def create(self, app_id, session=None, prewarm=False, **kwargs):
+        """Widget bauen; `session`/`prewarm` nur, wenn das Manifest es vorsieht."""
+        spec = self.get(app_id)
+        if spec.session:
+            kwargs["session"] = session
+        if spec.deferred and prewarm:
+            kwargs["prewarm"] = True
+        return self.widget_class(app_id)(**kwargs)
+
+
+_registry = None
+_source = None
+
+def get_app_registry():
+    """Apps aus config/apps.yaml (neu aufgebaut, wenn sich die Datei ändert)."""
+    global _registry, _source
+    source = apps_config()
+    if _registry is None or source is not _source:
+        _registry = AppRegistry(source.apps)
+        _source = source
+    return _registry
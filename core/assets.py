@@ -0,0 +1,120 @@
+from pathlib import Path
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QSize, Qt, Signal
+from PySide6.QtGui import QImage, QImageReader
+
+ROOT = Path(__file__).resolve().parents[1]
+ASSETS = ROOT / "assets"
+PROFILE_IMG = ASSETS / "profile" / "profile.png"
+ICONS_DIR = ASSETS / "icons" / "applications"
+
+# Dekodier-Threads: Bilder sind wenige, aber teils groß (Wallpaper 3840x2400)
+DECODE_THREADS = 2
+
+
+def _asset_key(path, size, aspect):
+    w, h = (size.width(), size.height()) if size is not None else (0, 0)
+    return (str(path), w, h, aspect)
+
+
+class _DecodeSignals(QObject):
+    done = Signal(object, QImage)
+
+
+class _DecodeTask(QRunnable):
+    """Dekodiert ein Bild im Worker-Thread direkt in der Zielgröße."""
+    def __init__(self, key, path, size, aspect, signals):
+        super().__init__()
+        self.key = key
+        self.path = str(path)
+        self.size = size
+        self.aspect = aspect
+        self.signals = signals
+
+    def run(self):
+        img = QImage()
+        try:
+            reader = QImageReader(self.path)
+            reader.setAutoTransform(True)
+            target = None
+            if self.size is not None and reader.size().isValid():
+                target = reader.size().scaled(self.size, self.aspect)
+                # JPEG/PNG dekodieren direkt verkleinert (spart Zeit + Speicher)
+                reader.setScaledSize(target)
+            img = reader.read()
+            # Formate ohne Scaled-Decoding (z.B. .ico) nachträglich skalieren
+            if target is not None and not img.isNull() and img.size() != target:
+                img = img.scaled(target, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        except Exception:
+            img = QImage()
+        self.signals.done.emit(self.key, img)
+
+
+class AssetLoader(QObject):
+    """Dekodiert Bild-Assets auf einem Thread-Pool.
+
+    request() liefert sofort ein bereits dekodiertes QImage (Cache-Treffer)
+    oder None; der Callback wird in jedem Fall im GUI-Thread aufgerufen,
+    sobald das Bild vorliegt. Zusätzlich wird `loaded(key, image)` emittiert.
+    """
+    loaded = Signal(object, QImage)
+
+    def __init__(self, threads=DECODE_THREADS, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(threads)
+        self._signals = _DecodeSignals(self)
+        self._signals.done.connect(self._on_done)
+        self._images = {}   # key -> QImage
+        self._pending = {}  # key -> [callbacks]
+
+    def cached(self, path, size=None, aspect=Qt.KeepAspectRatio):
+        return self._images.get(_asset_key(path, size, aspect))
+
+    def request(self, path, size=None, callback=None, aspect=Qt.KeepAspectRatio):
+        """Bild asynchron laden. `size` ist die Zielgröße (QSize) oder None."""
+        if size is not None and not isinstance(size, QSize):
+            size = QSize(*size)
+        key = _asset_key(path, size, aspect)
+        img = self._images.get(key)
+        if img is not None:
+            if callback:
+                self._dispatch(callback, img)
+            return img
+        if not Path(path).exists():
+            return None
+        waiting = self._pending.get(key)
+        if waiting is None:
+            self._pending[key] = [callback] if callback else []
+            self._pool.start(_DecodeTask(key, path, size, aspect, self._signals))
+        elif callback:
+            waiting.append(callback)
+        return None
+
+    def _on_done(self, key, img):
+        if not img.isNull():
+            self._images[key] = img
+        for cb in self._pending.pop(key, []):
+            if not img.isNull():
+                self._dispatch(cb, img)
+        self.loaded.emit(key, img)
+
+    def _dispatch(self, callback, img):
+        try:
+            callback(img)
+        except RuntimeError:
+            # Empfänger-Widget wurde inzwischen gelöscht
+            pass
+
+    def wait(self, msecs=-1):
+        """Auf alle laufenden Dekodierungen warten (Tests/Headless)."""
+        return self._pool.waitForDone(msecs)
+
+
+_loader = None
+
+def get_asset_loader():
+    """Prozessweiter Asset-Loader."""
+    global _loader
+    if _loader is None:
+        _loader = AssetLoader()
+    return _loader
@@ -0,0 +1,54 @@
+import time
+from datetime import datetime, timedelta
+
+
+class SystemClock:
+    """Echte Zeit: monotone Millisekunden für Timer, datetime für Anzeigen."""
+    virtual = False
+
+    def monotonic_ms(self) -> int:
+        return time.monotonic_ns() // 1_000_000
+
+    def now(self) -> datetime:
+        return datetime.now()
+
+
+class VirtualClock:
+    """Uhr, die nur durch advance()/set_ms() weiterläuft (Headless-Läufe, Tests)."""
+    virtual = True
+
+    def __init__(self, start: datetime = None):
+        self.start = start or datetime.now().replace(microsecond=0)
+        self._ms = 0
+
+    def monotonic_ms(self) -> int:
+        return self._ms
+
+    def now(self) -> datetime:
+        return self.start + timedelta(milliseconds=self._ms)
+
+    def set_ms(self, ms: int):
+        if ms < self._ms:
+            raise ValueError("Virtuelle Zeit läuft nicht rückwärts")
+        self._ms = int(ms)
+
+    def advance(self, ms: int):
+        self.set_ms(self._ms + max(0, int(ms)))
+
+
+_clock = SystemClock()
+
+def get_clock():
+    """Aktuelle Prozess-Uhr (Standard: SystemClock)."""
+    return _clock
+
+
+def set_clock(clock):
+    """Uhr austauschen; liefert die vorherige zurück.
+
+    Der Scheduler muss separat umgestellt werden (Scheduler.set_clock),
+    damit bereits geplante Aufrufe ihre Restlaufzeit behalten.
+    """
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
@@ -1,31 +1,265 @@
+import copy
+import hashlib
+import os
+import pickle
+from dataclasses import dataclass, field
 from pathlib import Path
 import yaml
 
+try:
+    from yaml import CSafeLoader as _YamlLoader  # libyaml, deutlich schneller
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 ROOT = Path(__file__).resolve().parents[1]
 CFG_USERS = ROOT / "config" / "users.yaml"
+CFG_USERS_EXTRA = ROOT / "config" / "users_extra.yaml"  # optional, z.B. viele Besucherkonten
 CFG_SETTINGS = ROOT / "config" / "settings.yaml"
 CFG_SCENARIO = ROOT / "config" / "scenario.yaml"
+CFG_APPS = ROOT / "config" / "apps.yaml"
 SANDBOX = ROOT / "sandbox"
 ASSETS = ROOT / "assets"
+STATE = ROOT / "state"  # interne Laufzeitdaten (Journale, Snapshots)
+
+# bei Änderungen an den Snapshot-Klassen erhöhen -> alte Binär-Caches verfallen
+CACHE_VERSION = 2
 
 def ensure_dirs():
     SANDBOX.mkdir(parents=True, exist_ok=True)
     (ROOT / "logs").mkdir(parents=True, exist_ok=True)
+    STATE.mkdir(parents=True, exist_ok=True)
+
+def parse_yaml(text):
+    return yaml.load(text, Loader=_YamlLoader) or {}
 
 def load_yaml(p: Path):
     if not p.exists():
         return {}
     with p.open("r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return parse_yaml(f)
+
+
+# ---- Snapshots: einmal geprüft, unveränderlich, gecacht ----
+
+@dataclass(frozen=True)
+class UserEntry:
+    username: str
+    password: str = ""
+    avatar: str = None
+
+
+@dataclass(frozen=True)
+class UsersConfig:
+    users: tuple = ()                                  # (UserEntry, ...)
+    raw: tuple = field(default=(), repr=False)         # gültige Einträge als Dicts (nicht verändern)
+
+
+@dataclass(frozen=True)
+class SettingsConfig:
+    audio: bool = False
+    intensity: str = "medium"
+    window: tuple = (1600, 900)
+    raw: dict = field(default_factory=dict, repr=False)  # nicht verändern
+
+
+@dataclass(frozen=True)
+class FakeDocument:
+    id: str
+    title: str
+    path: str = ""
+    text: str = ""
+
+
+@dataclass(frozen=True)
+class ScenarioConfig:
+    intensity: str = None
+    triggers: tuple = ()   # kompilierte Trigger (core.scenario.Trigger)
+    error: str = ""        # gesetzt, wenn die Trigger ungültig sind
+    documents: tuple = ()  # (FakeDocument, ...) für die Suche
+    raw: dict = field(default_factory=dict, repr=False)  # nicht verändern
+
+
+@dataclass(frozen=True)
+class AppEntry:
+    id: str
+    title: str
+    entry: str            # "modul:Klasse"
+    icon: str = None
+    desktop: bool = False
+    single: bool = False
+    session: bool = False
+    prewarm: bool = False
+    deferred: bool = False
+
+
+@dataclass(frozen=True)
+class AppsConfig:
+    apps: tuple = ()      # (AppEntry, ...) in Manifest-Reihenfolge
+
+
+def _build_users(data):
+    entries, raw = [], []
+    for pos, u in enumerate(data.get("users") or []):
+        if not isinstance(u, dict) or not u.get("username"):
+            print(f"⚠ Benutzerdatei: Eintrag #{pos + 1} ohne 'username' ignoriert")
+            continue
+        entries.append(UserEntry(str(u["username"]), str(u.get("password") or ""),
+                                 u.get("avatar")))
+        raw.append(u)
+    return UsersConfig(tuple(entries), tuple(raw))
+
+
+DEFAULT_WINDOW = (1600, 900)
+
+
+def window_size(data):
+    """(Breite, Höhe) aus settings.yaml; bei unbrauchbaren Werten 1600×900 mit Warnung."""
+    window = data.get("window") or {}
+    if not isinstance(window, dict):
+        print(f"⚠ settings.yaml: 'window' ist kein Mapping, verwende {DEFAULT_WINDOW[0]}×{DEFAULT_WINDOW[1]}")
+        return DEFAULT_WINDOW
+    try:
+        size = (int(window.get("width", DEFAULT_WINDOW[0])), int(window.get("height", DEFAULT_WINDOW[1])))
+    except (TypeError, ValueError):
+        size = None
+    if size is None or min(size) <= 0:
+        print(f"⚠ settings.yaml: ungültige Fenstergröße, verwende {DEFAULT_WINDOW[0]}×{DEFAULT_WINDOW[1]}")
+        return DEFAULT_WINDOW
+    return size
+
+
+def _build_settings(data):
+    return SettingsConfig(
+        audio=bool(data.get("audio", False)),
+        intensity=str(data.get("intensity", "medium")),
+        window=window_size(data),
+        raw=data,
+    )
+
+
+_APP_FLAGS = ("desktop", "single", "session", "prewarm", "deferred")
+
+
+def _build_apps(data):
+    apps, seen = [], set()
+    for pos, a in enumerate(data.get("apps") or []):
+        if not isinstance(a, dict):
+            print(f"⚠ apps.yaml: Eintrag #{pos + 1} ist kein Mapping, ignoriert")
+            continue
+        app_id, entry = a.get("id"), str(a.get("entry") or "")
+        unknown = set(a) - {"id", "title", "entry", "icon", *_APP_FLAGS}
+        if not app_id or app_id in seen or ":" not in entry or unknown:
+            print(f"⚠ apps.yaml: Eintrag #{pos + 1} ungültig ({app_id or 'ohne id'}), ignoriert")
+            continue
+        seen.add(app_id)
+        apps.append(AppEntry(str(app_id), str(a.get("title") or app_id), entry, a.get("icon"),
+                             **{flag: bool(a.get(flag, False)) for flag in _APP_FLAGS}))
+    return AppsConfig(tuple(apps))
+
+
+def _build_scenario(data):
+    from core.scenario import ScenarioError, compile_scenario
+    try:
+        triggers, error = tuple(compile_scenario(data).values()), ""
+    except ScenarioError as e:
+        triggers, error = (), str(e)
+    documents, seen = [], set()
+    for pos, d in enumerate(data.get("documents") or []):
+        if not isinstance(d, dict) or not d.get("id") or d["id"] in seen:
+            print(f"⚠ scenario.yaml: Dokument #{pos + 1} ohne (eindeutige) id, ignoriert")
+            continue
+        seen.add(d["id"])
+        documents.append(FakeDocument(str(d["id"]), str(d.get("title") or d["id"]),
+                                      str(d.get("path") or ""), str(d.get("text") or "")))
+    return ScenarioConfig(data.get("intensity"), triggers, error, tuple(documents), data)
+
+
+_BUILDERS = {"users": _build_users, "settings": _build_settings, "scenario": _build_scenario,
+             "apps": _build_apps}
+_cache = {}  # Pfad -> (Schlüssel, Snapshot)
+
+
+def _file_key(path):
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (CACHE_VERSION, st.st_mtime_ns, st.st_size)
+
+
+def cache_path(path: Path) -> Path:
+    """Binär-Cache unter state/config-cache/ (z.B. scenario.yaml-1a2b3c4d5e6f.cache).
+
+    Der Cache wird per pickle geladen und ist damit ausführbarer Code: er liegt
+    deshalb nicht neben der YAML-Datei, sondern in state/, das nur diese App
+    selbst beschreibt. Wer in state/ schreiben kann, gilt als vertrauenswürdig.
+    """
+    tag = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:12]
+    return STATE / "config-cache" / f"{path.name}-{tag}.cache"
+
+
+def _read_cache(path, key, kind):
+    try:
+        with cache_path(path).open("rb") as f:
+            cached_key, cached_kind, snap = pickle.load(f)
+    except Exception:
+        return None  # fehlt, veraltetes Format o.ä. -> neu parsen
+    if cached_key != key or cached_kind != kind:
+        return None
+    return snap
+
+
+def _write_cache(path, key, kind, snap):
+    target = cache_path(path)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with tmp.open("wb") as f:
+            pickle.dump((key, kind, snap), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, target)
+    except Exception:
+        pass  # z.B. schreibgeschütztes Verzeichnis: dann eben ohne Cache
+
+
+def _snapshot(path: Path, kind: str):
+    key = _file_key(path)
+    hit = _cache.get(path)
+    if hit is not None and hit[0] == key:
+        return hit[1]
+    snap = _read_cache(path, key, kind) if key else None
+    if snap is None:
+        data = load_yaml(path) if key else {}
+        if not isinstance(data, dict):
+            print(f"⚠ {path.name}: kein YAML-Mapping, wird ignoriert")
+            data = {}
+        snap = _BUILDERS[kind](data)
+        # Datei während des Lesens geändert -> Ergebnis nicht dauerhaft ablegen
+        if key and _file_key(path) == key:
+            _write_cache(path, key, kind, snap)
+    _cache[path] = (key, snap)
+    return snap
+
+
+def users_config(path: Path = CFG_USERS) -> UsersConfig:
+    return _snapshot(path, "users")
+
+def settings_config() -> SettingsConfig:
+    return _snapshot(CFG_SETTINGS, "settings")
+
+def scenario_config() -> ScenarioConfig:
+    return _snapshot(CFG_SCENARIO, "scenario")
+
+def apps_config() -> AppsConfig:
+    return _snapshot(CFG_APPS, "apps")
+
+
+# ---- Dict-API (Kopien, Aufrufer dürfen sie verändern) ----
 
 def load_users():
-    data = load_yaml(CFG_USERS)
-    return data.get("users", [])
+    return copy.deepcopy(list(users_config().raw))
 
 def load_settings():
-    data = load_yaml(CFG_SETTINGS)
-    return data or {}
+    return copy.deepcopy(settings_config().raw)
 
 def load_scenario():
-    data = load_yaml(CFG_SCENARIO)
-    return data or {}
+    return copy.deepcopy(scenario_config().raw)
@@ -0,0 +1,157 @@
+import hashlib
+from pathlib import Path
+from PySide6.QtCore import QObject, QFileSystemWatcher, QRunnable, QThreadPool, QTimer, Signal
+from core.ambient import ambient_params
+from core.config import CFG_SCENARIO, CFG_SETTINGS, parse_yaml, window_size
+from core.scenario import compile_scenario, get_scenario_engine
+
+# Editoren speichern oft in mehreren Schritten -> kurz sammeln, dann einmal lesen
+WATCH_DEBOUNCE_MS = 150
+
+
+def _parse_settings(data):
+    if not isinstance(data.get("ambient") or {}, dict):
+        raise ValueError("'ambient' muss ein Mapping sein")
+    ambient_params(data, {})  # wirft bei unbrauchbaren Werten (z.B. volume: laut)
+    window_size(data)         # warnt nur und fällt auf 1600×900 zurück
+    return {}
+
+
+def _parse_scenario(data):
+    return {"triggers": compile_scenario(data)}
+
+
+_PARSERS = {"settings": _parse_settings, "scenario": _parse_scenario}
+
+
+class _ParseSignals(QObject):
+    done = Signal(int, str, object, str)  # Auftrag, Pfad, Ergebnis (None = nichts zu tun), Fehler
+
+
+class _ParseTask(QRunnable):
+    """Datei lesen, YAML parsen und prüfen - komplett außerhalb des GUI-Threads."""
+    def __init__(self, job, path, kind, signals):
+        super().__init__()
+        self.job = job
+        self.path = path
+        self.kind = kind
+        self.signals = signals
+
+    def run(self):
+        result, error = None, ""
+        try:
+            raw = self.path.read_bytes()
+            data = parse_yaml(raw.decode("utf-8"))
+            if not isinstance(data, dict):
+                raise ValueError("Datei muss ein YAML-Mapping sein")
+            result = {"digest": hashlib.sha1(raw).hexdigest(), "data": data}
+            result.update(_PARSERS[self.kind](data))
+        except FileNotFoundError:
+            pass  # Editor ersetzt die Datei gerade
+        except Exception as e:
+            # jeder Fehler -> `rejected`; der Worker muss immer `done` melden
+            result, error = None, str(e) or e.__class__.__name__
+        self.signals.done.emit(self.job, str(self.path), result, error)
+
+
+class ConfigWatcher(QObject):
+    """Lädt scenario.yaml und settings.yaml bei Änderungen im laufenden Betrieb neu.
+
+    Geparst und geprüft wird auf einem Worker-Thread; übernommen wird nur
+    eine vollständig gültige Datei (sonst `rejected`, der alte Stand bleibt).
+    Neue Trigger gehen als Diff an die Szenario-Engine, bereits ausgelöste
+    Trigger bleiben ausgelöst.
+    """
+    scenario_changed = Signal(object)   # Rohdaten scenario.yaml
+    settings_changed = Signal(object)   # Rohdaten settings.yaml
+    rejected = Signal(str, str)         # Pfad, Fehler
+
+    def __init__(self, paths=None, parent=None):
+        super().__init__(parent)
+        self._kinds = {Path(p): kind for p, kind in (paths or {
+            CFG_SCENARIO: "scenario", CFG_SETTINGS: "settings"}).items()}
+        self._digests = {}
+        self._jobs = {}
+        self._dirty = set()
+        self._job = 0
+        self._signals = _ParseSignals(self)
+        self._signals.done.connect(self._on_parsed)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(WATCH_DEBOUNCE_MS)
+        self._timer.timeout.connect(self._parse_dirty)
+
+    def start(self):
+        for path in self._kinds:
+            # Ausgangsstand merken, damit unveränderte Dateien nichts auslösen
+            try:
+                self._digests[path] = hashlib.sha1(path.read_bytes()).hexdigest()
+            except OSError:
+                pass
+        paths = {str(p) for p in self._kinds if p.exists()}
+        paths |= {str(p.parent) for p in self._kinds}
+        self._watcher.addPaths(sorted(paths))
+
+    def stop(self):
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _on_file_changed(self, path):
+        self._dirty.add(Path(path))
+        self._timer.start()
+
+    def _on_dir_changed(self, _):
+        # atomares Speichern (rename) zeigt sich nur am Verzeichnis
+        self._dirty |= set(self._kinds)
+        self._timer.start()
+
+    def _parse_dirty(self):
+        dirty, self._dirty = self._dirty, set()
+        for path in dirty:
+            if path not in self._kinds:
+                continue
+            if path.exists() and str(path) not in self._watcher.files():
+                self._watcher.addPath(str(path))
+            self._job += 1
+            self._jobs[path] = self._job
+            self._pool.start(_ParseTask(self._job, path, self._kinds[path], self._signals))
+
+    def _on_parsed(self, job, path, result, error):
+        path = Path(path)
+        if self._jobs.get(path) != job:
+            return  # inzwischen neuer gespeichert
+        if error:
+            print(f"⚠ {path.name} nicht übernommen: {error}")
+            self.rejected.emit(str(path), error)
+            return
+        if result is None or result["digest"] == self._digests.get(path):
+            return
+        self._digests[path] = result["digest"]
+        if self._kinds[path] == "scenario":
+            added, removed, changed = get_scenario_engine().apply_triggers(result["triggers"])
+            print(f"↻ {path.name} neu geladen: +{len(added)} -{len(removed)} ~{len(changed)} Trigger")
+            self.scenario_changed.emit(result["data"])
+        else:
+            print(f"↻ {path.name} neu geladen")
+            self.settings_changed.emit(result["data"])
+
+    def wait(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
+
+
+_watcher = None
+
+def get_config_watcher():
+    """Prozessweiter Watcher für config/scenario.yaml und config/settings.yaml."""
+    global _watcher
+    if _watcher is None:
+        _watcher = ConfigWatcher()
+        _watcher.start()
+    return _watcher
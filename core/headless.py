@@ -0,0 +1,146 @@
+"""Headless-Abspielen von Szenarien mit virtueller Zeit.
+
+    python -m core.headless --minutes 30 --user Milan --open notepad
+
+Die Uhr (core.clock) wird durch eine VirtualClock ersetzt, der Scheduler
+springt von Termin zu Termin - ein 30-Minuten-Skript läuft so in Sekunden.
+Aufgezeichnet wird, welche Ereignisse und Trigger wann gefeuert haben.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FiredEvent:
+    at_ms: int     # virtuelle Zeit seit Start
+    kind: str      # "event" oder "trigger"
+    name: str
+    app: str = ""
+
+    def __str__(self):
+        minutes, ms = divmod(self.at_ms, 60_000)
+        return f"{minutes:02d}:{ms / 1000:06.3f}  {self.kind:<7}  {self.name}  {self.app}".rstrip()
+
+
+class ScenarioRunner:
+    """Desktop + Szenario offscreen mit virtueller Zeit abspielen.
+
+    Benutzung als Kontextmanager; beim Verlassen werden Uhr, Scheduler und
+    Szenario wieder auf den Normalbetrieb zurückgestellt.
+    """
+    def __init__(self, user="Milan", scenario=None, start=None):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        from PySide6.QtWidgets import QApplication
+        from core.clock import VirtualClock
+        from core.scenario import get_scenario_engine
+        from core.scheduler import get_scheduler
+        self.app = QApplication.instance() or QApplication(sys.argv[:1])
+        self.user = user
+        self.scenario = scenario
+        self.clock = VirtualClock(start)
+        self.scheduler = get_scheduler()
+        self.engine = get_scenario_engine()
+        self.records = []
+        self.desktop = None
+        self._foreign = set()
+        self._previous_clock = None
+
+    def __enter__(self):
+        from core.clock import set_clock
+        from core.session import Session
+        from desktop.desktop_area import DesktopWindow
+        self._previous_clock = set_clock(self.clock)
+        self.scheduler.set_clock(self.clock)
+        if self.scenario is not None:
+            self.engine.load(self.scenario)
+        self.engine.emitted.connect(self._on_event)
+        self.engine.fired.connect(self._on_trigger)
+        # Fenster, die schon vorher existierten, gehören nicht zu diesem Lauf
+        self._foreign = set(self.app.topLevelWidgets())
+        self.desktop = DesktopWindow(Session(self.user))
+        self.desktop.show()
+        return self
+
+    def __exit__(self, *exc):
+        from PySide6.QtCore import QCoreApplication, QEvent
+        from core.clock import set_clock
+        from core.scenario import load_scenario_triggers
+        self.engine.emitted.disconnect(self._on_event)
+        self.engine.fired.disconnect(self._on_trigger)
+        # Fenster zerstören -> ihre geplanten Aufrufe verfallen mit
+        self.desktop.close()
+        self.desktop.deleteLater()
+        QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+        self.desktop = None
+        self.scheduler.set_clock(self._previous_clock)
+        set_clock(self._previous_clock)
+        if self.scenario is not None:
+            self.engine.apply_triggers(load_scenario_triggers())
+        return False
+
+    def _owns(self, context):
+        # nur Ereignisse dieses Laufs aufzeichnen (ältere Fenster im Prozess ignorieren)
+        widget = context.get("target")
+        if widget is None:
+            return True
+        while widget.parent() is not None:
+            widget = widget.parent()
+        return widget not in self._foreign
+
+    def _record(self, kind, name, context):
+        if self._owns(context):
+            self.records.append(FiredEvent(self.clock.monotonic_ms(), kind, name, context.get("app", "")))
+
+    def _on_event(self, event, context):
+        self._record("event", event, context)
+
+    def _on_trigger(self, trigger_id, context):
+        self._record("trigger", trigger_id, context)
+
+    # ---- Steuerung ----
+    def open(self, app):
+        """App über den Desktop öffnen (id aus config/apps.yaml)."""
+        self.desktop.open_app(app)
+        self.app.processEvents()
+
+    def run(self, ms):
+        """Virtuelle Zeit um `ms` vorspulen."""
+        self.scheduler.advance(ms)
+        return self.records
+
+    def fired(self, trigger_id):
+        """Zeitpunkte (ms), zu denen ein Trigger ausgelöst hat."""
+        return [r.at_ms for r in self.records if r.kind == "trigger" and r.name == trigger_id]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Szenario headless mit virtueller Zeit abspielen")
+    parser.add_argument("--user", default="Milan")
+    parser.add_argument("--minutes", type=float, default=30)
+    parser.add_argument("--open", action="append", default=[], metavar="APP",
+                        help="App beim Start öffnen (id aus config/apps.yaml); mehrfach möglich")
+    parser.add_argument("--scenario", help="alternative scenario.yaml")
+    args = parser.parse_args(argv)
+
+    scenario = None
+    if args.scenario:
+        from pathlib import Path
+        from core.config import load_yaml
+        scenario = load_yaml(Path(args.scenario))
+
+    started = time.perf_counter()
+    with ScenarioRunner(args.user, scenario) as runner:
+        for app in args.open:
+            runner.open(app)
+        runner.run(int(args.minutes * 60_000))
+        for record in runner.records:
+            print(record)
+    print(f"{args.minutes:g} min virtuell in {time.perf_counter() - started:.2f} s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,389 @@
+import re
+from dataclasses import dataclass
+from PySide6.QtCore import QObject, Signal
+from core.config import scenario_config
+from core.scheduler import get_scheduler
+from core.textmatch import DocumentPhraseWatcher, PhraseMatcher
+
+
+class ScenarioError(ValueError):
+    """Ungültige scenario.yaml (wird als Ganzes abgelehnt)."""
+
+
+_DURATION_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*(ms|s|m|h)?\s*$")
+_UNITS = {None: 1, "ms": 1, "s": 1000, "m": 60_000, "h": 3_600_000}
+
+
+def parse_duration(value) -> int:
+    """Verzögerung in ms: Zahl (ms) oder Text wie "500ms", "5s", "2m", "1h"."""
+    if isinstance(value, bool):
+        raise ScenarioError(f"Ungültige Dauer: {value!r}")
+    if isinstance(value, (int, float)):
+        ms = value
+    else:
+        m = _DURATION_RE.match(str(value))
+        if not m:
+            raise ScenarioError(f"Ungültige Dauer: {value!r}")
+        ms = float(m.group(1)) * _UNITS[m.group(2)]
+    if ms < 0:
+        raise ScenarioError(f"Negative Dauer: {value!r}")
+    return int(ms)
+
+
+def _freeze(value):
+    """YAML-Werte hashbar machen (für Vergleiche beim Neuladen)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _as_tuple(value):
+    if value is None:
+        return ()
+    if isinstance(value, (list, tuple)):
+        return tuple(value)
+    return (value,)
+
+
+@dataclass(frozen=True)
+class Action:
+    name: str
+    params: tuple = ()
+
+    def kwargs(self):
+        return dict(self.params)
+
+
+@dataclass(frozen=True)
+class Trigger:
+    """Knoten des Aktionsgraphen: Ereignis -> (Verzögerung) -> Aktionen -> Folge-Trigger."""
+    id: str
+    on: tuple = ()
+    when: tuple = ()     # ((Schlüssel, erlaubte Werte), ...)
+    after: int = 0
+    actions: tuple = ()
+    then: tuple = ()
+    once: bool = True
+    contains: tuple = ()  # Phrasen für on: text
+
+    def matches(self, context) -> bool:
+        return all(context.get(key) in allowed for key, allowed in self.when)
+
+
+def _compile_trigger(raw, pos) -> Trigger:
+    if not isinstance(raw, dict):
+        raise ScenarioError(f"Trigger #{pos + 1}: Eintrag muss ein Mapping sein")
+    # YAML 1.1 liest den Schlüssel `on` als Boolean True
+    raw = {("on" if k is True else k): v for k, v in raw.items()}
+    tid = raw.get("id")
+    if not tid or not isinstance(tid, str):
+        raise ScenarioError(f"Trigger #{pos + 1}: 'id' fehlt")
+    unknown = set(raw) - {"id", "on", "when", "after", "actions", "then", "once", "contains"}
+    if unknown:
+        raise ScenarioError(f"Trigger {tid}: unbekannte Felder {sorted(unknown)}")
+    when = raw.get("when") or {}
+    if not isinstance(when, dict):
+        raise ScenarioError(f"Trigger {tid}: 'when' muss ein Mapping sein")
+    actions = []
+    for a in _as_tuple(raw.get("actions")):
+        if isinstance(a, str):
+            a = {"do": a}
+        if not isinstance(a, dict) or not a.get("do"):
+            raise ScenarioError(f"Trigger {tid}: Aktion ohne 'do'")
+        params = {k: v for k, v in a.items() if k != "do"}
+        actions.append(Action(str(a["do"]), _freeze(params)))
+    on = tuple(str(e) for e in _as_tuple(raw.get("on")))
+    contains = tuple(str(p) for p in _as_tuple(raw.get("contains")) if p)
+    if ("text" in on) != bool(contains):
+        raise ScenarioError(f"Trigger {tid}: 'contains' gehört zu on: text (und umgekehrt)")
+    return Trigger(
+        id=tid,
+        on=on,
+        contains=contains,
+        when=tuple(sorted((str(k), _freeze(_as_tuple(v))) for k, v in when.items())),
+        after=parse_duration(raw.get("after", 0)),
+        actions=tuple(actions),
+        then=tuple(str(t) for t in _as_tuple(raw.get("then"))),
+        once=bool(raw.get("once", True)),
+    )
+
+
+def compile_scenario(data) -> dict:
+    """scenario.yaml -> {id: Trigger}; prüft Eindeutigkeit und Verweise."""
+    raw = (data or {}).get("triggers") or []
+    if not isinstance(raw, list):
+        raise ScenarioError("'triggers' muss eine Liste sein")
+    triggers = {}
+    for pos, entry in enumerate(raw):
+        trigger = _compile_trigger(entry, pos)
+        if trigger.id in triggers:
+            raise ScenarioError(f"Trigger-ID doppelt: {trigger.id}")
+        triggers[trigger.id] = trigger
+    for trigger in triggers.values():
+        missing = [t for t in trigger.then if t not in triggers]
+        if missing:
+            raise ScenarioError(f"Trigger {trigger.id}: unbekannte Folge-Trigger {missing}")
+    return triggers
+
+
+def _action_emit(engine, context, event, **params):
+    engine.emit(event, **{**context, **params})
+
+
+def _action_log(engine, context, text, level="INFO"):
+    from core.systemlog import append_systemlog
+    append_systemlog(*str(text).splitlines(), level=level)
+
+
+def _action_sound(engine, context, name):
+    try:
+        from core.sound import get_audio_engine
+    except Exception:
+        return  # ohne Audio läuft das Skript stumm weiter
+    audio = get_audio_engine()
+    if audio.has(name):
+        audio.play(name)
+
+
+def _action_theme(engine, context, variant="corrupted"):
+    from core.theme import get_theme
+    get_theme().set_variant(variant)
+
+
+BUILTIN_ACTIONS = {"emit": _action_emit, "log": _action_log, "sound": _action_sound,
+                   "theme": _action_theme}
+
+
+class ScenarioEngine(QObject):
+    """Ereignisbus + Aktionsgraph aus scenario.yaml.
+
+    `emit(event, **context)` benachrichtigt Abonnenten und schärft alle
+    Trigger mit passendem `on`/`when`. Verzögerungen laufen über den
+    gemeinsamen Scheduler; `context["target"]` (z.B. ein Notepad) ist
+    Besitzer der geplanten Aufrufe und Geltungsbereich von `once`.
+    Eine Aktion, die False liefert, bricht die Kette ab (Trigger gilt dann
+    nicht als ausgelöst).
+    """
+    fired = Signal(str, object)    # Trigger-ID, Kontext
+    emitted = Signal(str, object)  # Ereignis, Kontext
+
+    def __init__(self, scenario=None, scheduler=None, parent=None):
+        super().__init__(parent)
+        self.scheduler = scheduler or get_scheduler()
+        self._actions = {}
+        self._subscribers = {}
+        self._triggers = {}
+        self._by_event = {}
+        self._by_phrase = {}
+        self._matcher = PhraseMatcher()
+        self._fired = set()    # (Trigger-ID, Geltungsbereich)
+        self._pending = {}     # (Trigger-ID, Geltungsbereich) -> (ScheduledCall, geschärft um, Kontext)
+        self._scopes = {}      # Geltungsbereich -> Ziel (für Snapshots)
+        for name, fn in BUILTIN_ACTIONS.items():
+            self.register_action(name, lambda ctx, _fn=fn, **kw: _fn(self, ctx, **kw))
+        if scenario:
+            self.load(scenario)
+
+    # ---- Szenario ----
+    def load(self, data):
+        """Szenario kompilieren und aktivieren (ScenarioError bei Fehlern)."""
+        return self.apply_triggers(compile_scenario(data))
+
+    def apply_triggers(self, triggers):
+        """Neue Trigger übernehmen, ohne den laufenden Ablauf neu zu starten.
+
+        Unveränderte Trigger bleiben wie sie sind (inkl. "bereits ausgelöst"),
+        geänderte behalten ihren Schärfzeitpunkt und werden mit der neuen
+        Verzögerung neu geplant, entfernte werden abgebrochen.
+        Liefert (hinzugefügt, entfernt, geändert) als ID-Listen.
+        """
+        old = self._triggers
+        added = sorted(triggers.keys() - old.keys())
+        removed = sorted(old.keys() - triggers.keys())
+        changed = sorted(t for t in old.keys() & triggers.keys() if old[t] != triggers[t])
+        self._set_triggers(triggers)
+        for key, (call, armed_at, context) in list(self._pending.items()):
+            if key[0] in removed:
+                self.scheduler.cancel(call)
+                del self._pending[key]
+            elif key[0] in changed:
+                # Restzeit statt Uhrzeit: angehaltene Ziele (versteckte Fenster) zählen nicht weiter
+                remaining = self.scheduler.remaining(call)
+                self.scheduler.cancel(call)
+                del self._pending[key]
+                trigger = triggers[key[0]]
+                if trigger.matches(context):
+                    self._schedule(key, context, armed_at, remaining + trigger.after - old[key[0]].after)
+        self._fired = {k for k in self._fired if k[0] not in removed}
+        return added, removed, changed
+
+    def _set_triggers(self, triggers):
+        self._triggers = triggers
+        self._by_event = {}
+        self._by_phrase = {}
+        for trigger in triggers.values():
+            for event in trigger.on:
+                if event != "text":
+                    self._by_event.setdefault(event, []).append(trigger)
+            for phrase in trigger.contains:
+                self._by_phrase.setdefault(phrase, []).append(trigger)
+        # alle Phrasen des Szenarios in einem Automaten
+        self._matcher = PhraseMatcher(self._by_phrase)
+
+    def triggers(self):
+        return dict(self._triggers)
+
+    # ---- Aktionen / Abonnenten ----
+    def register_action(self, name, fn):
+        """Aktion registrieren: fn(context, **params) -> False bricht die Kette ab."""
+        self._actions[name] = fn
+
+    def subscribe(self, event, fn):
+        self._subscribers.setdefault(event, []).append(fn)
+
+    def unsubscribe(self, event, fn):
+        subs = self._subscribers.get(event, [])
+        if fn in subs:
+            subs.remove(fn)
+
+    def emit(self, event, **context):
+        self.emitted.emit(event, context)
+        for fn in list(self._subscribers.get(event, ())):
+            fn(context)
+        if event == "text":
+            triggers = self._by_phrase.get(context.get("phrase"), ())
+        else:
+            triggers = self._by_event.get(event, ())
+        for trigger in triggers:
+            self._arm(trigger, context)
+
+    def watch_document(self, document, **context):
+        """Text-Trigger für ein QTextDocument: jede neue Phrase -> Ereignis "text"."""
+        return DocumentPhraseWatcher(
+            document, lambda: self._matcher,
+            lambda phrase: self.emit("text", phrase=phrase, **context))
+
+    # ---- Ablauf ----
+    def _scope(self, context):
+        target = context.get("target")
+        if target is None:
+            return None
+        scope = id(target)
+        if scope not in self._scopes and isinstance(target, QObject):
+            self._scopes[scope] = target
+            target.destroyed.connect(lambda *_, s=scope: self._on_target_destroyed(s))
+        return scope
+
+    def _arm(self, trigger, context):
+        if not trigger.matches(context):
+            return
+        key = (trigger.id, self._scope(context))
+        if (trigger.once and key in self._fired) or key in self._pending:
+            return
+        self._schedule(key, context, self.scheduler.now(), trigger.after)
+
+    def _schedule(self, key, context, armed_at, delay):
+        call = self.scheduler.schedule(delay, lambda: self._fire(key, context), owner=context.get("target"))
+        self._pending[key] = (call, armed_at, context)
+
+    def _fire(self, key, context):
+        self._pending.pop(key, None)
+        trigger = self._triggers.get(key[0])
+        if trigger is None:
+            return  # inzwischen aus dem Szenario entfernt
+        for action in trigger.actions:
+            handler = self._actions.get(action.name)
+            if handler is None:
+                print(f"⚠ Unbekannte Szenario-Aktion: {action.name} (Trigger {trigger.id})")
+                return
+            if handler(context, **action.kwargs()) is False:
+                return
+        self._fired.add(key)
+        self.fired.emit(trigger.id, context)
+        for nxt in trigger.then:
+            if nxt in self._triggers:
+                self._arm(self._triggers[nxt], context)
+
+    def reset(self, target=None):
+        """Ausstehende und ausgelöste Trigger eines Ziels (bzw. global) zurücksetzen."""
+        self._forget(None if target is None else id(target))
+
+    def _forget(self, scope):
+        for key in [k for k in self._pending if k[1] == scope]:
+            self.scheduler.cancel(self._pending.pop(key)[0])
+        self._fired = {k for k in self._fired if k[1] != scope}
+
+    def _on_target_destroyed(self, scope):
+        # id() kann wiederverwendet werden -> Zustand des alten Ziels verwerfen
+        self._forget(scope)
+        self._scopes.pop(scope, None)
+
+    # ---- Snapshot ----
+    def progress(self, name_of):
+        """Ablaufstand für einen Sitzungs-Snapshot.
+
+        `name_of(target)` liefert einen dauerhaften Namen für ein Ziel (oder
+        None, dann wird es übergangen); globale Trigger haben den Namen None.
+        Geplante Trigger werden mit ihrer Restlaufzeit gespeichert.
+        """
+        names = {None: None}
+        for scope, target in self._scopes.items():
+            name = name_of(target)
+            if name is not None:
+                names[scope] = name
+        fired = [(tid, names[scope]) for tid, scope in self._fired if scope in names]
+        pending = []
+        for (tid, scope), (call, _armed_at, context) in self._pending.items():
+            if scope in names:
+                plain = {k: v for k, v in context.items()
+                         if k != "target" and isinstance(v, (str, int, float, bool, type(None)))}
+                pending.append((tid, names[scope], self.scheduler.remaining(call), plain))
+        return {"fired": sorted(fired, key=repr), "pending": pending}
+
+    def restore_progress(self, state, target_of, names):
+        """Ablaufstand der Ziele `names` aus progress() übernehmen.
+
+        `target_of(name)` liefert das neu erzeugte Ziel. Geplante Trigger
+        laufen mit ihrer gespeicherten Restzeit weiter.
+        """
+        for tid, name in state.get("fired", ()):
+            if name in names and tid in self._triggers:
+                scope = self._scope({"target": target_of(name)})
+                self._fired.add((tid, scope))
+        now = self.scheduler.now()
+        for tid, name, remaining, context in state.get("pending", ()):
+            trigger = self._triggers.get(tid)
+            if name not in names or trigger is None:
+                continue
+            context = dict(context)
+            target = target_of(name)
+            if target is not None:
+                context["target"] = target
+            key = (tid, self._scope(context))
+            if key in self._pending or (trigger.once and key in self._fired):
+                continue
+            self._schedule(key, context, now + remaining - trigger.after, remaining)
+
+
+_engine = None
+
+def load_scenario_triggers() -> dict:
+    """Kompilierte Trigger aus config/scenario.yaml (gecacht, siehe core.config)."""
+    cfg = scenario_config()
+    if cfg.error:
+        raise ScenarioError(cfg.error)
+    return {t.id: t for t in cfg.triggers}
+
+
+def get_scenario_engine():
+    """Prozessweite Szenario-Engine (lädt config/scenario.yaml)."""
+    global _engine
+    if _engine is None:
+        _engine = ScenarioEngine()
+        try:
+            _engine.apply_triggers(load_scenario_triggers())
+        except ScenarioError as e:
+            print(f"⚠ scenario.yaml ungültig: {e}")
+    return _engine
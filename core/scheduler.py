@@ -0,0 +1,251 @@
+import heapq
+import itertools
+import traceback
+from PySide6.QtCore import QCoreApplication, QObject, QTimer, Qt
+from core.clock import get_clock
+
+
+class ScheduledCall:
+    """Handle eines geplanten Aufrufs (für cancel())."""
+    __slots__ = ("due", "fn", "interval", "owner_key", "cancelled", "seq", "paused")
+
+    def __init__(self, due, fn, interval, owner_key):
+        self.due = due
+        self.fn = fn
+        self.interval = interval
+        self.owner_key = owner_key
+        self.cancelled = False
+        self.seq = None      # Nummer des gültigen Heap-Eintrags
+        self.paused = None   # Restlaufzeit (ms), solange der Besitzer angehalten ist
+
+    @property
+    def active(self):
+        return not self.cancelled
+
+
+class Scheduler(QObject):
+    """Ein einziger QTimer für alle verzögerten Aktionen im Prozess.
+
+    Fällige Aufrufe liegen in einem Heap (O(log n) pro schedule); der Timer
+    wird immer nur auf den frühesten Termin gestellt. Aufrufe können einem
+    Besitzer (meist einem QObject) zugeordnet werden - wird dieser zerstört,
+    verfallen seine Aufrufe automatisch.
+
+    Die Zeit kommt von einer austauschbaren Uhr (core.clock); mit einer
+    VirtualClock läuft kein Qt-Timer, stattdessen treibt advance() die Zeit.
+
+    suspend(owner) hält alle Aufrufe eines Besitzers an (z.B. verstecktes
+    Fenster): sie verlassen den Heap und behalten ihre Restlaufzeit, die
+    nach resume(owner) weiterläuft.
+    """
+    def __init__(self, clock=None, parent=None):
+        super().__init__(parent)
+        self._heap = []
+        self._seq = itertools.count()
+        self._by_owner = {}   # id(owner) -> {ScheduledCall}
+        self._suspended = set()  # id(owner) angehaltener Besitzer
+        self._cancelled = 0   # ungültige Heap-Einträge (abgebrochen oder angehalten)
+        self.clock = clock or get_clock()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._run_due)
+
+    def now(self) -> int:
+        """Monotone Millisekunden der Scheduler-Uhr."""
+        return self.clock.monotonic_ms()
+
+    def set_clock(self, clock):
+        """Uhr wechseln; ausstehende Aufrufe behalten ihre Restlaufzeit."""
+        delta = clock.monotonic_ms() - self.now()
+        # gleichmäßige Verschiebung erhält die Heap-Ordnung
+        self._heap = [(due + delta, seq, call) for due, seq, call in self._heap]
+        for entry in self._heap:
+            if self._live(entry):
+                entry[2].due += delta
+        self.clock = clock
+        self._arm()
+
+    def advance(self, ms, process_events=True):
+        """Virtuelle Zeit um `ms` vorspulen und alle fälligen Aufrufe der Reihe nach ausführen."""
+        if not self.clock.virtual:
+            raise RuntimeError("advance() benötigt eine VirtualClock")
+        target = self.now() + max(0, int(ms))
+        while True:
+            due = self.next_due()
+            if due is None or due > target:
+                break
+            if due > self.now():
+                self.clock.set_ms(due)
+            self._run_due()
+            if process_events:
+                # Folgeereignisse (Layouts, Signale) vor dem nächsten Termin abarbeiten
+                QCoreApplication.processEvents()
+        self.clock.set_ms(target)
+
+    # ---- Planen ----
+    def schedule(self, delay_ms, fn, owner=None) -> ScheduledCall:
+        """`fn` einmalig nach `delay_ms` Millisekunden aufrufen."""
+        return self._push(self.now() + max(0, int(delay_ms)), fn, None, owner)
+
+    def every(self, interval_ms, fn, owner=None, first_ms=None) -> ScheduledCall:
+        """`fn` alle `interval_ms` Millisekunden aufrufen (bis cancel())."""
+        interval = max(1, int(interval_ms))
+        first = interval if first_ms is None else max(0, int(first_ms))
+        return self._push(self.now() + first, fn, interval, owner)
+
+    def _push(self, due, fn, interval, owner):
+        key = self._register_owner(owner)
+        call = ScheduledCall(due, fn, interval, key)
+        if key is not None:
+            self._by_owner[key].add(call)
+        if key in self._suspended:
+            call.paused = max(0, due - self.now())
+            return call
+        self._enqueue(call)
+        if self._heap[0][2] is call:
+            self._arm()
+        return call
+
+    def _enqueue(self, call):
+        call.seq = next(self._seq)
+        heapq.heappush(self._heap, (call.due, call.seq, call))
+
+    def _register_owner(self, owner):
+        if owner is None:
+            return None
+        key = id(owner)
+        if key not in self._by_owner:
+            self._by_owner[key] = set()
+            if isinstance(owner, QObject):
+                owner.destroyed.connect(lambda *_, k=key: self._drop_owner(k))
+        return key
+
+    # ---- Abbrechen ----
+    def cancel(self, call: ScheduledCall):
+        if call is None or call.cancelled:
+            return
+        call.cancelled = True
+        if call.paused is None:
+            self._cancelled += 1
+        owned = self._by_owner.get(call.owner_key)
+        if owned is not None:
+            owned.discard(call)
+        # abgebrochene Einträge bleiben im Heap, bis sie vorne stehen oder zu viele sind
+        if self._cancelled > 64 and self._cancelled > len(self._heap) // 2:
+            self._heap = [e for e in self._heap if self._live(e)]
+            heapq.heapify(self._heap)
+            self._cancelled = 0
+
+    def cancel_owner(self, owner):
+        """Alle ausstehenden Aufrufe eines Besitzers verwerfen."""
+        for call in list(self._by_owner.get(id(owner), ())):
+            self.cancel(call)
+
+    def _drop_owner(self, key):
+        for call in list(self._by_owner.pop(key, ())):
+            self.cancel(call)
+        self._suspended.discard(key)
+
+    # ---- Anhalten ----
+    def suspend(self, owner):
+        """Aufrufe von `owner` anhalten; sie behalten ihre Restlaufzeit."""
+        key = self._register_owner(owner)
+        if key in self._suspended:
+            return
+        self._suspended.add(key)
+        now = self.now()
+        for call in self._by_owner[key]:
+            call.paused = max(0, call.due - now)
+            call.seq = None  # Heap-Eintrag wird ungültig
+            self._cancelled += 1
+        self._arm()
+
+    def resume(self, owner):
+        """Angehaltene Aufrufe von `owner` mit ihrer Restlaufzeit fortsetzen."""
+        key = id(owner)
+        if key not in self._suspended:
+            return
+        self._suspended.discard(key)
+        now = self.now()
+        for call in self._by_owner.get(key, ()):
+            call.due = now + call.paused
+            call.paused = None
+            self._enqueue(call)
+        self._arm()
+
+    def is_suspended(self, owner) -> bool:
+        return id(owner) in self._suspended
+
+    def remaining(self, call: ScheduledCall) -> int:
+        """Restlaufzeit (ms) eines Aufrufs, auch während er angehalten ist."""
+        if call.paused is not None:
+            return call.paused
+        return max(0, call.due - self.now())
+
+    def pending(self, owner=None) -> int:
+        """Ausstehende Aufrufe (eines Besitzers: auch angehaltene; gesamt: nur laufende)."""
+        if owner is not None:
+            return len(self._by_owner.get(id(owner), ()))
+        return len(self._heap) - self._cancelled
+
+    def next_due(self):
+        """Termin (ms) des nächsten aktiven Aufrufs oder None."""
+        self._discard_cancelled_head()
+        return self._heap[0][0] if self._heap else None
+
+    # ---- Ausführen ----
+    @staticmethod
+    def _live(entry):
+        _, seq, call = entry
+        return not call.cancelled and call.seq == seq
+
+    def _discard_cancelled_head(self):
+        while self._heap and not self._live(self._heap[0]):
+            heapq.heappop(self._heap)
+            self._cancelled -= 1
+
+    def _arm(self):
+        self._discard_cancelled_head()
+        if not self._heap or self.clock.virtual:
+            self._timer.stop()
+            return
+        self._timer.start(max(0, self._heap[0][0] - self.now()))
+
+    def _run_due(self):
+        now = self.now()
+        # während dieses Durchlaufs neu geplante Aufrufe erst im nächsten ausführen
+        limit = next(self._seq)
+        while self._heap and self._heap[0][0] <= now and self._heap[0][1] < limit:
+            entry = heapq.heappop(self._heap)
+            call = entry[2]
+            if not self._live(entry):
+                self._cancelled -= 1
+                continue
+            if call.interval:
+                # Wiederholung: ausgefallene Termine nicht nachholen
+                call.due += call.interval
+                if call.due <= now:
+                    call.due = now + call.interval
+                self._enqueue(call)
+            else:
+                call.cancelled = True
+                owned = self._by_owner.get(call.owner_key)
+                if owned is not None:
+                    owned.discard(call)
+            try:
+                call.fn()
+            except Exception:
+                print("⚠ Geplanter Aufruf fehlgeschlagen:")
+                traceback.print_exc()
+        self._arm()
+
+
+_scheduler = None
+
+def get_scheduler():
+    """Prozessweiter Scheduler."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = Scheduler()
+    return _scheduler
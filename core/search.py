@@ -0,0 +1,294 @@
+import os
+import re
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from pathlib import Path
+from PySide6.QtCore import QObject, QFileSystemWatcher, QRunnable, QThreadPool, QTimer, Signal
+from core.app_registry import get_app_registry
+from core.config import SANDBOX, scenario_config
+from core.config_watch import get_config_watcher
+from core.textmatch import fold
+
+MAX_RESULTS = 8
+RESCAN_COALESCE_MS = 100  # mehrere Dateiänderungen in einem Verzeichnis -> ein Scan
+_WORD_SPLIT = re.compile(r"[\W_]+")
+
+
+@dataclass(frozen=True)
+class SearchEntry:
+    kind: str      # "app", "document" oder "file"
+    key: str       # App-ID, Dokument-ID oder Dateipfad
+    title: str
+    detail: str = ""
+
+
+class SearchIndex:
+    """Such-Index über Titel: Wortpräfixe (sortierte Liste + bisect) und Trigramme.
+
+    Treffer am Wortanfang kommen zuerst und werden der Reihe nach aus der
+    sortierten Liste gelesen; erst wenn das nicht reicht, wird über die
+    Schnittmenge der Trigramm-Listen nach Teilwörtern gesucht. Einfügen und
+    Entfernen einzelner Einträge kostet nur ihre eigenen Schlüssel.
+    """
+    def __init__(self, entries=()):
+        self._entries = {}    # Nr. -> SearchEntry
+        self._folded = {}     # Nr. -> gefalteter Titel
+        self._by_key = {}     # Schlüssel -> Nr.
+        self._words = []      # sortiert: (Wort, Nr.)
+        self._trigrams = {}   # Trigramm -> {Nr.}
+        self._next = 0
+        for entry in entries:
+            self._insert(entry, self._words.append)
+        self._words.sort()  # Erstaufbau: einmal sortieren statt je Wort einfügen
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._by_key
+
+    def keys(self):
+        return self._by_key.keys()
+
+    @staticmethod
+    def _keys_of(folded):
+        words = {folded} | {w for w in _WORD_SPLIT.split(folded) if w}
+        trigrams = {folded[i:i + 3] for i in range(len(folded) - 2)}
+        return words, trigrams
+
+    def add(self, entry):
+        self._insert(entry, lambda item: insort(self._words, item))
+
+    def _insert(self, entry, add_word):
+        if entry.key in self._by_key:
+            self.remove(entry.key)
+        num = self._next
+        self._next += 1
+        folded = fold(entry.title)
+        self._entries[num] = entry
+        self._folded[num] = folded
+        self._by_key[entry.key] = num
+        words, trigrams = self._keys_of(folded)
+        for word in words:
+            add_word((word, num))
+        for tri in trigrams:
+            self._trigrams.setdefault(tri, set()).add(num)
+
+    def remove(self, key):
+        num = self._by_key.pop(key, None)
+        if num is None:
+            return
+        del self._entries[num]
+        words, trigrams = self._keys_of(self._folded.pop(num))
+        for word in words:
+            pos = bisect_left(self._words, (word, num))
+            if pos < len(self._words) and self._words[pos] == (word, num):
+                del self._words[pos]
+        for tri in trigrams:
+            posting = self._trigrams.get(tri)
+            if posting is not None:
+                posting.discard(num)
+                if not posting:
+                    del self._trigrams[tri]
+
+    def search(self, text, limit=MAX_RESULTS):
+        """Bis zu `limit` Einträge, deren Titel alle Wörter aus `text` enthält."""
+        words = [w for w in _WORD_SPLIT.split(fold(text)) if w]
+        if not words:
+            return []
+        first, rest = words[0], words[1:]
+        found, seen = [], set()
+
+        def accept(num):
+            if num not in seen and all(w in self._folded[num] for w in rest):
+                seen.add(num)
+                found.append(self._entries[num])
+            return len(found) >= limit
+
+        # 1) Wortanfänge, in sortierter Reihenfolge
+        pos = bisect_left(self._words, (first, -1))
+        while pos < len(self._words) and self._words[pos][0].startswith(first):
+            if accept(self._words[pos][1]):
+                return found
+            pos += 1
+        # 2) Teilwörter über Trigramme (ab drei Zeichen)
+        if len(first) >= 3:
+            postings = sorted((self._trigrams.get(first[i:i + 3], ()) for i in range(len(first) - 2)), key=len)
+            if postings[0]:
+                candidates = set(postings[0]).intersection(*postings[1:])
+                for num in sorted(candidates):
+                    if first in self._folded[num] and accept(num):
+                        break
+        return found
+
+
+def _scan(directories, recursive):
+    """{Verzeichnis: ([Dateien], [Unterverzeichnisse])} - läuft im Worker-Thread."""
+    result, todo = {}, list(directories)
+    while todo:
+        directory = todo.pop()
+        files, dirs = [], []
+        try:
+            with os.scandir(directory) as it:
+                for item in it:
+                    if item.name.startswith("."):
+                        continue
+                    if item.is_dir(follow_symlinks=False):
+                        dirs.append(item.path)
+                    elif item.is_file():
+                        files.append(item.path)
+        except OSError:
+            pass  # inzwischen gelöscht
+        result[directory] = (files, dirs)
+        if recursive:
+            todo.extend(dirs)
+    return result
+
+
+class _ScanSignals(QObject):
+    done = Signal(object, object)  # Scan-Ergebnis, neuer Index (None = nur Änderungen)
+
+
+class _ScanTask(QRunnable):
+    def __init__(self, directories, signals, build=None):
+        super().__init__()
+        self.directories = directories
+        self.signals = signals
+        self.build = build  # gesetzt: rekursiv scannen und Index im Worker aufbauen
+
+    def run(self):
+        result = _scan(self.directories, self.build is not None)
+        index = self.build(result) if self.build is not None else None
+        self.signals.done.emit(result, index)
+
+
+class SearchService(QObject):
+    """Suche für die Taskleiste: Apps, Szenario-Dokumente und Dateien in sandbox/.
+
+    Die Dateien werden im Hintergrund eingelesen und danach über einen
+    QFileSystemWatcher aktuell gehalten: geändert wird nur das betroffene
+    Verzeichnis. search() läuft im GUI-Thread direkt auf den Indizes.
+    """
+    changed = Signal()
+
+    def __init__(self, root=SANDBOX, parent=None):
+        super().__init__(parent)
+        self.root = Path(root)
+        self.apps = SearchIndex()
+        self.documents = SearchIndex()
+        self.files = SearchIndex()
+        self._dirs = {}  # Verzeichnis -> (Dateien, Unterverzeichnisse) wie zuletzt gescannt
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _ScanSignals(self)
+        self._signals.done.connect(self._on_scanned)
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_dir_changed)
+        self._changed_dirs = set()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(RESCAN_COALESCE_MS)
+        self._timer.timeout.connect(self._rescan)
+        self.refresh_apps()
+        self.refresh_documents()
+        get_config_watcher().scenario_changed.connect(lambda _data: self.refresh_documents())
+
+    def refresh_apps(self):
+        self.apps = SearchIndex(SearchEntry("app", spec.id, spec.title, "App")
+                                for spec in get_app_registry())
+
+    def refresh_documents(self):
+        self.documents = SearchIndex(SearchEntry("document", d.id, d.title, d.path)
+                                     for d in scenario_config().documents)
+        self.changed.emit()
+
+    def start(self):
+        """sandbox/ im Hintergrund einlesen (danach per Watcher aktuell)."""
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._pool.start(_ScanTask([str(self.root)], self._signals, self._build))
+
+    def wait(self, msecs=-1):
+        """Auf laufende Scans warten (Tests/Headless)."""
+        return self._pool.waitForDone(msecs)
+
+    def search(self, text, limit=MAX_RESULTS):
+        """Apps vor Dokumenten vor Dateien, höchstens `limit` Einträge."""
+        results = []
+        for index in (self.apps, self.documents, self.files):
+            results += index.search(text, limit - len(results))
+            if len(results) >= limit:
+                break
+        return results
+
+    def _entry(self, path):
+        p = Path(path)
+        try:
+            detail = str(p.parent.relative_to(self.root.parent))
+        except ValueError:
+            detail = str(p.parent)
+        return SearchEntry("file", path, p.name, detail)
+
+    def _build(self, result):
+        # läuft im Worker-Thread; der GUI-Thread sucht solange im alten Index
+        return SearchIndex(self._entry(f) for files, _ in result.values() for f in files)
+
+    def _on_scanned(self, result, index):
+        if index is not None:
+            self.files = index
+            stale = set(self._dirs) - set(result)
+            self._dirs = dict(result)
+            if stale:
+                self._watcher.removePaths(sorted(stale))
+            self._watcher.addPaths(sorted(set(result) - set(self._watcher.directories())))
+            self.changed.emit()
+            return
+        new_dirs = []
+        for directory, (files, dirs) in result.items():
+            old_files, old_dirs = self._dirs.get(directory, ((), ()))
+            for f in set(old_files) - set(files):
+                self.files.remove(f)
+            for f in set(files) - set(old_files):
+                self.files.add(self._entry(f))
+            for d in set(old_dirs) - set(dirs):
+                self._drop_dir(d)
+            new_dirs += [d for d in dirs if d not in self._dirs]
+            if os.path.isdir(directory):
+                self._dirs[directory] = (files, dirs)
+            else:
+                self._drop_dir(directory)
+        if new_dirs:
+            self._watcher.addPaths(new_dirs)
+            # neue Unterverzeichnisse vollständig einlesen (ohne den Rest neu aufzubauen)
+            for d in new_dirs:
+                self._dirs[d] = ((), ())
+            self._pool.start(_ScanTask(new_dirs, self._signals))
+        self.changed.emit()
+
+    def _drop_dir(self, directory):
+        files, dirs = self._dirs.pop(directory, ((), ()))
+        for f in files:
+            self.files.remove(f)
+        for d in dirs:
+            self._drop_dir(d)
+        if directory in self._watcher.directories():
+            self._watcher.removePath(directory)
+
+    def _on_dir_changed(self, directory):
+        self._changed_dirs.add(directory)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _rescan(self):
+        dirs, self._changed_dirs = sorted(self._changed_dirs), set()
+        self._pool.start(_ScanTask(dirs, self._signals))
+
+
+_service = None
+
+def get_search_service():
+    """Prozessweite Suche (liest sandbox/ beim ersten Aufruf im Hintergrund ein)."""
+    global _service
+    if _service is None:
+        _service = SearchService()
+        _service.start()
+    return _service
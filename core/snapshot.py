@@ -0,0 +1,150 @@
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from PySide6.QtCore import QCoreApplication, QObject, QTimer
+from core.config import STATE
+from core.storage import append_durable, atomic_write_bytes, get_writer
+
+SNAPSHOT_MAGIC = b"WFSNAP"
+SNAPSHOT_VERSION = 1        # bei Formatänderungen erhöhen -> alte Snapshots werden ignoriert
+SNAPSHOT_DEBOUNCE_MS = 250  # Änderungen sammeln; nach einem Stromausfall fehlt höchstens so viel
+SNAPSHOT_COMPACT_MIN = 64 * 1024
+SNAPSHOT_COMPACT_RATIO = 4  # neu schreiben, wenn die Datei so viel größer als der Inhalt ist
+
+_HEADER = struct.Struct("<6sH")   # Magic, Version
+_RECORD = struct.Struct("<II")    # Länge, CRC32 der Nutzdaten
+
+
+def snapshot_path(user):
+    return STATE / f"session-{user}.snap"
+
+
+def encode_record(section, value) -> bytes:
+    """Ein Abschnitt als Datensatz: Länge + CRC32 + zlib(pickle((name, wert)))."""
+    payload = zlib.compress(pickle.dumps((section, value), pickle.HIGHEST_PROTOCOL), 1)
+    return _RECORD.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(data: bytes):
+    """(Abschnitt, Wert, Datensatz) aus einer Snapshot-Datei; endet am ersten defekten Datensatz."""
+    if len(data) < _HEADER.size:
+        return
+    magic, version = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+        return
+    pos = _HEADER.size
+    while pos + _RECORD.size <= len(data):
+        length, crc = _RECORD.unpack_from(data, pos)
+        end = pos + _RECORD.size + length
+        payload = data[pos + _RECORD.size:end]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            return  # abgerissener letzter Datensatz (Stromausfall)
+        try:
+            section, value = pickle.loads(zlib.decompress(payload))
+        except Exception:
+            return
+        yield section, value, data[pos:end]
+        pos = end
+
+
+class SessionSnapshot(QObject):
+    """Sitzungszustand eines Benutzers als versionierte Binärdatei.
+
+    Der Zustand besteht aus benannten Abschnitten (Fenster, Dokumente,
+    Szenario, Icons). mark() merkt einen Abschnitt samt Lieferfunktion vor;
+    entprellt wird je Abschnitt nur der letzte Stand abgefragt. Kodieren
+    und Schreiben laufen auf dem BackgroundWriter: geänderte Abschnitte
+    werden angehängt (fsync), gelesen gilt der jeweils letzte Datensatz.
+    Wächst die Datei zu stark, wird sie atomar neu geschrieben.
+    """
+    def __init__(self, user, path=None, debounce_ms=SNAPSHOT_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.path = Path(path) if path else snapshot_path(user)
+        self.sections = {}
+        # nur im Schreib-Thread verändert (nach dem Laden)
+        self._records = {}
+        self._size = 0
+        try:
+            data = self.path.read_bytes()
+        except OSError:
+            data = b""
+        valid = _HEADER.size
+        for section, value, record in read_records(data):
+            valid += len(record)
+            if value is None:
+                self.sections.pop(section, None)
+                self._records.pop(section, None)
+            else:
+                self.sections[section] = value
+                self._records[section] = record
+        # ungültige/fremde Datei oder abgerissenes Ende -> beim ersten Schreiben komplett ersetzen
+        self._size = len(data) if self._records and valid == len(data) else 0
+        self._dirty = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.close)
+
+    def get(self, section, default=None):
+        """Wiederhergestellter Stand eines Abschnitts (wie beim Start gelesen)."""
+        return self.sections.get(section, default)
+
+    def mark(self, section, provider):
+        """Abschnitt vormerken; `provider()` liefert beim Schreiben den aktuellen Stand."""
+        self._dirty[section] = provider
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def put(self, section, value):
+        self.mark(section, lambda: value)
+
+    def drop(self, section):
+        self.put(section, None)
+
+    def flush(self):
+        self._timer.stop()
+        if not self._dirty:
+            return
+        values = {}
+        for section, provider in self._dirty.items():
+            try:
+                values[section] = provider()
+            except RuntimeError:
+                continue  # Fenster inzwischen gelöscht; sein Abschnitt wird separat verworfen
+        self._dirty.clear()
+        get_writer().submit(self._write, values)
+
+    def close(self):
+        """Ausstehendes schreiben und auf die Platte warten (Programmende)."""
+        self.flush()
+        get_writer().wait()
+
+    def _write(self, values):
+        # läuft im Schreib-Thread
+        appended = []
+        for section, value in values.items():
+            if value is None:
+                if self._records.pop(section, None) is None:
+                    continue
+                record = encode_record(section, None)
+            else:
+                record = encode_record(section, value)
+                if self._records.get(section) == record:
+                    continue
+                self._records[section] = record
+            appended.append(record)
+        if not appended:
+            return
+        live = _HEADER.size + sum(len(r) for r in self._records.values())
+        grown = self._size + sum(len(r) for r in appended)
+        if self._size == 0 or (grown > SNAPSHOT_COMPACT_MIN and grown > SNAPSHOT_COMPACT_RATIO * live):
+            data = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION) + b"".join(self._records.values())
+            atomic_write_bytes(self.path, data)
+            self._size = len(data)
+        else:
+            append_durable(self.path, b"".join(appended))
+            self._size = grown
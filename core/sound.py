@@ -1,26 +1,190 @@
+import wave
 from pathlib import Path
-from PySide6.QtMultimedia import QMediaPlayer, QAudioOutput
-from PySide6.QtCore import QUrl
+from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices, QtAudio
+from PySide6.QtCore import QObject, QBuffer, QByteArray, QIODevice
 
 ROOT = Path(__file__).resolve().parents[1]
 SFX_DIR = ROOT / "assets" / "sfx"
 
+# Gleichzeitig spielbare Sounds (Voice-Cap)
+MAX_VOICES = 4
+DEFAULT_VOLUME = 0.8
+DEFAULT_PRIORITY = 1
+# Höhere Priorität verdrängt niedrigere, wenn alle Voices belegt sind
+SOUND_PRIORITIES = {
+    "Windows Startup": 3,
+    "Windows Logon": 3,
+    "Windows Unlock": 3,
+    "Windows Logoff Sound": 2,
+    "observer": 4,
+}
+
+_SAMPLE_FORMATS = {
+    1: QAudioFormat.UInt8,
+    2: QAudioFormat.Int16,
+    4: QAudioFormat.Int32,
+}
+
+
+class Sample:
+    """Vollständig dekodierter WAV-Sound (PCM im Speicher)."""
+    def __init__(self, name, data: QByteArray, fmt: QAudioFormat, priority=DEFAULT_PRIORITY):
+        self.name = name
+        self.data = data
+        self.format = fmt
+        self.priority = priority
+
+
+def load_wav(path: Path, priority=DEFAULT_PRIORITY):
+    """Lese eine PCM-WAV-Datei in ein Sample (None bei nicht unterstütztem Format)."""
+    with wave.open(str(path), "rb") as w:
+        sample_format = _SAMPLE_FORMATS.get(w.getsampwidth())
+        if sample_format is None:
+            print(f"⚠ Sound-Format nicht unterstützt ({w.getsampwidth() * 8} bit): {path}")
+            return None
+        fmt = QAudioFormat()
+        fmt.setSampleRate(w.getframerate())
+        fmt.setChannelCount(w.getnchannels())
+        fmt.setSampleFormat(sample_format)
+        data = QByteArray(w.readframes(w.getnframes()))
+    return Sample(path.stem, data, fmt, priority)
+
+
+class _Voice:
+    """Eine Abspiel-Stimme: QAudioSink wird wiederverwendet, solange das Format passt."""
+    def __init__(self, engine):
+        self.engine = engine
+        self.sink = None
+        self.buffer = None
+        self.sample = None
+        self.serial = 0
+
+    def is_busy(self):
+        return self.sink is not None and self.sink.state() == QtAudio.State.ActiveState
+
+    def priority(self):
+        return self.sample.priority if self.sample else 0
+
+    def play(self, sample: Sample, volume: float, serial: int):
+        if self.sink is not None and self.sink.format() == sample.format:
+            self.sink.stop()
+        else:
+            if self.sink is not None:
+                self.sink.stop()
+                self.sink.deleteLater()
+            self.sink = QAudioSink(self.engine.device, sample.format, self.engine)
+        if self.buffer is None:
+            self.buffer = QBuffer(self.engine)
+        self.buffer.close()
+        # QBuffer teilt sich die Daten mit dem Sample (implizites Sharing, keine Kopie)
+        self.buffer.setData(sample.data)
+        self.buffer.open(QIODevice.ReadOnly)
+        self.sink.setVolume(volume)
+        self.sink.start(self.buffer)
+        self.sample = sample
+        self.serial = serial
+
+    def stop(self):
+        if self.sink is not None:
+            self.sink.stop()
+        self.sample = None
+
+
+class AudioEngine(QObject):
+    """Prozessweite Sound-Engine mit vorab dekodierten Samples und Voice-Pool.
+
+    Alle WAVs aus assets/sfx werden einmal in den Speicher geladen; play()
+    startet nur noch einen wiederverwendeten QAudioSink auf einem Puffer.
+    Bis zu `max_voices` Sounds laufen gleichzeitig; sind alle belegt, wird
+    die Stimme mit der niedrigsten Priorität (bei Gleichstand die älteste)
+    verdrängt - sofern der neue Sound mindestens gleich wichtig ist.
+    """
+    def __init__(self, max_voices=MAX_VOICES, volume=DEFAULT_VOLUME, parent=None):
+        super().__init__(parent)
+        self.max_voices = max_voices
+        self.volume = volume
+        self.device = QMediaDevices.defaultAudioOutput()
+        self._samples = {}
+        self._voices = []
+        self._serial = 0
+
+    def preload(self, directory: Path = SFX_DIR):
+        for path in sorted(directory.glob("*.wav")):
+            self._load(path)
+
+    def _load(self, path: Path):
+        try:
+            sample = load_wav(path, SOUND_PRIORITIES.get(path.stem, DEFAULT_PRIORITY))
+        except Exception as e:
+            print(f"⚠ Sound konnte nicht geladen werden: {path} ({e})")
+            sample = None
+        if sample:
+            self._samples[sample.name] = sample
+        return sample
+
+    def has(self, sound_name: str):
+        return sound_name in self._samples or (SFX_DIR / f"{sound_name}.wav").exists()
+
+    def _sample(self, sound_name: str):
+        sample = self._samples.get(sound_name)
+        if sample is None:
+            path = SFX_DIR / f"{sound_name}.wav"
+            if not path.exists():
+                print(f"⚠ Sound nicht gefunden: {path}")
+                return None
+            sample = self._load(path)
+        return sample
+
+    def _free_voice(self, priority):
+        for voice in self._voices:
+            if not voice.is_busy():
+                return voice
+        if len(self._voices) < self.max_voices:
+            voice = _Voice(self)
+            self._voices.append(voice)
+            return voice
+        victim = min(self._voices, key=lambda v: (v.priority(), v.serial))
+        if victim.priority() > priority:
+            return None
+        return victim
+
+    def play(self, sound_name: str, priority=None, volume=None):
+        """Spiele einen vorab geladenen Sound; False wenn verworfen."""
+        sample = self._sample(sound_name)
+        if sample is None or self.device.isNull():
+            return False
+        prio = sample.priority if priority is None else priority
+        voice = self._free_voice(prio)
+        if voice is None:
+            return False
+        self._serial += 1
+        voice.play(sample, self.volume if volume is None else volume, self._serial)
+        return True
+
+    def stop_all(self):
+        for voice in self._voices:
+            voice.stop()
+
+
+_engine = None
+
+def get_audio_engine():
+    """Prozessweite Sound-Engine (Samples werden beim ersten Zugriff geladen)."""
+    global _engine
+    if _engine is None:
+        _engine = AudioEngine()
+        _engine.preload()
+    return _engine
+
+
 class SoundPlayer:
+    """Leichtgewichtige Fassade auf die gemeinsame AudioEngine."""
     def __init__(self):
-        self.player = QMediaPlayer()
-        self.audio_output = QAudioOutput()
-        self.player.setAudioOutput(self.audio_output)
-        self.audio_output.setVolume(80)
+        self.engine = get_audio_engine()
 
     def play(self, sound_name: str):
         """Spiele einen Sound aus dem sfx-Verzeichnis"""
-        sound_path = SFX_DIR / f"{sound_name}.wav"
-        if not sound_path.exists():
-            print(f"⚠ Sound nicht gefunden: {sound_path}")
-            return
-        
-        self.player.setSource(QUrl.fromLocalFile(str(sound_path)))
-        self.player.play()
+        return self.engine.play(sound_name)
 
     def play_logon(self):
         self.play("Windows Logon")
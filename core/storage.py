@@ -0,0 +1,234 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+from PySide6.QtGui import QTextCursor
+
+
+def _fsync_dir(directory: Path):
+    # Verzeichniseintrag (rename) ebenfalls auf Platte bringen - nur POSIX
+    if os.name != "posix":
+        return
+    fd = os.open(str(directory), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path, data: bytes):
+    """Schreibe in eine Temp-Datei, fsync, dann rename -> nie halb geschriebene Dateien."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    _fsync_dir(path.parent)
+
+
+def atomic_write_text(path, text: str, encoding="utf-8"):
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def append_durable(path, data: bytes):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("ab") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class _WriteSignals(QObject):
+    done = Signal(int, str)  # Auftrags-Nr., Fehlertext ("" = ok)
+
+
+class _WriteTask(QRunnable):
+    def __init__(self, job, fn, args, signals):
+        super().__init__()
+        self.job = job
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+
+    def run(self):
+        error = ""
+        try:
+            self.fn(*self.args)
+        except Exception as e:
+            error = str(e) or e.__class__.__name__
+        self.signals.done.emit(self.job, error)
+
+
+class BackgroundWriter(QObject):
+    """Ein einzelner Schreib-Thread: Aufträge laufen nacheinander in Auftragsreihenfolge.
+
+    Der Aufrufer übergibt einen fertigen Snapshot (str/bytes); die
+    Festplatten-I/O inklusive fsync passiert nie im GUI-Thread. Callbacks
+    erhalten den Fehlertext ("" bei Erfolg) im GUI-Thread.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self._signals = _WriteSignals(self)
+        self._signals.done.connect(self._on_done)
+        self._callbacks = {}
+        self._job = 0
+
+    def submit(self, fn, *args, callback=None):
+        self._job += 1
+        if callback:
+            self._callbacks[self._job] = callback
+        self._pool.start(_WriteTask(self._job, fn, args, self._signals))
+        return self._job
+
+    def write_text(self, path, text: str, callback=None, encoding="utf-8"):
+        return self.submit(atomic_write_text, path, text, encoding, callback=callback)
+
+    def write_bytes(self, path, data: bytes, callback=None):
+        return self.submit(atomic_write_bytes, path, data, callback=callback)
+
+    def append(self, path, data: bytes, callback=None):
+        return self.submit(append_durable, path, data, callback=callback)
+
+    def _on_done(self, job, error):
+        cb = self._callbacks.pop(job, None)
+        if cb:
+            try:
+                cb(error)
+            except RuntimeError:
+                # Empfänger wurde inzwischen gelöscht
+                pass
+
+    def wait(self, msecs=-1):
+        return self._pool.waitForDone(msecs)
+
+
+_writer = None
+
+def get_writer():
+    """Prozessweiter Hintergrund-Schreiber."""
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+    return _writer
+
+
+# ---- Autosave-Journal ----
+JOURNAL_DEBOUNCE_MS = 1000
+JOURNAL_COMPACT_OPS = 500  # nach so vielen Änderungen wird ein neuer Snapshot geschrieben
+
+
+def _selected_text(document, start, end):
+    end = min(end, document.characterCount() - 1)
+    if end <= start:
+        return ""
+    cursor = QTextCursor(document)
+    cursor.setPosition(start)
+    cursor.setPosition(end, QTextCursor.KeepAnchor)
+    return cursor.selectedText().replace("\u2029", "\n")
+
+
+class EditJournal(QObject):
+    """Journal inkrementeller Änderungen eines QTextDocument (JSON-Zeilen).
+
+    Erste Zeile ist ein Snapshot {"base": text}, danach folgen Änderungen
+    {"p": pos, "r": entfernt, "t": eingefügt} in Dokument-Positionen
+    (UTF-16). Geschrieben wird entprellt über den BackgroundWriter; nach
+    JOURNAL_COMPACT_OPS Änderungen wird atomar ein neuer Snapshot angelegt.
+    recover() spielt ein Journal nach einem Absturz wieder ein.
+    """
+    def __init__(self, document, path, debounce_ms=JOURNAL_DEBOUNCE_MS, parent=None):
+        super().__init__(parent)
+        self.doc = document
+        self.path = Path(path)
+        self._ops = []
+        self._ops_since_snapshot = 0
+        self._active = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.flush)
+        self.doc.contentsChange.connect(self._on_change)
+
+    def start(self):
+        """Journal mit dem aktuellen Dokument als Basis neu beginnen."""
+        self._active = True
+        self._ops.clear()
+        self._snapshot()
+
+    def _snapshot(self):
+        self._ops_since_snapshot = 0
+        line = json.dumps({"base": self.doc.toPlainText()}, ensure_ascii=False) + "\n"
+        get_writer().write_bytes(self.path, line.encode("utf-8"))
+
+    def _on_change(self, position, removed, added):
+        if not self._active:
+            return
+        text = _selected_text(self.doc, position, position + added)
+        self._ops.append({"p": position, "r": removed, "t": text})
+        self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        if not self._ops:
+            return
+        self._ops_since_snapshot += len(self._ops)
+        if self._ops_since_snapshot >= JOURNAL_COMPACT_OPS:
+            self._ops.clear()
+            self._snapshot()
+            return
+        data = "".join(json.dumps(op, ensure_ascii=False) + "\n" for op in self._ops)
+        self._ops.clear()
+        get_writer().append(self.path, data.encode("utf-8"))
+
+    def discard(self):
+        """Sauberes Ende: Journal wird nicht mehr gebraucht."""
+        self._active = False
+        self._timer.stop()
+        self._ops.clear()
+        get_writer().submit(_unlink, self.path)
+
+    @staticmethod
+    def recover(path):
+        """Text aus einem Journal rekonstruieren (None wenn kein gültiges Journal)."""
+        path = Path(path)
+        try:
+            lines = path.read_bytes().decode("utf-8", errors="replace").split("\n")
+        except OSError:
+            return None
+        buf = None
+        for raw in lines:
+            if not raw:
+                continue
+            try:
+                rec = json.loads(raw)
+            except ValueError:
+                break  # abgerissene letzte Zeile nach einem Absturz
+            if "base" in rec:
+                buf = rec["base"].encode("utf-16-le")
+            elif buf is not None:
+                # Positionen sind UTF-16 Code Units -> 2 Bytes je Einheit
+                p = min(rec["p"] * 2, len(buf))
+                end = min((rec["p"] + rec["r"]) * 2, len(buf))
+                buf = buf[:p] + rec["t"].encode("utf-16-le") + buf[end:]
+        return None if buf is None else buf.decode("utf-16-le")
+
+
+def _unlink(path):
+    try:
+        Path(path).unlink()
+    except FileNotFoundError:
+        pass
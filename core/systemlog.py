@@ -0,0 +1,127 @@
+from pathlib import Path
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+from core.clock import get_clock
+
+ROOT = Path(__file__).resolve().parents[1]
+SANDBOX = ROOT / "sandbox"
+SYSTEMLOG = SANDBOX / "systemlog.txt"
+
+# Mehrere Änderungen kurz hintereinander werden zu einem Lesevorgang zusammengefasst
+TAIL_COALESCE_MS = 30
+# Blockgröße beim Rückwärtssuchen nach den letzten Zeilen
+TAIL_SEEK_CHUNK = 64 * 1024
+
+
+def append_systemlog(*lines, level="INFO", timestamp=False):
+    """Zeilen an sandbox/systemlog.txt anhängen (ohne die Datei neu zu schreiben)."""
+    SANDBOX.mkdir(parents=True, exist_ok=True)
+    prefix = f"[{level}] " if level else ""
+    stamp = f"{get_clock().now().strftime('%H:%M:%S')} " if timestamp else ""
+    with SYSTEMLOG.open("a", encoding="utf-8") as f:
+        for line in lines:
+            f.write(f"{stamp}{prefix}{line}\n")
+
+
+class LogTail(QObject):
+    """Folgt einer Datei wie `tail -f`: liest nur Bytes ab dem letzten Offset.
+
+    `appended(text)` liefert ausschließlich vollständige Zeilen; wird die Datei
+    gekürzt oder ersetzt, kommt `reset()` und es geht wieder bei 0 los
+    (mit `last_lines` bei den letzten so vielen Zeilen).
+    """
+    appended = Signal(str)
+    reset = Signal()
+
+    def __init__(self, path: Path = SYSTEMLOG, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._offset = 0
+        self._inode = None
+        self._partial = b""
+        self._last_lines = None
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.fileChanged.connect(self._schedule)
+        self._watcher.directoryChanged.connect(self._schedule)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(TAIL_COALESCE_MS)
+        self._timer.timeout.connect(self.poll)
+
+    def start(self, from_end=False, last_lines=None):
+        """Ab Dateiende (`from_end`), ab den letzten `last_lines` Zeilen oder ab 0 lesen."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._watcher.addPath(str(self.path.parent))
+        self._offset = 0
+        self._partial = b""
+        self._last_lines = last_lines
+        if self.path.exists():
+            st = self.path.stat()
+            if from_end:
+                self._offset, self._inode = st.st_size, st.st_ino
+            elif last_lines:
+                self._offset, self._inode = self._tail_offset(st.st_size), st.st_ino
+        self.poll()
+
+    def stop(self):
+        self._timer.stop()
+        paths = self._watcher.files() + self._watcher.directories()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def resume(self):
+        """Nach stop() ab dem bisherigen Offset weiterlesen; Zwischenzeit wird nachgeholt."""
+        self._watcher.addPath(str(self.path.parent))
+        self.poll()
+
+    def _schedule(self, *_):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def poll(self):
+        try:
+            st = self.path.stat()
+        except FileNotFoundError:
+            return
+        # Datei wurde ersetzt (z.B. rename) -> neu beobachten
+        if str(self.path) not in self._watcher.files():
+            self._watcher.addPath(str(self.path))
+        if st.st_ino != self._inode or st.st_size < self._offset:
+            if self._inode is not None:
+                self.reset.emit()
+            self._inode = st.st_ino
+            self._offset = self._tail_offset(st.st_size) if self._last_lines else 0
+            self._partial = b""
+        if st.st_size == self._offset:
+            return
+        with self.path.open("rb") as f:
+            f.seek(self._offset)
+            data = f.read(st.st_size - self._offset)
+        self._offset += len(data)
+        data = self._partial + data
+        cut = data.rfind(b"\n") + 1
+        self._partial = data[cut:]
+        if cut:
+            self.appended.emit(data[:cut].decode("utf-8", errors="replace"))
+
+    def _tail_offset(self, size):
+        """Byte-Offset, ab dem die Datei noch `last_lines` Zeilen enthält (rückwärts gesucht)."""
+        # ein abschließendes \n beendet die letzte Zeile und zählt nicht mit
+        pos, found = size - 1, 0
+        try:
+            with self.path.open("rb") as f:
+                while pos > 0:
+                    start = max(0, pos - TAIL_SEEK_CHUNK)
+                    f.seek(start)
+                    chunk = f.read(pos - start)
+                    end = len(chunk)
+                    while True:
+                        end = chunk.rfind(b"\n", 0, end)
+                        if end < 0:
+                            break
+                        found += 1
+                        if found == self._last_lines:
+                            return start + end + 1
+                    pos = start
+        except OSError:
+            pass
+        return 0
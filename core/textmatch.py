@@ -0,0 +1,121 @@
+import re
+import unicodedata
+from collections import deque
+from PySide6.QtCore import QObject
+from core.storage import _selected_text
+
+
+def fold(text):
+    """Suchschlüssel: ohne Groß-/Kleinschreibung und Akzente ("Émile" -> "emile")."""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(c for c in text if not unicodedata.combining(c))
+
+
+class PhraseMatcher:
+    """Aho-Corasick-Automat über alle Phrasen: ein Durchlauf findet jede Phrase.
+
+    Kosten sind linear in der Textlänge, unabhängig von der Anzahl der
+    Phrasen. Im Startzustand wird per Regex direkt zum nächsten möglichen
+    Phrasenanfang gesprungen, damit lange Texte nicht Zeichen für Zeichen
+    in Python durchlaufen werden.
+    """
+    def __init__(self, phrases=()):
+        self.phrases = tuple(dict.fromkeys(p for p in phrases if p))
+        # längste Phrase in QTextDocument-Positionen (UTF-16 Code Units)
+        self.max_units = max((len(p.encode("utf-16-le")) // 2 for p in self.phrases), default=0)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for idx, phrase in enumerate(self.phrases):
+            state = 0
+            for ch in phrase:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] += (idx,)
+        # Fehlerkanten per Breitensuche
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+        firsts = "".join(sorted(self._goto[0]))
+        self._skip = re.compile(f"[{re.escape(firsts)}]") if firsts else None
+
+    def __bool__(self):
+        return bool(self.phrases)
+
+    def finditer(self, text, offset=0):
+        """(Phrase, Start, Ende) für alle Vorkommen; Positionen + offset."""
+        if self._skip is None:
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        i = 0
+        n = len(text)
+        while i < n:
+            if state == 0:
+                m = self._skip.search(text, i)
+                if m is None:
+                    return
+                i = m.start()
+            ch = text[i]
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            i += 1
+            for idx in out[state]:
+                phrase = self.phrases[idx]
+                yield phrase, offset + i - len(phrase), offset + i
+
+
+class DocumentPhraseWatcher(QObject):
+    """Prüft bei jeder Änderung eines QTextDocument nur den geänderten Bereich.
+
+    Untersucht wird die Änderung plus (längste Phrase - 1) Zeichen Kontext
+    auf beiden Seiten; gemeldet werden nur Treffer, die die Änderung
+    berühren. `matcher` ist eine Funktion, damit ein neu geladener Automat
+    sofort greift; `on_match(phrase)` erhält jede neue Fundstelle.
+    """
+    def __init__(self, document, matcher, on_match, parent=None):
+        super().__init__(parent or document)
+        self.doc = document
+        self._matcher = matcher
+        self._on_match = on_match
+        document.contentsChange.connect(self._on_change)
+
+    def _on_change(self, position, removed, added):
+        matcher = self._matcher()
+        if not matcher:
+            return
+        context = matcher.max_units - 1
+        start = max(0, position - context)
+        end = min(self.doc.characterCount() - 1, position + added + context)
+        if end <= start:
+            return
+        # Kontext | Änderung | Kontext getrennt auslesen -> Grenzen in Zeichen
+        head = _selected_text(self.doc, start, position)
+        body = _selected_text(self.doc, position, position + added)
+        tail = _selected_text(self.doc, position + added, end)
+        text = head + body + tail
+        edit_start, edit_end = len(head), len(head) + len(body)
+        if edit_start == edit_end:
+            # reines Löschen: neu ist nur, was die Naht echt überspannt
+            touches = lambda s, e: s < edit_start < e
+        else:
+            touches = lambda s, e: s < edit_end and e > edit_start
+        for phrase, s, e in matcher.finditer(text):
+            if touches(s, e):
+                self._on_match(phrase)
+
@@ -0,0 +1,228 @@
+from string import Template
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QColor, QPalette
+from PySide6.QtWidgets import QApplication
+
+# Farbwerte je Variante; das Stylesheet wird pro Variante genau einmal erzeugt
+VARIANTS = {
+    "normal": {
+        "accent": "#136fd1",
+        "focus": "#0078d4",
+        "desktop": "#0b1e3a",
+        "taskbar": "rgba(32, 32, 51, 0.95)",
+        "editor_bg": "#ffffff",
+        "editor_fg": "#000000",
+        "error": "#c42b1c",
+        "login_error": "#ffb3b3",
+    },
+    "corrupted": {
+        "accent": "#8b1a1a",
+        "focus": "#c42b1c",
+        "desktop": "#1a0608",
+        "taskbar": "rgba(48, 16, 20, 0.95)",
+        "editor_bg": "#f6eded",
+        "editor_fg": "#1a0000",
+        "error": "#ff3b30",
+        "login_error": "#ff6b6b",
+    },
+}
+
+# Varianten einzelner Widgets laufen über Properties (active, selected, inverted, error)
+_QSS = Template("""
+/* ---- Login ---- */
+LoginDialog { background: $desktop; font-family: 'Segoe UI'; }
+LoginDialog QLabel#username { color: white; }
+LoginDialog QLabel#loginmsg { color: $login_error; }
+LoginDialog QLabel#subtitle { color: rgba(255,255,255,0.85); font-size: 12px; margin: 0px; }
+TileButton { background: rgba(0,0,0,0.25); border-radius: 4px; }
+TileButton[selected="true"] { background: $accent; }
+TileButton > QLabel { background: transparent; }
+TileButton > QLabel#tiletext { color: white; font-size: 14px; }
+#pwbox {
+    background: white;
+    border: 1px solid #ccc;
+    border-radius: 3px;
+}
+#pwedit {
+    border: none;
+    padding: 8px 12px;
+    color: black;
+    font-size: 14px;
+    background: white;
+    selection-background-color: $focus;
+}
+#arrow {
+    border-left: 1px solid #ddd;
+    background: white;
+    color: black;
+    font-size: 16px;
+}
+#arrow:hover { background: #f0f0f0; }
+QToolButton#sysbtn { color: white; background: rgba(0,0,0,0.35); border-radius: 4px; }
+QToolButton#sysbtn:hover { background: rgba(255,255,255,0.12); }
+
+/* ---- Benutzerauswahl ---- */
+#userpicker { background: #1f1f1f; border: 1px solid #3a3a3a; }
+#userpicker QLineEdit { background: #2b2b2b; color: white; border: none;
+                        padding: 6px 8px; font-size: 13px; }
+#userpicker QTableView { background: transparent; color: white; border: none; font-size: 13px; }
+#userpicker QTableView::item { padding: 0px 6px; }
+#userpicker QTableView::item:selected { background: $accent; }
+
+/* ---- Desktop ---- */
+DesktopArea[wallpaper="false"] { background-color: $desktop; }
+QGraphicsView#desktopicons { background: transparent; border: none; }
+QMdiArea#desktopmdi { background: transparent; border: none; }
+QMdiArea#desktopmdi > QWidget { background: transparent; }
+QMdiArea#desktopmdi QScrollBar { width: 0px; height: 0px; }
+
+/* ---- Taskleiste ---- */
+QFrame#taskbar {
+    background: $taskbar;
+    border-top: 1px solid rgba(255, 255, 255, 0.08);
+}
+QPushButton#startbtn {
+    background: transparent;
+    color: white;
+    font-size: 16px;
+    border-radius: 4px;
+    border: none;
+    font-weight: bold;
+}
+QPushButton#startbtn:hover, QPushButton#traybtn:hover { background: rgba(255, 255, 255, 0.08); }
+QPushButton#traybtn {
+    background: transparent;
+    color: white;
+    border: none;
+    border-radius: 4px;
+}
+QLineEdit#taskbarsearch {
+    background: rgba(255, 255, 255, 0.08);
+    border: 1px solid rgba(255, 255, 255, 0.12);
+    border-radius: 4px;
+    padding: 4px 8px;
+    color: rgba(255, 255, 255, 0.7);
+    font-size: 10px;
+}
+#searchpopup { background: #1f1f1f; border: 1px solid #3a3a3a; border-radius: 4px; }
+#searchpopup QListView { background: transparent; color: white; border: none; font-size: 12px; }
+#searchpopup QListView::item { height: 34px; padding: 0px 6px; }
+#searchpopup QListView::item:selected { background: $accent; }
+QLabel#clock {
+    color: rgba(255, 255, 255, 0.85);
+    font-size: 11px;
+    font-family: 'Segoe UI';
+}
+QPushButton#taskbtn {
+    background: rgba(255,255,255,0.06);
+    color: rgba(255,255,255,0.7);
+    border: 1px solid rgba(255,255,255,0.12);
+    border-radius: 6px;
+    text-align: left; padding-left: 8px; font-size: 11px;
+}
+QPushButton#taskbtn:hover { background: rgba(255,255,255,0.12); }
+QPushButton#taskbtn[active="true"] {
+    background: rgba(255,255,255,0.16);
+    color: white;
+    border: 1px solid rgba(255,255,255,0.25);
+}
+QPushButton#taskbtn[active="true"]:hover { background: rgba(255,255,255,0.22); }
+
+/* ---- Notepad ---- */
+QPlainTextEdit#notepad {
+    background: $editor_bg;
+    color: $editor_fg;
+    font-family: 'Consolas', 'Courier New', monospace;
+    font-size: 11px;
+    border: none;
+}
+QPlainTextEdit#notepad[inverted="true"] { background: $editor_fg; color: $editor_bg; }
+QLabel#findstatus[error="true"] { color: $error; }
+""")
+
+
+def _palette(colors):
+    pal = QPalette()
+    pal.setColor(QPalette.Highlight, QColor(colors["focus"]))
+    pal.setColor(QPalette.HighlightedText, QColor("#ffffff"))
+    pal.setColor(QPalette.Link, QColor(colors["focus"]))
+    return pal
+
+
+def set_style_state(widget, name, value):
+    """Property-Variante eines Widgets setzen; nur dieses Widget wird neu poliert."""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)
+
+
+class Theme(QObject):
+    """Windows-10-Look als ein Stylesheet + Palette für die ganze Anwendung.
+
+    Jede Variante wird einmal erzeugt und gecacht. Ein Wechsel (normal <->
+    corrupted) setzt Stylesheet und Palette einmal an der QApplication,
+    während die sichtbaren Fenster nicht neu zeichnen.
+    """
+    changed = Signal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.variant = "normal"
+        self._compiled = {}
+        self._app = None
+
+    def stylesheet(self, variant=None):
+        variant = variant or self.variant
+        if variant not in self._compiled:
+            colors = VARIANTS[variant]
+            self._compiled[variant] = (_QSS.substitute(colors), _palette(colors))
+        return self._compiled[variant][0]
+
+    def apply(self, app=None):
+        """Aktuelle Variante an der QApplication setzen (einmal pro Anwendung)."""
+        app = app or QApplication.instance()
+        if app is None or app is self._app:
+            return
+        self._app = app
+        self._install(app)
+
+    def set_variant(self, variant):
+        if variant not in VARIANTS:
+            raise ValueError(f"Unbekannte Theme-Variante: {variant!r}")
+        if variant == self.variant:
+            return
+        self.variant = variant
+        app = QApplication.instance()
+        if app is not None and app is self._app:
+            windows = [w for w in app.topLevelWidgets() if w.isVisible() and w.updatesEnabled()]
+            for w in windows:
+                w.setUpdatesEnabled(False)
+            try:
+                self._install(app)
+            finally:
+                for w in windows:
+                    w.setUpdatesEnabled(True)
+        self.changed.emit(variant)
+
+    def _install(self, app):
+        qss = self.stylesheet()
+        app.setPalette(self._compiled[self.variant][1])
+        app.setStyleSheet(qss)
+
+
+_theme = None
+
+def get_theme():
+    """Prozessweites Theme."""
+    global _theme
+    if _theme is None:
+        _theme = Theme()
+    return _theme
+
+
+def ensure_theme(app=None):
+    """Theme an der (laufenden) QApplication aktivieren (idempotent)."""
+    get_theme().apply(app)
@@ -0,0 +1,90 @@
+import re
+from bisect import bisect_left, bisect_right
+from core.config import CFG_USERS_EXTRA, UserEntry, users_config
+from core.textmatch import fold
+
+# Wortgrenzen für die Präfixsuche ("anna" findet auch "Müller Anna")
+_WORD_SPLIT = re.compile(r"[\s._\-@]+")
+
+
+class UserDirectory:
+    """Benutzerverzeichnis mit Präfixindex.
+
+    Reihenfolge wie in der Konfiguration; gesucht wird über eine sortierte
+    Liste aus (Wort, Position), also per bisect statt linearem Durchlauf.
+    Groß-/Kleinschreibung und Akzente spielen keine Rolle.
+    """
+    def __init__(self, entries=()):
+        self._entries = []
+        self._by_name = {}
+        for entry in entries:
+            if entry.username not in self._by_name:  # erster Eintrag gewinnt
+                self._by_name[entry.username] = len(self._entries)
+                self._entries.append(entry)
+        index = []
+        for pos, entry in enumerate(self._entries):
+            name = fold(entry.username)
+            words = {name} | {w for w in _WORD_SPLIT.split(name) if w}
+            index.extend((w, pos) for w in words)
+        index.sort()
+        self._keys = [w for w, _ in index]
+        self._positions = [pos for _, pos in index]
+
+    @classmethod
+    def from_dicts(cls, users):
+        """Aus der Listenform von load_users() (z.B. Tests, ältere Aufrufer)."""
+        return cls(UserEntry(str(u["username"]), str(u.get("password") or ""), u.get("avatar"))
+                   for u in users if isinstance(u, dict) and u.get("username"))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def entry(self, pos) -> UserEntry:
+        return self._entries[pos]
+
+    def position(self, name):
+        """Position eines Benutzers (None wenn unbekannt)."""
+        return self._by_name.get(name)
+
+    def get(self, name):
+        pos = self._by_name.get(name)
+        return None if pos is None else self._entries[pos]
+
+    def password(self, name) -> str:
+        entry = self.get(name)
+        return entry.password if entry is not None else ""
+
+    def check(self, name, password) -> bool:
+        return self.password(name) == password
+
+    def avatars(self):
+        """{Benutzer: Pfad} für Benutzer mit eigenem Profilbild."""
+        return {e.username: e.avatar for e in self._entries if e.avatar}
+
+    def search(self, prefix) -> list:
+        """Positionen aller Benutzer, bei denen ein Wort mit `prefix` beginnt (in Konfig-Reihenfolge)."""
+        prefix = fold(prefix.strip())
+        if not prefix:
+            return list(range(len(self._entries)))
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_right(self._keys, prefix + "\U0010ffff", lo)
+        return sorted(set(self._positions[lo:hi]))
+
+
+_directory = None
+_sources = None
+
+def get_user_directory():
+    """Benutzer aus users.yaml + optional users_extra.yaml (neu aufgebaut, wenn sich eine Datei ändert)."""
+    global _directory, _sources
+    sources = (users_config(), users_config(CFG_USERS_EXTRA))
+    if _directory is None or any(a is not b for a, b in zip(sources, _sources)):
+        _directory = UserDirectory(e for cfg in sources for e in cfg.users)
+        _sources = sources
+    return _directory
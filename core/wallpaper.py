@@ -0,0 +1,121 @@
+from collections import OrderedDict
+from math import ceil
+from pathlib import Path
+from PySide6.QtCore import Qt, QRectF, QSize, QObject, Signal
+from PySide6.QtGui import QPixmap, QColor, QGuiApplication
+from core.assets import get_asset_loader
+
+ROOT = Path(__file__).resolve().parents[1]
+WALLPAPER = ROOT / "assets" / "wallpapers" / "win10.jpg"
+FALLBACK_COLOR = "#0b1e3a"
+
+# Anzahl gleichzeitig gehaltener Oberflächen (Login + Desktop + Resize-Zwischenstand)
+MAX_SURFACES = 3
+# Mindest-Dekodiergröße (Login-Dialog ist fix 1920x1080)
+MIN_DECODE_SIZE = QSize(1920, 1080)
+
+
+class WallpaperCache(QObject):
+    """Wallpaper als fertig skalierte Oberfläche ("cover"), gecacht pro Größe und DPR.
+
+    Das JPEG wird im Hintergrund in Bildschirmgröße dekodiert; bis dahin
+    zeichnet paint() die Fallback-Farbe und `changed` meldet, wann neu
+    gezeichnet werden soll. Skaliert wird nur, wenn sich Widget-Größe oder
+    Device-Pixel-Ratio ändern; paint() kopiert danach nur noch das
+    freigelegte Rechteck.
+    """
+    changed = Signal()
+
+    def __init__(self, path=WALLPAPER, parent=None):
+        super().__init__(parent)
+        self.path = Path(path)
+        self._source = None
+        self._requested = False
+        self._surfaces = OrderedDict()  # (w, h, dpr) -> QPixmap
+
+    def _decode_size(self):
+        size = QSize(MIN_DECODE_SIZE)
+        for screen in QGuiApplication.screens():
+            dpr = screen.devicePixelRatio()
+            geo = screen.geometry().size()
+            size = size.expandedTo(QSize(ceil(geo.width() * dpr), ceil(geo.height() * dpr)))
+        return size
+
+    def source(self):
+        """Dekodiertes Wallpaper oder None (Dekodierung wird ggf. angestoßen)."""
+        if self._source is None and not self._requested and self.path.exists():
+            self._requested = True
+            get_asset_loader().request(
+                self.path, self._decode_size(), self._on_decoded, Qt.KeepAspectRatioByExpanding
+            )
+        return self._source
+
+    def _on_decoded(self, img):
+        if self._source is not None:
+            return
+        self._source = QPixmap.fromImage(img)
+        self._surfaces.clear()
+        self.changed.emit()
+
+    def is_available(self):
+        """True, wenn ein Wallpaper existiert (auch wenn es noch dekodiert wird)."""
+        self.source()
+        return self.path.exists()
+
+    def surface(self, width: int, height: int, dpr: float = 1.0):
+        """Skalierte Oberfläche für die gegebene Größe (aus dem Cache)."""
+        if width <= 0 or height <= 0:
+            return None
+        key = (width, height, round(dpr, 3))
+        cached = self._surfaces.get(key)
+        if cached is not None:
+            self._surfaces.move_to_end(key)
+            return cached
+        src = self.source()
+        if src is None:
+            return None
+        surf = self._build(src, width, height, dpr)
+        self._surfaces[key] = surf
+        while len(self._surfaces) > MAX_SURFACES:
+            self._surfaces.popitem(last=False)
+        return surf
+
+    def _build(self, src, width, height, dpr):
+        # Seitenverhältnis beibehalten und Fläche vollständig bedecken
+        tw, th = ceil(width * dpr), ceil(height * dpr)
+        scaled = src.scaled(tw, th, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        x = (scaled.width() - tw) // 2
+        y = (scaled.height() - th) // 2
+        surf = scaled.copy(x, y, tw, th)
+        surf.setDevicePixelRatio(dpr)
+        return surf
+
+    def paint(self, painter, widget, rect):
+        """Zeichne den Ausschnitt `rect` des Wallpapers für `widget`.
+
+        Gibt False zurück, wenn kein Wallpaper vorhanden ist (dann wird die
+        Fallback-Farbe gefüllt).
+        """
+        dpr = widget.devicePixelRatioF()
+        surf = self.surface(widget.width(), widget.height(), dpr)
+        if surf is None:
+            painter.fillRect(rect, QColor(FALLBACK_COLOR))
+            return False
+        target = QRectF(rect)
+        source = QRectF(target.x() * dpr, target.y() * dpr,
+                        target.width() * dpr, target.height() * dpr)
+        painter.drawPixmap(target, surf, source)
+        return True
+
+    def clear(self):
+        self._surfaces.clear()
+
+
+_cache = None
+
+def get_wallpaper_cache():
+    """Prozessweiter Wallpaper-Cache (Desktop und Login teilen sich die Oberflächen)."""
+    global _cache
+    if _cache is None:
+        _cache = WallpaperCache()
+    return _cache
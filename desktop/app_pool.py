@@ -0,0 +1,55 @@
+from PySide6.QtCore import QObject
+from core.scheduler import get_scheduler
+
+PREWARM_DELAY_MS = 500  # nach dem Login erst den Desktop fertig zeichnen
+PREWARM_STEP_MS = 30    # eine Instanz pro Schritt, die Oberfläche bleibt bedienbar
+REFILL_DELAY_MS = 250   # Nachschub erst, wenn das geöffnete Fenster steht
+
+
+class AppPool(QObject):
+    """Je App-Typ eine vorgewärmte, unsichtbare Instanz.
+
+    acquire() gibt die vorbereitete Instanz ab (oder baut notfalls sofort
+    eine) und plant den Nachschub ein. Gebaut wird schrittweise über den
+    Scheduler, also zwischen den Ereignissen des GUI-Threads. Zurückgegeben
+    wird nichts: geschlossene Fenster werden gelöscht, der Pool baut neu.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._factories = {}  # Schlüssel -> Funktion, die eine neue Instanz baut
+        self._idle = {}       # Schlüssel -> vorgewärmte Instanz
+        self._queue = []      # noch zu bauende Schlüssel
+        self._scheduler = get_scheduler()
+
+    def register(self, key, factory):
+        self._factories[key] = factory
+
+    def prewarm(self, keys=None, delay=PREWARM_DELAY_MS):
+        """Für `keys` (Standard: alle registrierten Apps) eine Instanz vorbereiten."""
+        for key in (self._factories if keys is None else keys):
+            self._enqueue(key, delay)
+
+    def acquire(self, key, refill=True):
+        item = self._idle.pop(key, None)
+        if item is None:
+            item = self._factories[key]()
+        if refill:
+            self._enqueue(key, REFILL_DELAY_MS)
+        return item
+
+    def is_warm(self, key) -> bool:
+        return key in self._idle
+
+    def _enqueue(self, key, delay):
+        if key in self._idle or key in self._queue:
+            return
+        self._queue.append(key)
+        if len(self._queue) == 1:
+            self._scheduler.schedule(delay, self._fill_next, owner=self)
+
+    def _fill_next(self):
+        key = self._queue.pop(0)
+        if key not in self._idle:
+            self._idle[key] = self._factories[key]()
+        if self._queue:
+            self._scheduler.schedule(PREWARM_STEP_MS, self._fill_next, owner=self)
@@ -1,10 +1,22 @@
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QMdiArea, QMdiSubWindow, QToolButton, QLineEdit
-from PySide6.QtCore import Qt, QTimer, QSize, QEvent
-from PySide6.QtGui import QIcon, QKeySequence, QShortcut, QPalette, QBrush
+from functools import partial
+from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QMdiArea, QMdiSubWindow, QLineEdit, QMenu
+from PySide6.QtCore import Qt, QSize, QEvent, QRect
+from PySide6.QtGui import QIcon, QKeySequence, QShortcut, QPalette, QBrush, QPainter, QPixmap
+from core.app_registry import get_app_registry
+from core.assets import get_asset_loader
+from core.ambient import ambient_params, create_ambient
+from core.config_watch import get_config_watcher
+from core.config import load_settings, load_scenario, scenario_config
 from core.session import Session
-from apps.notepad_app import NotepadWidget
-from apps.fake_browser_app import FakeBrowserWidget
-from apps.paint_app import PaintWidget
+from core.clock import get_clock
+from core.scheduler import get_scheduler
+from core.scenario import get_scenario_engine
+from core.theme import ensure_theme
+from core.wallpaper import get_wallpaper_cache
+from desktop.app_pool import AppPool
+from desktop.icon_layer import IconLayer
+from desktop.taskbar import TaskbarController
+from widgets.search_popup import SearchPopup
 from pathlib import Path
 
 # Sound-Import
@@ -16,16 +28,26 @@ except Exception:
     SoundPlayer = None
 
 ROOT = Path(__file__).resolve().parents[1]
-WALLPAPER = ROOT / "assets" / "wallpapers" / "win10.jpg"
-ICONS_DIR = ROOT / "assets" / "icons" / "applications"
+RESTORE_HIDDEN_DELAY_MS = 200  # versteckte Fenster erst, wenn die sichtbaren stehen
+RESTORE_STEP_MS = 30           # danach eines pro Schritt
+_TRACKED_EVENTS = (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide, QEvent.WindowStateChange)
+
+
+def _request_icon(button, icon_path, size):
+    """Icon im Hintergrund dekodieren und setzen, sobald es vorliegt."""
+    get_asset_loader().request(
+        icon_path, QSize(size, size),
+        lambda img: button.setIcon(QIcon(QPixmap.fromImage(img))),
+    )
 
 class CustomSubWindow(QMdiSubWindow):
     """QMdiSubWindow that maps native minimize to hide() to avoid MDI icon frames."""
     def showMinimized(self):
         # When user clicks the titlebar minimize button, hide instead
         try:
-            self.hide()
+            # erst Zustand zurücksetzen: setWindowState() zeigt ein verstecktes Subfenster wieder an
             self.setWindowState(Qt.WindowNoState)
+            self.hide()
         except Exception:
             pass
 
@@ -34,119 +56,81 @@ class CustomSubWindow(QMdiSubWindow):
         try:
             if event and event.type() == QEvent.WindowStateChange:
                 if self.windowState() & Qt.WindowMinimized:
-                    self.hide()
                     self.setWindowState(Qt.WindowNoState)
+                    self.hide()
                     event.accept()
                     return
         except Exception:
             pass
         return super().changeEvent(event)
 
-class DraggableIcon(QToolButton):
-    """Draggbares Desktop-Icon mit Label unten"""
-    def __init__(self, icon_path, label, callback, parent=None):
-        super().__init__(parent)
-        self.callback = callback
-        self.drag_start = None
-        
-        if Path(icon_path).exists():
-            self.setIcon(QIcon(str(icon_path)))
-        self.setIconSize(QSize(48, 48))
-        self.setText(label)
-        self.setFixedSize(90, 90)
-        self.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
-        self.setStyleSheet("""
-            QToolButton {
-                background: transparent;
-                border: none;
-                color: white;
-                font-size: 10px;
-                font-family: 'Segoe UI';
-                font-weight: normal;
-                padding: 4px;
-            }
-            QToolButton:hover {
-                background: rgba(255,255,255,0.08);
-                border-radius: 4px;
-            }
-        """)
-        self.setCursor(Qt.PointingHandCursor)
-        self.clicked.connect(self.callback)
-        
-    def mousePressEvent(self, event):
-        if event.button() == Qt.LeftButton:
-            self.drag_start = event.globalPos() - self.frameGeometry().topLeft()
-        super().mousePressEvent(event)
-        
-    def mouseMoveEvent(self, event):
-        if self.drag_start and event.buttons() == Qt.LeftButton:
-            self.move(event.globalPos() - self.drag_start)
-            # keep icons behind other windows/widgets
-            try:
-                self.lower()
-            except Exception:
-                pass
-        super().mouseMoveEvent(event)
-
 class DesktopArea(QWidget):
     """Desktop-Bereich mit Wallpaper und Icon-Grid"""
-    def __init__(self, session: Session, parent=None):
+    def __init__(self, session: Session, parent=None, icon_layout=None):
         super().__init__(parent)
         self.session = session
-        self.icons = []
         self.setAutoFillBackground(True)
-        # Load wallpaper pixmap and draw it in paintEvent to avoid platform
-        # painting issues where palette-based backgrounds may disappear.
-        self._wallpaper = None
-        if WALLPAPER.exists():
-            try:
-                from PySide6.QtGui import QPixmap
-                self._wallpaper = QPixmap(str(WALLPAPER))
-            except Exception:
-                self._wallpaper = None
-        if not self._wallpaper:
-            self.setStyleSheet("QWidget { background-color: #0b1e3a; }")
-            
-    def add_icon(self, icon_widget, row, col):
-        """Platziere Icon in Grid-Position"""
-        icon_widget.setParent(self)
-        x = 20 + col * 110
-        y = 20 + row * 110
-        icon_widget.move(x, y)
-        icon_widget.show()
-        # ensure icon stays behind top-level windows
-        try:
-            icon_widget.lower()
-        except Exception:
-            pass
-        self.icons.append(icon_widget)
+        # Wallpaper wird im paintEvent aus dem gemeinsamen Cache gezeichnet
+        # (skaliert nur bei Größenänderung, nicht bei jedem Repaint).
+        cache = get_wallpaper_cache()
+        self._wallpaper = cache if cache.is_available() else None
+        if self._wallpaper:
+            cache.changed.connect(self.update)
+        # ohne Wallpaper: Hintergrundfarbe aus dem Theme
+        self.setProperty("wallpaper", self._wallpaper is not None)
+        # Icons als Szenen-Elemente in einer transparenten Schicht
+        self.layer = IconLayer(icon_layout, self)
+
+    @property
+    def icons(self):
+        return self.layer.icons
+
+    def add_icon(self, key, label, callback, icon_path=None, row=None, col=0):
+        """Icon anlegen; ohne `row` (und ohne gespeicherte Position) in die nächste freie Zelle."""
+        return self.layer.add_icon(key, label, callback, icon_path,
+                                   cell=None if row is None else (col, row))
+
+    def resizeEvent(self, event):
+        self.layer.setGeometry(self.rect())
+        super().resizeEvent(event)
 
     def paintEvent(self, event):
-        # draw wallpaper scaled to cover the widget area while keeping aspect
+        # nur den freigelegten Bereich aus der gecachten Oberfläche kopieren
         if getattr(self, '_wallpaper', None):
-            from PySide6.QtGui import QPainter
             painter = QPainter(self)
-            pix = self._wallpaper
-            w, h = self.width(), self.height()
-            pw, ph = pix.width(), pix.height()
-            # scale preserving aspect ratio and cover
-            scale = max(w / pw, h / ph)
-            new_w, new_h = int(pw * scale), int(ph * scale)
-            px = (w - new_w) // 2
-            py = (h - new_h) // 2
-            painter.drawPixmap(px, py, new_w, new_h, pix)
+            self._wallpaper.paint(painter, self, event.rect())
             painter.end()
         else:
             super().paintEvent(event)
 
 class DesktopWindow(QWidget):
-    """Echter Windows-Desktop mit MDI und draggbaren Icons"""
-    def __init__(self, session: Session, parent=None):
+    """Echter Windows-Desktop mit MDI und draggbaren Icons.
+
+    Mit `snapshot` (core.snapshot.SessionSnapshot) wird die Sitzung
+    laufend gesichert und beim Start wiederhergestellt: sichtbare Fenster
+    sofort, versteckte danach schrittweise.
+    """
+    def __init__(self, session: Session, parent=None, snapshot=None):
         super().__init__(parent)
+        ensure_theme()
         self.session = session
+        self.snapshot = snapshot
+        self._window_seq = 0       # laufende Nummer für Fenster-Schlüssel (app-N)
+        self._restore_queue = []   # noch nicht wiederhergestellte (versteckte) Fenster
+        self._recording = False
         self.sound = SoundPlayer() if SOUND_AVAILABLE else None
+        # Prozedurales Ambient (settings.yaml: ambient.enabled), sonst None
+        self._settings = load_settings()
+        self._scenario_data = load_scenario()
+        self.ambient = create_ambient(self._settings, self._scenario_data, self)
+        # Änderungen an settings.yaml / scenario.yaml greifen ohne Neustart
+        watcher = get_config_watcher()
+        watcher.settings_changed.connect(self._on_settings_changed)
+        watcher.scenario_changed.connect(self._on_scenario_changed)
         self.open_windows = []  # Liste offener Top-Level-Fenster
-        self.taskbar_buttons = {}  # Dict: window -> taskbar_button
+        # Apps (Icons, Startmenü, Taskleiste) aus config/apps.yaml, Module erst beim Öffnen
+        self.apps = get_app_registry()
+        self._start_menu = None
         
         self.setWindowTitle(f"Desktop - {session.current_user}")
         self.resize(1600, 900)
@@ -165,7 +149,8 @@ class DesktopWindow(QWidget):
         self._stack_layout = stack_layout
 
         # Desktop-Area als Basis-Schicht
-        self.desktop = DesktopArea(session, stack_container)
+        self.desktop = DesktopArea(session, stack_container,
+                                   icon_layout=snapshot.get("icons") if snapshot else None)
         stack_layout.addWidget(self.desktop)
 
         # MDI-Area als obere Schicht (transparent)
@@ -175,17 +160,8 @@ class DesktopWindow(QWidget):
         self.mdi.setViewMode(QMdiArea.SubWindowView)
         self.mdi.setOption(QMdiArea.DontMaximizeSubWindowOnActivation, True)
         
-        # Komplett transparenter Hintergrund
-        self.mdi.setStyleSheet("""
-            QMdiArea {
-                background: transparent;
-                border: none;
-            }
-            QMdiArea QScrollBar {
-                width: 0px;
-                height: 0px;
-            }
-        """)
+        # Komplett transparenter Hintergrund (Stylesheet: core.theme)
+        self.mdi.setObjectName("desktopmdi")
         # Härtere Transparenz-Einstellungen gegen dunklen Hintergrund
         try:
             self.mdi.setAttribute(Qt.WA_TranslucentBackground, True)
@@ -205,7 +181,6 @@ class DesktopWindow(QWidget):
         try:
             viewport = self.mdi.viewport()
             if viewport:
-                viewport.setStyleSheet("background: transparent;")
                 viewport.setAttribute(Qt.WA_TranslucentBackground, True)
                 viewport.setAutoFillBackground(False)
         except Exception:
@@ -230,28 +205,36 @@ class DesktopWindow(QWidget):
         # Escape zum Schließen
         QShortcut(QKeySequence("Escape"), self, activated=self.close)
 
+        # Szenario: Sitzungsbeginn melden (bereits ausgelöste Trigger aus dem Snapshot zuerst)
+        self.scenario = get_scenario_engine()
+        if snapshot:
+            self.scenario.restore_progress(snapshot.get("scenario", {}), self._target_of, {None, "desktop"})
+        self.scenario.emit("session.start", user=session.current_user, target=self)
+
+        # Apps im Leerlauf vorwärmen
+        self._setup_app_pool()
+
+        if snapshot:
+            self._restore_session()
+
         
     def _setup_desktop_icons(self):
-        """Erstelle Desktop-Icons für Apps im Grid-Layout"""
-        # Notepad Icon
-        notepad_icon = DraggableIcon(
-            str(ICONS_DIR / "notepad.ico"),
-            "Notepad.exe",
-            self.open_notepad,
-            parent=self.desktop
-        )
-        self.desktop.add_icon(notepad_icon, 0, 0)
+        """Erstelle Desktop-Icons für Apps im Grid-Layout (config/apps.yaml: desktop: true)"""
+        apps = [spec for spec in self.apps if spec.desktop]
+        for row, spec in enumerate(apps):
+            self.desktop.add_icon(
+                spec.id,
+                spec.title,
+                partial(self.open_app, spec.id),
+                self.apps.icon_path(spec.id),
+                row=row,
+            )
             
     def _taskbar(self):
         from PySide6.QtWidgets import QFrame, QHBoxLayout
         bar = QFrame(self)
+        bar.setObjectName("taskbar")
         bar.setFixedHeight(48)
-        bar.setStyleSheet("""
-            QFrame {
-                background: rgba(32, 32, 51, 0.95);
-                border-top: 1px solid rgba(255, 255, 255, 0.08);
-            }
-        """)
         
         h = QHBoxLayout(bar)
         h.setContentsMargins(8, 6, 8, 6)
@@ -259,132 +242,123 @@ class DesktopWindow(QWidget):
         
         # Windows Start Button (echtes Style)
         win_btn = QPushButton("⊞")
+        win_btn.setObjectName("startbtn")
         win_btn.setFixedSize(46, 36)
-        win_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: white;
-                font-size: 16px;
-                border-radius: 4px;
-                border: none;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.08);
-            }
-        """)
+        win_btn.clicked.connect(lambda: self._show_start_menu(win_btn))
         h.addWidget(win_btn)
         
         # Suchleiste
         search = QLineEdit()
         search.setPlaceholderText("🔍 Suchen")
+        search.setObjectName("taskbarsearch")
         search.setFixedSize(200, 32)
-        search.setStyleSheet("""
-            QLineEdit {
-                background: rgba(255, 255, 255, 0.08);
-                border: 1px solid rgba(255, 255, 255, 0.12);
-                border-radius: 4px;
-                padding: 4px 8px;
-                color: rgba(255, 255, 255, 0.7);
-                font-size: 10px;
-            }
-            QLineEdit::placeholder {
-                color: rgba(255, 255, 255, 0.5);
-            }
-        """)
         h.addWidget(search)
+        self.search_popup = SearchPopup(search, self)
+        self.search_popup.chosen.connect(self._open_search_result)
         
-        # Taskbar-Buttons Container (für geöffnete Fenster)
-        self.taskbar_container = QHBoxLayout()
-        self.taskbar_container.setSpacing(4)
-        h.addLayout(self.taskbar_container)
+        # Taskbar-Buttons (für geöffnete Fenster), verwaltet vom TaskbarController
+        self.taskbar = TaskbarController(self.mdi, self)
+        self.taskbar.removed.connect(self._on_window_removed)
+        self.taskbar_buttons = self.taskbar.buttons  # Dict: window -> taskbar_button
+        self.taskbar_container = self.taskbar.layout
+        h.addWidget(self.taskbar.host)
         
         h.addStretch(1)
         
         # Netzwerk-Icon
         net_btn = QPushButton("🖧")
+        net_btn.setObjectName("traybtn")
         net_btn.setFixedSize(36, 32)
-        net_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: white;
-                border: none;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.08);
-            }
-        """)
         h.addWidget(net_btn)
         
         # Sound-Icon
         sound_btn = QPushButton("🔊")
+        sound_btn.setObjectName("traybtn")
         sound_btn.setFixedSize(36, 32)
-        sound_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: white;
-                border: none;
-                border-radius: 4px;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.08);
-            }
-        """)
         h.addWidget(sound_btn)
         
         # Uhr mit Datum
         self.clock = QLabel("--:-- --/--/----")
-        self.clock.setStyleSheet("""
-            QLabel {
-                color: rgba(255, 255, 255, 0.85);
-                font-size: 11px;
-                font-family: 'Segoe UI';
-            }
-        """)
+        self.clock.setObjectName("clock")
         self.clock.setFixedWidth(120)
         h.addWidget(self.clock, 0, Qt.AlignRight | Qt.AlignVCenter)
         
-        # Timer für Uhr und Datum
-        t = QTimer(bar)
-        t.timeout.connect(self._update_clock)
-        t.start(1000)
+        # Uhr und Datum (über den gemeinsamen Scheduler)
+        get_scheduler().every(1000, self._update_clock, owner=bar)
         self._update_clock()  # Initial update
         
         return bar
     
+    def _on_settings_changed(self, settings):
+        self._settings = settings
+        self._apply_ambient()
+
+    def _on_scenario_changed(self, scenario):
+        self._scenario_data = scenario
+        self._apply_ambient()
+
+    def _apply_ambient(self):
+        params = ambient_params(self._settings, self._scenario_data)
+        if not params["enabled"]:
+            if self.ambient is not None:
+                self.ambient.stop()
+                self.ambient = None
+        elif self.ambient is None:
+            self.ambient = create_ambient(self._settings, self._scenario_data, self)
+        else:
+            self.ambient.apply(params)
+
+    def _on_window_removed(self, sub):
+        # MDI verstecken wenn keine Fenster mehr offen (mit Safety Check)
+        try:
+            if hasattr(self, 'mdi') and self.mdi and len(self.mdi.subWindowList()) == 0:
+                self.mdi.setVisible(False)
+                # Switch stacked overlay back to desktop only
+                try:
+                    if hasattr(self, '_stack_layout'):
+                        self._stack_layout.setCurrentWidget(self.desktop)
+                except Exception:
+                    pass
+        except RuntimeError:
+            # MDI already deleted, ignore
+            pass
+
     def _update_clock(self):
-        from datetime import datetime
-        now_dt = datetime.now()
+        now_dt = get_clock().now()
         time_str = now_dt.strftime("%H:%M")
         date_str = now_dt.strftime("%d/%m/%Y")
         self.clock.setText(f"{time_str}  {date_str}")
         
-    def _open(self, widget_cls, title, session=None):
-        """Öffne App als MDI-Subwindow (INNERHALB des Desktop-Fensters)"""
-        # Alle Apps (inklusive Notepad) als MDI-Subwindow öffnen
-        # damit sie INNERHALB des Desktop-Fensters bleiben
-        
-        # Mache MDI sichtbar wenn erstes Fenster geöffnet wird
-        if not self.mdi.isVisible():
-            self.mdi.setVisible(True)
-            # Ensure MDI layer is the top of the stacked overlay
-            try:
-                if hasattr(self, '_stack_layout'):
-                    self._stack_layout.setCurrentWidget(self.mdi)
-            except Exception:
-                pass
-        
-        if session:
-            w = widget_cls(session=session)
-        else:
-            w = widget_cls()
-        
+    def _setup_app_pool(self):
+        """Je App eine Instanz im Leerlauf vorbereiten, damit Öffnen sofort sichtbar ist."""
+        self.app_pool = AppPool(self)
+        for spec in self.apps:
+            self.app_pool.register(spec.id, partial(self._build_app_window, spec.id))
+        self.app_pool.prewarm([spec.id for spec in self.apps if spec.prewarm])
+
+    def _build_app_window(self, app_id):
+        # Modul der App wird hier (erstes Öffnen bzw. Vorwärmen) importiert
+        return self._make_window(self.apps.create(app_id, session=self.session, prewarm=True))
+
+    def _show_start_menu(self, button):
+        """Startmenü aus der App-Registry (einmal gebaut, oberhalb des Buttons)."""
+        if self._start_menu is None:
+            self._start_menu = QMenu(self)
+            for spec in self.apps:
+                self._start_menu.addAction(spec.title, partial(self.open_app, spec.id))
+            self._start_menu.addSeparator()
+            self._start_menu.addAction("Abmelden", self.close)
+        menu = self._start_menu
+        pos = button.mapToGlobal(button.rect().topLeft())
+        pos.setY(pos.y() - menu.sizeHint().height())
+        menu.popup(pos)
+
+    def _make_window(self, w):
+        """Subfenster samt App bauen (noch unsichtbar, nicht im MDI)."""
         # Use custom subwindow to prevent Qt minimized icon frame
-        sub = CustomSubWindow()
+        sub = CustomSubWindow(self)
         sub.setWidget(w)
         sub.setAttribute(Qt.WA_DeleteOnClose)
-        sub.setWindowTitle(title)
         
         # WICHTIG: Verhindere MDI-typische Icons beim Minimieren
         # Setze Window-Flags um System-Menu und Minimize-Button zu zeigen
@@ -395,134 +369,243 @@ class DesktopWindow(QWidget):
         flags |= Qt.WindowMinMaxButtonsHint
         flags |= Qt.WindowCloseButtonHint
         sub.setWindowFlags(flags)
-        
-        # Styles
-        style_active = (
-            "QPushButton {"
-            " background: rgba(255,255,255,0.16);"
-            " color: white;"
-            " border: 1px solid rgba(255,255,255,0.25);"
-            " border-radius: 6px;"
-            " text-align: left; padding-left: 8px; font-size: 11px;"
-            "} QPushButton:hover { background: rgba(255,255,255,0.22); }"
-        )
-        style_dimmed = (
-            "QPushButton {"
-            " background: rgba(255,255,255,0.06);"
-            " color: rgba(255,255,255,0.7);"
-            " border: 1px solid rgba(255,255,255,0.12);"
-            " border-radius: 6px;"
-            " text-align: left; padding-left: 8px; font-size: 11px;"
-            "} QPushButton:hover { background: rgba(255,255,255,0.12); }"
-        )
-
-        # Taskbar-Button erstellen (mit App-Icon)
-        taskbar_btn = QPushButton(title[:24])
-        taskbar_btn.setFixedSize(180, 36)
-        # Icon ermitteln
-        try:
-            app_icon = QIcon()
-            if widget_cls.__name__ == 'NotepadWidget':
-                app_icon = QIcon(str(ICONS_DIR / 'notepad.ico'))
-            taskbar_btn.setIcon(app_icon)
-            taskbar_btn.setIconSize(QSize(16, 16))
-        except Exception:
-            pass
-        taskbar_btn.setStyleSheet(style_active)
-        
-        # Button-Funktionen
-        def toggle_window():
-            if sub.isVisible():
-                # Fenster verstecken (wie Windows Minimize)
-                sub.hide()
-                taskbar_btn.setStyleSheet(style_dimmed)
-            else:
-                # Fenster wiederherstellen
-                sub.show()
-                sub.raise_()
-                sub.activateWindow()
-                taskbar_btn.setStyleSheet(style_active)
-        
-        # Event Filter um Minimize abzufangen (QMdiSubWindow nutzt Events nicht Signals)
-        from PySide6.QtCore import QEvent, QObject
-        
-        class MinimizeFilter(QObject):
-            def __init__(self, subwin, btn):
-                super().__init__()
-                self.subwin = subwin
-                self.btn = btn
-            
-            def eventFilter(self, obj, event):
-                if event.type() == QEvent.WindowStateChange:
-                    if self.subwin.windowState() & Qt.WindowMinimized:
-                        # Verhindere Minimierung, verstecke stattdessen
-                        self.subwin.hide()
-                        self.subwin.setWindowState(Qt.WindowNoState)
-                        # Dim button
-                        self.btn.setStyleSheet(style_dimmed)
-                        return True  # Event handled
-                # Sichtbarkeit
-                if event.type() == QEvent.Hide:
-                    self.btn.setStyleSheet(style_dimmed)
-                elif event.type() == QEvent.Show:
-                    self.btn.setStyleSheet(style_active)
-                return super().eventFilter(obj, event)
-        
-        minimize_filter = MinimizeFilter(sub, taskbar_btn)
-        sub.installEventFilter(minimize_filter)
-        # Keep reference so it doesn't get garbage collected
-        sub._minimize_filter = minimize_filter
-        
-        def remove_taskbar_button():
-            if sub in self.taskbar_buttons:
-                btn = self.taskbar_buttons[sub]
-                self.taskbar_container.removeWidget(btn)
-                btn.deleteLater()
-                del self.taskbar_buttons[sub]
-            
-            # MDI verstecken wenn keine Fenster mehr offen (mit Safety Check)
-            try:
-                if hasattr(self, 'mdi') and self.mdi and len(self.mdi.subWindowList()) == 0:
-                    self.mdi.setVisible(False)
-                    # Switch stacked overlay back to desktop only
-                    try:
-                        if hasattr(self, '_stack_layout'):
-                            self._stack_layout.setCurrentWidget(self.desktop)
-                    except Exception:
-                        pass
-            except RuntimeError:
-                # MDI already deleted, ignore
-                pass
-        
-        taskbar_btn.clicked.connect(toggle_window)
-        sub.destroyed.connect(remove_taskbar_button)
-        
-        # Update Button-Styles anhand aktiven Subfensters
-        try:
-            def update_active(active_sub):
-                for sw, btn in list(self.taskbar_buttons.items()):
-                    btn.setStyleSheet(style_active if sw is active_sub and sw.isVisible() else style_dimmed)
-            self.mdi.subWindowActivated.connect(update_active)
-        except Exception:
-            pass
-        
-        # Button zur Taskleiste hinzufügen
-        self.taskbar_container.addWidget(taskbar_btn)
-        self.taskbar_buttons[sub] = taskbar_btn
-        
-        self.mdi.addSubWindow(sub)
         sub.resize(800, 520)
+        return sub
+
+    def open_app(self, app, **options):
+        """Öffne App als MDI-Subwindow (INNERHALB des Desktop-Fensters)
+
+        `options` gehen an reset() der frischen Instanz (z.B. path= für Notepad).
+        """
+        spec = self.apps.get(app)
+        if spec.single:
+            # nur ein Fenster: vorhandenes nach vorn holen
+            for sub in self.taskbar_buttons:
+                if sub.property("app") == app:
+                    if not sub.isVisible():
+                        self.taskbar.toggle(sub)
+                    self.mdi.setActiveSubWindow(sub)
+                    return sub.widget()
+
+        # vorgewärmtes Fenster aus dem Pool (oder sofort neu gebaut)
+        sub = self.app_pool.acquire(app, refill=not spec.single)
+        w = sub.widget()
+        if hasattr(w, "reset"):  # optional, siehe config/apps.yaml
+            w.reset(**options)
+        self._window_seq += 1
+        self._add_window(sub, app, f"{app}-{self._window_seq}")
         sub.show()
         w.setFocus()
+        self.scenario.emit("app.open", app=app, target=w, user=self.session.current_user)
+        return w
+
+    def _open_search_result(self, entry):
+        """Treffer der Taskleisten-Suche öffnen (Dateien und Dokumente im Notepad)."""
+        if entry.kind == "app":
+            self.open_app(entry.key)
+        elif entry.kind == "file":
+            # Datei direkt beim Start öffnen: kein systemlog.txt, nur ein notepad.open
+            self.open_app("notepad", path=entry.key)
+        elif entry.kind == "document":
+            doc = next((d for d in scenario_config().documents if d.id == entry.key), None)
+            if doc is not None:
+                self.open_app("notepad", text=doc.text)
+
+    def _add_window(self, sub, app, key):
+        """Subfenster samt Taskleisten-Button ins MDI (noch nicht angezeigt)."""
+        # Alle Apps (inklusive Notepad) als MDI-Subwindow öffnen
+        # damit sie INNERHALB des Desktop-Fensters bleiben
         
+        # Mache MDI sichtbar wenn erstes Fenster geöffnet wird
+        if not self.mdi.isVisible():
+            self.mdi.setVisible(True)
+            # Ensure MDI layer is the top of the stacked overlay
+            try:
+                if hasattr(self, '_stack_layout'):
+                    self._stack_layout.setCurrentWidget(self.mdi)
+            except Exception:
+                pass
+
+        spec = self.apps.get(app)
+        sub.setProperty("app", app)
+        sub.setProperty("winkey", key)
+        sub.setWindowTitle(spec.title)
+        
+        # Taskbar-Button erstellen (mit App-Icon, asynchron dekodiert)
+        taskbar_btn = self.taskbar.add(sub, spec.title)
+        icon = self.apps.icon_path(app)
+        if icon:
+            _request_icon(taskbar_btn, icon, 16)
+
+        self.mdi.addSubWindow(sub)
+        if self.snapshot:
+            self._track_window(sub, key)
+
+    # ---- Sitzungs-Snapshot ----
+    def _restore_session(self):
+        entries = [e for e in self.snapshot.get("windows", ()) if e.get("app") in self.apps]
+        for e in entries:
+            num = e["key"].rpartition("-")[2]
+            if num.isdigit():
+                self._window_seq = max(self._window_seq, int(num))
+        # sichtbare Fenster sofort (in Stapelreihenfolge), versteckte im Leerlauf
+        active = None
+        for e in entries:
+            if e["visible"]:
+                sub = self._restore_window(e)
+                if e.get("active"):
+                    active = sub
+        if active is not None:
+            self.mdi.setActiveSubWindow(active)
+            active.widget().setFocus()
+        self._restore_queue = [e for e in entries if not e["visible"]]
+        if self._restore_queue:
+            get_scheduler().schedule(RESTORE_HIDDEN_DELAY_MS, self._restore_next, owner=self)
+        self._recording = True
+        self.scenario.emitted.connect(self._mark_scenario)
+        self.scenario.fired.connect(self._mark_scenario)
+        self.mdi.subWindowActivated.connect(self._mark_windows)
+        self.desktop.layer.layout_changed.connect(
+            lambda: self.snapshot.mark("icons", self.desktop.layer.icon_layout))
+
+    def _restore_next(self):
+        if not self._restore_queue:
+            return
+        self._restore_window(self._restore_queue.pop(0))
+        if self._restore_queue:
+            get_scheduler().schedule(RESTORE_STEP_MS, self._restore_next, owner=self)
+
+    def _restore_window(self, entry):
+        app, key = entry["app"], entry["key"]
+        sub = self.app_pool.acquire(app, refill=False)
+        w = sub.widget()
+        # Szenario-Stand vor dem Start der App, damit nichts doppelt ausgelöst wird
+        self.scenario.restore_progress(self.snapshot.get("scenario", {}), lambda _name: w, {key})
+        state = self.snapshot.get(f"doc:{key}")
+        if state is not None and hasattr(w, "restore"):
+            state = {**state, **self.snapshot.get(f"cursor:{key}", {})}
+            w.restore(state)
+        elif hasattr(w, "reset"):
+            w.reset()
+        self._add_window(sub, app, key)
+        sub.setGeometry(QRect(*entry["geometry"]))
+        if entry["visible"]:
+            sub.showMaximized() if entry.get("maximized") else sub.show()
+        else:
+            self.taskbar.suspend(sub)  # wird nie angezeigt -> kein Hide-Ereignis
+        return sub
+
+    def _track_window(self, sub, key):
+        self._remember_normal_geometry(sub)
+        sub.installEventFilter(self)
+        sub.destroyed.connect(partial(self._on_window_destroyed, key))
+        w = sub.widget()
+        if hasattr(w, "state_changed"):
+            w.state_changed.connect(partial(self._mark_document, key, w))
+            self._mark_document(key, w)
+        if hasattr(w, "cursor_changed"):
+            # Cursor getrennt vom Dokument: eine Pfeiltaste schreibt nicht den ganzen Text
+            w.cursor_changed.connect(partial(self._mark_cursor, key, w))
+            self._mark_cursor(key, w)
+        self._mark_windows()
+
+    @staticmethod
+    def _remember_normal_geometry(sub):
+        # normalGeometry() ist bei Subfenstern immer leer -> Normalgröße selbst merken
+        if not sub.windowState() & (Qt.WindowMinimized | Qt.WindowMaximized):
+            sub.setProperty("normal_geometry", sub.geometry())
+
+    def _on_window_destroyed(self, key, *_):
+        if self._recording:
+            self.snapshot.drop(f"doc:{key}")
+            self.snapshot.drop(f"cursor:{key}")
+            self._mark_windows()
+            self._mark_scenario()
+
+    def _mark_document(self, key, widget):
+        if self._recording:
+            self.snapshot.mark(f"doc:{key}", widget.snapshot_state)
+            self._mark_scenario()
+
+    def _mark_cursor(self, key, widget):
+        if self._recording:
+            self.snapshot.mark(f"cursor:{key}", widget.cursor_state)
+
+    def _mark_windows(self, *_):
+        if self._recording:
+            self.snapshot.mark("windows", self._windows_state)
+            self._mark_scenario()
+
+    def _mark_scenario(self, *_):
+        # Restlaufzeiten geplanter Trigger mit jedem Schreiben aktualisieren
+        if self._recording:
+            self.snapshot.mark("scenario", self._scenario_state)
+
+    def _windows_state(self):
+        subs = [sub for sub in self.mdi.subWindowList(QMdiArea.StackingOrder)
+                if sub.property("winkey") is not None]
+        # ein minimiertes Fenster bleibt activeSubWindow() -> dann das oberste sichtbare
+        active = self.mdi.activeSubWindow()
+        if active is None or active.isHidden():
+            active = next((sub for sub in reversed(subs) if not sub.isHidden()), None)
+        entries = []
+        for sub in subs:
+            key = sub.property("winkey")
+            g = sub.geometry()
+            if sub.isHidden() or sub.windowState() & (Qt.WindowMinimized | Qt.WindowMaximized):
+                g = sub.property("normal_geometry") or g
+            entries.append({
+                "key": key, "app": sub.property("app"),
+                "geometry": (g.x(), g.y(), g.width(), g.height()),
+                "visible": not sub.isHidden(), "maximized": sub.isMaximized(),
+                "active": sub is active,
+            })
+        # noch nicht wiederhergestellte Fenster bleiben im Snapshot
+        return entries + list(self._restore_queue)
+
+    def _scenario_state(self):
+        state = self.scenario.progress(self._name_of)
+        if self._restore_queue:
+            keys = {e["key"] for e in self._restore_queue}
+            saved = self.snapshot.get("scenario", {})
+            state["fired"] += [f for f in saved.get("fired", ()) if f[1] in keys]
+            state["pending"] += [p for p in saved.get("pending", ()) if p[1] in keys]
+        return state
+
+    def _name_of(self, target):
+        if target is self:
+            return "desktop"
+        for sub in self.taskbar_buttons:
+            if sub.widget() is target:
+                return sub.property("winkey")
+        return None
+
+    def _target_of(self, name):
+        return self if name == "desktop" else None
+
+    def eventFilter(self, obj, event):
+        if event.type() in _TRACKED_EVENTS:
+            if event.type() in (QEvent.Move, QEvent.Resize):
+                self._remember_normal_geometry(obj)
+            self._mark_windows()
+        return super().eventFilter(obj, event)
+
+    def closeEvent(self, event):
+        if self.snapshot:
+            # Stand beim Abmelden sichern; das Abräumen der Fenster ändert ihn nicht mehr
+            self._mark_scenario()
+            self.snapshot.flush()
+            self._recording = False
+        super().closeEvent(event)
+
     def open_notepad(self):
-        self._open(NotepadWidget, "Notepad.exe", self.session)
+        self.open_app("notepad")
         
     def open_browser(self):
-        self._open(FakeBrowserWidget, "Google.exe (Demo)")
+        self.open_app("browser")
         
     def open_paint(self):
-        self._open(PaintWidget, "Paint.exe (Demo)")
+        self.open_app("paint")
 
     def resizeEvent(self, event):
         # QStackedWidget handled layout automatisch - kein manuelles resize nötig
@@ -0,0 +1,282 @@
+from PySide6.QtCore import Qt, QPointF, QRectF, QSize, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter, QPalette, QPixmap, QTextLayout
+from PySide6.QtWidgets import QApplication, QGraphicsItem, QGraphicsScene, QGraphicsView, QStyle
+from core.assets import get_asset_loader
+
+GRID_X = 110      # Rasterabstand der Icons
+GRID_Y = 110
+MARGIN = 20       # Abstand der ersten Spalte/Zeile vom Rand
+TILE = 90         # Kachelgröße eines Icons
+ICON_SIZE = 48
+DRAG_FRAME_MS = 16  # Mausbewegungen beim Ziehen werden pro Frame zusammengefasst
+
+
+def _label_lines(label, font, width):
+    """Beschriftung wie im Explorer: umbrechen, nach der zweiten Zeile kürzen."""
+    layout = QTextLayout(label, font)
+    layout.beginLayout()
+    line = layout.createLine()
+    line.setLineWidth(width)
+    layout.endLayout()
+    first = label[:line.textLength()].rstrip()
+    rest = label[line.textLength():].strip()
+    if not rest:
+        return first
+    return first + "\n" + QFontMetrics(font).elidedText(rest, Qt.ElideRight, width)
+
+
+def cell_origin(cell):
+    col, row = cell
+    return QPointF(MARGIN + col * GRID_X, MARGIN + row * GRID_Y)
+
+
+class DesktopIcon(QGraphicsItem):
+    """Ein Desktop-Icon als Szenen-Element (kein eigenes Widget, kein Stylesheet).
+
+    Die Grafik teilen sich alle Icons mit derselben Datei über die IconLayer.
+    """
+    def __init__(self, layer, key, label, callback, icon_path=None):
+        super().__init__()
+        self.layer = layer
+        self.key = key
+        self.label = label
+        self.callback = callback
+        self.icon_path = icon_path
+        self.cell = None
+        self._shown = None  # auf zwei Zeilen gekürzte Beschriftung
+        self.setFlag(QGraphicsItem.ItemIsSelectable)
+        self.setAcceptHoverEvents(True)
+        self.setToolTip(label)
+
+    def text(self):
+        return self.label
+
+    def activate(self):
+        self.callback()
+
+    def boundingRect(self):
+        return QRectF(0, 0, TILE, TILE)
+
+    def paint(self, painter, option, widget=None):
+        state = option.state
+        if state & (QStyle.State_Selected | QStyle.State_MouseOver):
+            fill = QColor(option.palette.color(QPalette.Highlight))
+            fill.setAlpha(110 if state & QStyle.State_Selected else 45)
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(fill)
+            painter.drawRoundedRect(self.boundingRect(), 4, 4)
+        pixmap = self.layer.pixmap(self.icon_path)
+        if pixmap is not None:
+            painter.drawPixmap((TILE - ICON_SIZE) // 2, 6, pixmap)
+        font = self.layer.label_font
+        if self._shown is None:
+            self._shown = _label_lines(self.label, font, TILE - 8)
+        painter.setFont(font)
+        painter.setPen(Qt.white)
+        painter.drawText(QRectF(4, ICON_SIZE + 10, TILE - 8, TILE - ICON_SIZE - 10),
+                         Qt.AlignHCenter | Qt.AlignTop, self._shown)
+
+
+class IconLayer(QGraphicsView):
+    """Icon-Schicht des Desktops (transparent über dem Wallpaper).
+
+    Icons sind leichte QGraphicsItems; Trefferprüfung, Neuzeichnen und
+    Gummiband-Auswahl laufen über den räumlichen Index der Szene, die
+    Belegung des Rasters über ein Dict Zelle -> Icon. Beim Ziehen wird
+    höchstens einmal pro Frame verschoben und beim Loslassen am Raster
+    eingerastet; danach meldet `layout_changed` die neue Anordnung.
+    """
+    layout_changed = Signal()
+
+    def __init__(self, layout=None, parent=None):
+        super().__init__(parent)
+        self.setObjectName("desktopicons")  # Aussehen: core.theme
+        self.icons = []
+        self._cells = {}      # (spalte, zeile) -> Icon
+        self._saved = dict(layout or {})  # gespeicherte Anordnung {key: (spalte, zeile)}
+        self._pixmaps = {}    # Icon-Datei -> QPixmap (None = wird geladen)
+        self._unplaced = []   # Icons ohne feste Zelle, eingereiht sobald die Größe feststeht
+        self._next = 0        # Suchbeginn für die nächste freie Zelle (spaltenweise)
+        self.label_font = QFont("Segoe UI")
+        self.label_font.setPixelSize(10)
+
+        self._scene = QGraphicsScene(self)
+        self._scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+        self.setScene(self._scene)
+        self.setAlignment(Qt.AlignLeft | Qt.AlignTop)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameShape(QGraphicsView.NoFrame)
+        self.setBackgroundBrush(Qt.NoBrush)
+        self.viewport().setAutoFillBackground(False)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setRenderHint(QPainter.SmoothPixmapTransform)
+        self.setDragMode(QGraphicsView.RubberBandDrag)
+
+        self._drag = None       # Icon -> Position beim Drücken
+        self._press = None      # Szenenposition beim Drücken
+        self._pending = None    # noch nicht angewendeter Versatz
+        self._drag_timer = QTimer(self)
+        self._drag_timer.setSingleShot(True)
+        self._drag_timer.setInterval(DRAG_FRAME_MS)
+        self._drag_timer.timeout.connect(self._apply_drag)
+
+    # ---- Icons ----
+    def add_icon(self, key, label, callback, icon_path=None, cell=None):
+        """Icon anlegen; gespeicherte Zelle > `cell` > nächste freie Zelle."""
+        item = DesktopIcon(self, key, label, callback, icon_path)
+        for candidate in (self._saved.get(key), cell):
+            if candidate is not None and candidate not in self._cells:
+                self._place(item, candidate)
+                break
+        else:
+            if self.isVisible():
+                self._place(item, self._next_cell())
+            else:
+                item.hide()
+                self._unplaced.append(item)
+        self._scene.addItem(item)
+        self.icons.append(item)
+        if icon_path and icon_path not in self._pixmaps:
+            self._pixmaps[icon_path] = None
+            get_asset_loader().request(icon_path, QSize(ICON_SIZE, ICON_SIZE),
+                                       lambda img, p=icon_path: self._icon_ready(p, img))
+        return item
+
+    def pixmap(self, icon_path):
+        return self._pixmaps.get(icon_path) if icon_path else None
+
+    def _icon_ready(self, icon_path, img):
+        self._pixmaps[icon_path] = QPixmap.fromImage(img)
+        self.viewport().update()
+
+    # ---- Raster ----
+    def _rows(self):
+        return max(1, (self.height() - MARGIN) // GRID_Y)
+
+    def _cols(self):
+        return max(1, (self.width() - MARGIN) // GRID_X)
+
+    def _place(self, item, cell):
+        if item.cell is not None and self._cells.get(item.cell) is item:
+            del self._cells[item.cell]
+        item.cell = cell
+        self._cells[cell] = item
+        item.setPos(cell_origin(cell))
+
+    def _next_cell(self):
+        """Erste freie Zelle spaltenweise von oben links (wie Windows)."""
+        rows = self._rows()
+        while (self._next // rows, self._next % rows) in self._cells:
+            self._next += 1
+        return self._next // rows, self._next % rows
+
+    def _free_cell(self, near):
+        """Freie Zelle möglichst nah an `near` (Ringe nach außen)."""
+        if near not in self._cells:
+            return near
+        col0, row0 = near
+        rows = self._rows()
+        radius = 1
+        while True:
+            for col in range(max(0, col0 - radius), col0 + radius + 1):
+                for row in range(max(0, row0 - radius), min(rows, row0 + radius + 1)):
+                    if max(abs(col - col0), abs(row - row0)) == radius and (col, row) not in self._cells:
+                        return col, row
+            radius += 1
+
+    def _place_pending(self):
+        self._next = 0
+        for item in self._unplaced:
+            self._place(item, self._next_cell())
+            item.show()
+        self._unplaced.clear()
+
+    def _snap(self, pos):
+        col = round((pos.x() - MARGIN) / GRID_X)
+        row = round((pos.y() - MARGIN) / GRID_Y)
+        return (min(max(col, 0), self._cols() - 1), min(max(row, 0), self._rows() - 1))
+
+    def icon_layout(self):
+        """Anordnung {key: (spalte, zeile)}; Icons, die es gerade nicht gibt, behalten ihre Zelle."""
+        cells = dict(self._saved)
+        cells.update((item.key, item.cell) for item in self.icons if item.cell is not None)
+        return cells
+
+    # ---- Maus ----
+    def mousePressEvent(self, event):
+        item = self.itemAt(event.position().toPoint())
+        if event.button() != Qt.LeftButton or not isinstance(item, DesktopIcon):
+            super().mousePressEvent(event)  # leere Fläche: Gummiband-Auswahl
+            return
+        if event.modifiers() & Qt.ControlModifier:
+            item.setSelected(not item.isSelected())
+            return
+        if not item.isSelected():
+            self._scene.clearSelection()
+            item.setSelected(True)
+        self._press = self.mapToScene(event.position().toPoint())
+        self._drag = {icon: icon.pos() for icon in self._scene.selectedItems()}
+        self._pending = None
+
+    def mouseMoveEvent(self, event):
+        if self._drag is None:
+            super().mouseMoveEvent(event)
+            return
+        delta = self.mapToScene(event.position().toPoint()) - self._press
+        if self._pending is None and delta.manhattanLength() < QApplication.startDragDistance():
+            return
+        self._pending = delta
+        if not self._drag_timer.isActive():
+            self._drag_timer.start()
+
+    def _apply_drag(self):
+        if self._drag is None or self._pending is None:
+            return
+        for icon, origin in self._drag.items():
+            icon.setPos(origin + self._pending)
+
+    def mouseReleaseEvent(self, event):
+        if self._drag is None:
+            super().mouseReleaseEvent(event)
+            return
+        self._drag_timer.stop()
+        dragged, moved = self._drag, self._pending is not None
+        self._apply_drag()
+        self._drag = self._press = self._pending = None
+        if not moved:
+            return
+        # erst alle gezogenen Zellen freigeben, dann in Zeichenreihenfolge einrasten
+        for icon in dragged:
+            if self._cells.get(icon.cell) is icon:
+                del self._cells[icon.cell]
+            icon.cell = None
+        for icon in sorted(dragged, key=lambda i: (i.pos().x(), i.pos().y())):
+            self._place(icon, self._free_cell(self._snap(icon.pos())))
+        self.layout_changed.emit()
+
+    def mouseDoubleClickEvent(self, event):
+        item = self.itemAt(event.position().toPoint())
+        if event.button() == Qt.LeftButton and isinstance(item, DesktopIcon):
+            item.activate()
+            return
+        super().mouseDoubleClickEvent(event)
+
+    def keyPressEvent(self, event):
+        if event.key() in (Qt.Key_Return, Qt.Key_Enter):
+            for icon in self._scene.selectedItems():
+                icon.activate()
+            return
+        super().keyPressEvent(event)
+
+    def resizeEvent(self, event):
+        self._scene.setSceneRect(0, 0, self.width(), self.height())
+        self._next = 0  # Zeilenzahl kann sich geändert haben
+        super().resizeEvent(event)
+        if self._unplaced and self.isVisible():
+            self._place_pending()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._unplaced:
+            self._place_pending()
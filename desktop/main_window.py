@@ -1,10 +1,9 @@
 from PySide6.QtWidgets import QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QFrame, QMdiArea, QMdiSubWindow, QMenu
 from PySide6.QtCore import Qt, QTimer, QTime
 from PySide6.QtGui import QKeySequence, QShortcut
+from functools import partial
+from core.app_registry import get_app_registry
 from core.session import Session
-from apps.notepad_app import NotepadWidget
-from apps.fake_browser_app import FakeBrowserWidget
-from apps.paint_app import PaintWidget
 
 # Sound-Import (optional fallback)
 try:
@@ -19,6 +18,7 @@ class DesktopWindow(QMainWindow):
         super().__init__(parent)
         self.session = session
         self.sound = SoundPlayer() if SOUND_AVAILABLE else None
+        self.apps = get_app_registry()  # App-Module werden erst beim Öffnen importiert
         self.setWindowTitle(f"Desktop - {session.current_user}")
         self.resize(1600, 900)
 
@@ -35,29 +35,28 @@ class DesktopWindow(QMainWindow):
 
         start = QPushButton("Start")
         menu = QMenu(self)
-        menu.addAction("Notepad.exe", self.open_notepad)
-        menu.addAction("Google.exe", self.open_browser)
-        menu.addAction("Paint.exe", self.open_paint)
+        for spec in self.apps:
+            menu.addAction(spec.title, partial(self.open_app, spec.id))
         menu.addSeparator()
         menu.addAction("Abmelden", self.close)
         menu.addAction("Beenden", self.close)
         start.setMenu(menu)
         h.addWidget(start)
 
-        btn1 = QPushButton("Notepad.exe"); btn1.clicked.connect(self.open_notepad); h.addWidget(btn1)
-        btn2 = QPushButton("Google.exe"); btn2.clicked.connect(self.open_browser); h.addWidget(btn2)
-        btn3 = QPushButton("Paint.exe"); btn3.clicked.connect(self.open_paint); h.addWidget(btn3)
+        for spec in self.apps:
+            btn = QPushButton(spec.title); btn.clicked.connect(partial(self.open_app, spec.id)); h.addWidget(btn)
 
         h.addStretch(1)
         self.clock = QLabel("--:--"); h.addWidget(self.clock, 0, Qt.AlignRight)
         t = QTimer(bar); t.timeout.connect(lambda: self.clock.setText(QTime.currentTime().toString("HH:mm"))); t.start(1000)
         return bar
 
-    def _open(self, widget_cls, title):
-        w = widget_cls(parent=self)
-        sub = QMdiSubWindow(self.mdi); sub.setWidget(w); sub.setAttribute(Qt.WA_DeleteOnClose); sub.setWindowTitle(title)
+    def open_app(self, app_id):
+        spec = self.apps.get(app_id)
+        w = self.apps.create(app_id, session=self.session, parent=self)
+        sub = QMdiSubWindow(self.mdi); sub.setWidget(w); sub.setAttribute(Qt.WA_DeleteOnClose); sub.setWindowTitle(spec.title)
         self.mdi.addSubWindow(sub); sub.resize(800, 520); sub.show(); w.setFocus()
 
-    def open_notepad(self): self._open(NotepadWidget, "Notepad.exe (Demo)")
-    def open_browser(self): self._open(FakeBrowserWidget, "Google.exe (Demo)")
-    def open_paint(self):   self._open(PaintWidget, "Paint.exe (Demo)")
+    def open_notepad(self): self.open_app("notepad")
+    def open_browser(self): self.open_app("browser")
+    def open_paint(self):   self.open_app("paint")
@@ -0,0 +1,126 @@
+from functools import partial
+from PySide6.QtCore import QObject, QEvent, Qt, QSize, Signal
+from PySide6.QtWidgets import QWidget, QHBoxLayout, QPushButton
+from core.scheduler import get_scheduler
+from core.theme import set_style_state
+
+
+class TaskbarController(QObject):
+    """Taskleisten-Buttons der MDI-Fenster.
+
+    Hält die Zuordnung Fenster -> Button, verbindet `subWindowActivated`
+    einmal und filtert alle Fenster mit einem einzigen Event-Filter.
+    Ein Fokuswechsel ändert nur die Property `active` der beiden
+    betroffenen Buttons (Aussehen: core.theme) und poliert nur diese neu.
+
+    Versteckte Fenster (Minimieren, Button, verdeckter Desktop) werden
+    angehalten: ihre geplanten Aufrufe ruhen im Scheduler und die App
+    bekommt suspend() bzw. beim Anzeigen resume(), falls vorhanden.
+    """
+    removed = Signal(object)  # Fenster, dessen Button entfernt wurde
+
+    def __init__(self, mdi, parent=None):
+        super().__init__(parent)
+        self.mdi = mdi
+        self.buttons = {}     # Fenster -> Button
+        self._active = None   # Fenster mit aktivem Button
+        self._suspended = set()  # angehaltene Fenster
+        self.host = QWidget()
+        self.layout = QHBoxLayout(self.host)
+        self.layout.setContentsMargins(0, 0, 0, 0)
+        self.layout.setSpacing(4)
+        mdi.subWindowActivated.connect(self._on_activated)
+
+    def add(self, sub, title):
+        """Button für ein Subfenster anlegen (vor dem ersten show())."""
+        btn = QPushButton(title[:24], self.host)
+        btn.setObjectName("taskbtn")
+        btn.setFixedSize(180, 36)
+        btn.setIconSize(QSize(16, 16))
+        btn.setProperty("active", False)
+        btn.clicked.connect(partial(self.toggle, sub))
+        sub.destroyed.connect(partial(self._remove, sub))
+        sub.installEventFilter(self)
+        self.layout.addWidget(btn)
+        self.buttons[sub] = btn
+        return btn
+
+    def toggle(self, sub):
+        """Wie Windows: sichtbares Fenster verstecken, verstecktes wiederherstellen."""
+        if sub.isVisible():
+            sub.hide()
+        else:
+            sub.show()
+            sub.raise_()
+            sub.activateWindow()
+            self.mdi.setActiveSubWindow(sub)
+            self._set_active(sub)
+
+    def suspend(self, sub):
+        """App im Fenster anhalten (Timer, Szenario-Aktionen, Caches)."""
+        if sub in self._suspended:
+            return
+        self._suspended.add(sub)
+        w = sub.widget()
+        if w is None:
+            return
+        get_scheduler().suspend(w)
+        if hasattr(w, "suspend"):
+            w.suspend()
+
+    def resume(self, sub):
+        if sub not in self._suspended:
+            return
+        self._suspended.discard(sub)
+        w = sub.widget()
+        if w is None:
+            return
+        if hasattr(w, "resume"):
+            w.resume()
+        get_scheduler().resume(w)
+
+    def is_suspended(self, sub) -> bool:
+        return sub in self._suspended
+
+    def _remove(self, sub):
+        self._suspended.discard(sub)
+        btn = self.buttons.pop(sub, None)
+        if self._active is sub:
+            self._active = None
+        if btn is not None:
+            self.layout.removeWidget(btn)
+            btn.deleteLater()
+        self.removed.emit(sub)
+
+    def _on_activated(self, sub):
+        if sub is not None and not sub.isVisible():
+            sub = None
+        self._set_active(sub)
+
+    def _set_active(self, sub):
+        previous, self._active = self._active, sub
+        if previous is not sub:
+            self._mark(previous, False)
+        self._mark(sub, True)
+
+    def _mark(self, sub, active):
+        btn = self.buttons.get(sub)
+        if btn is not None:
+            set_style_state(btn, "active", active)
+
+    def eventFilter(self, obj, event):
+        kind = event.type()
+        if kind == QEvent.WindowStateChange and obj.windowState() & Qt.WindowMinimized:
+            # Minimieren = verstecken (keine MDI-Icons)
+            obj.setWindowState(Qt.WindowNoState)
+            obj.hide()
+            return True
+        if kind == QEvent.Hide:
+            if obj is self._active:
+                self._set_active(None)
+            self.suspend(obj)
+        elif kind == QEvent.Show:
+            self.resume(obj)
+            if obj is self.mdi.activeSubWindow():
+                self._set_active(obj)
+        return super().eventFilter(obj, event)
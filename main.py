@@ -1,18 +1,22 @@
 import sys
 from PySide6.QtWidgets import QApplication, QDialog
-from core.config import load_users, ensure_dirs
+from core.config import ensure_dirs
+from core.theme import ensure_theme
+from core.users import get_user_directory
 from widgets.login_dialog import LoginDialog
-from desktop.main_window import DesktopWindow
+from desktop.desktop_area import DesktopWindow
 from core.session import Session
+from core.snapshot import SessionSnapshot
 
 def main():
     ensure_dirs()
     app = QApplication(sys.argv)
     app.setApplicationName("WinFake")
     app.setOrganizationName("FunLabs")
+    ensure_theme(app)
 
-    users = load_users()
-    if not users:
+    users = get_user_directory()
+    if not len(users):
         from PySide6.QtWidgets import QMessageBox
         QMessageBox.critical(None, "Konfiguration fehlt", "config/users.yaml enthält keine Benutzer.")
         sys.exit(1)
@@ -20,7 +24,8 @@ def main():
     dlg = LoginDialog(users)
     if dlg.exec() == QDialog.Accepted:
         sess = Session(current_user=dlg.selected_user())
-        win = DesktopWindow(session=sess)
+        # Sitzung wird laufend gesichert und beim nächsten Login wiederhergestellt
+        win = DesktopWindow(session=sess, snapshot=SessionSnapshot(sess.current_user))
         win.show()
         sys.exit(app.exec())
     else:
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Automatisierter Test für gespeicherten Zustand
+Testet: Sitzungs-Snapshot (abgerissene Datei, Verdichtung), Notepad-Journal
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PROJECT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+def _app():
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
+
+def _snapshot(path):
+    from core.snapshot import SessionSnapshot
+    return SessionSnapshot("test", path=path, debounce_ms=0)
+
+def _valid_length(path):
+    from core.snapshot import _HEADER, read_records
+    return _HEADER.size + sum(len(record) for *_, record in read_records(path.read_bytes()))
+
+def test_snapshot_truncated_mid_record():
+    """Test: abgerissener letzter Datensatz - ältere Abschnitte bleiben, nächstes Schreiben repariert"""
+    _app()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.snap"
+        snap = _snapshot(path)
+        snap.put("windows", [{"key": "notepad-1"}])
+        snap.put("icons", {"a": (1, 2)})
+        snap.close()
+        snap = _snapshot(path)
+        snap.put("windows", [{"key": "notepad-1"}, {"key": "paint-2"}])
+        snap.close()
+
+        data = path.read_bytes()
+        path.write_bytes(data[:-5])  # Stromausfall mitten im angehängten Datensatz
+
+        snap = _snapshot(path)
+        assert snap.get("windows") == [{"key": "notepad-1"}], "Stand vor dem abgerissenen Datensatz"
+        assert snap.get("icons") == {"a": (1, 2)}
+        snap.put("scenario", {"fired": []})
+        snap.close()
+        assert _valid_length(path) == path.stat().st_size, "Datei komplett neu geschrieben"
+
+        snap = _snapshot(path)
+        assert snap.get("windows") == [{"key": "notepad-1"}]
+        assert snap.get("icons") == {"a": (1, 2)}
+        assert snap.get("scenario") == {"fired": []}
+
+    print("\n✅ PASS: Truncated snapshot recovered")
+    return True
+
+def test_snapshot_compaction():
+    """Test: viele Änderungen desselben Abschnitts - die Datei wird verdichtet statt endlos zu wachsen"""
+    from core.snapshot import SNAPSHOT_COMPACT_MIN
+
+    _app()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "session.snap"
+        snap = _snapshot(path)
+        snap.put("icons", {"a": (1, 2)})
+        for i in range(60):
+            snap.put("doc:notepad-1", os.urandom(4096))  # kaum komprimierbar: ~4 KiB je Datensatz
+            snap.flush()
+        last = os.urandom(4096)
+        snap.put("doc:notepad-1", last)
+        snap.close()
+
+        size = path.stat().st_size
+        assert size < 2 * SNAPSHOT_COMPACT_MIN, f"ohne Verdichtung ~240 KiB, ist {size} Bytes"
+        assert _valid_length(path) == size
+
+        snap = _snapshot(path)
+        assert snap.get("doc:notepad-1") == last, "neuester Stand gewinnt"
+        assert snap.get("icons") == {"a": (1, 2)}, "unveränderte Abschnitte überstehen die Verdichtung"
+
+    print("\n✅ PASS: Snapshot compacted")
+    return True
+
+def test_journal_recover():
+    """Test: Journal spielt Änderungen (auch jenseits des BMP) wieder ein, abgerissene Zeile wird ignoriert"""
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtWidgets import QPlainTextEdit
+    from core.storage import EditJournal, get_writer
+
+    _app()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "notepad.journal"
+        edit = QPlainTextEdit()
+        edit.setPlainText("Zeile 1\nZeile 2")
+        journal = EditJournal(edit.document(), path, debounce_ms=0)
+        journal.start()
+        cursor = QTextCursor(edit.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText("\n🙂 Zeile 3")
+        cursor.setPosition(0)
+        cursor.setPosition(6, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()  # "Zeile " am Anfang löschen
+        journal.flush()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(" – Ende")
+        journal.flush()
+        get_writer().wait()
+        assert EditJournal.recover(path) == edit.toPlainText() == "1\nZeile 2\n🙂 Zeile 3 – Ende"
+
+        data = path.read_bytes()
+        path.write_bytes(data[:-4])  # Absturz beim Anhängen der letzten Änderung
+        assert EditJournal.recover(path) == "1\nZeile 2\n🙂 Zeile 3", "Stand vor der abgerissenen Zeile"
+        assert EditJournal.recover(Path(tmp) / "fehlt.journal") is None
+        journal.discard()
+        get_writer().wait()
+        assert not path.exists()
+
+    print("\n✅ PASS: Journal recovered")
+    return True
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_snapshot_truncated_mid_record, test_snapshot_compaction, test_journal_recover):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ FAILED: {e}")
+            ok = False
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""
+Automatisierter Test für Szenario-Abläufe
+Testet: Notepad-Skript mit virtueller Zeit (kein Warten auf echte Timer)
+"""
+import os
+import sys
+import time
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+PROJECT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+def test_notepad_script_fast_forward():
+    """Test: 30 Minuten Szenario laufen in Sekunden, Trigger feuern zur richtigen Zeit"""
+    print("=" * 60)
+    print("TEST: Notepad Script (virtual time)")
+    print("=" * 60)
+
+    from core.headless import ScenarioRunner
+
+    started = time.perf_counter()
+    with ScenarioRunner("Milan") as runner:
+        runner.open("notepad")
+        runner.run(30 * 60_000)
+        notepad = runner.desktop.mdi.subWindowList()[0].widget()
+        text = notepad.edit.toPlainText()
+        for record in runner.records:
+            print(f"  {record}")
+
+        assert runner.fired("notepad_unstable") == [5000], "Phase 1 nach 5 s"
+        assert runner.fired("notepad_untrusted") == [7000], "Phase 2 zwei Sekunden später"
+        assert runner.fired("notepad_username") == [8000], "Milan-Trigger nach einer weiteren Sekunde"
+        assert runner.fired("notepad_suggestive") == [12000], "Suggestive Phrasen nach 5 s"
+        assert "[ERROR] Umgebung: nicht vertrauenswürdig" in text
+        assert "Beobachtung fortgesetzt." in text
+
+    elapsed = time.perf_counter() - started
+    print(f"\n✓ 30 min virtuell in {elapsed:.2f} s")
+    assert elapsed < 30, "Headless-Lauf sollte nicht auf echte Timer warten"
+
+    print("\n✅ PASS: Scenario replayed in virtual time")
+    return True
+
+def test_username_trigger_only_for_milan():
+    """Test: when-Bedingung (user: Milan) greift"""
+    from core.headless import ScenarioRunner
+
+    with ScenarioRunner("Gast") as runner:
+        runner.open("notepad")
+        runner.run(60_000)
+        assert runner.fired("notepad_untrusted") == [7000]
+        assert runner.fired("notepad_username") == [], "Nur für Milan"
+
+    print("\n✅ PASS: Trigger conditions respected")
+    return True
+
+def test_replace_line_from_scenario():
+    """Test: notepad.replace_line ersetzt auch Zeilen außerhalb der Standard-Skriptzeilen"""
+    from core.headless import ScenarioRunner
+
+    scenario = {"triggers": [
+        {"id": "rename_user", "on": "notepad.open", "after": "1s",
+         "actions": [{"do": "notepad.replace_line",
+                      "old": "[INFO] Benutzer: Gast", "new": "[INFO] Benutzer: unbekannt"}],
+         "then": ["after_rename"]},
+        {"id": "after_rename", "after": "1s",
+         "actions": [{"do": "notepad.append", "text": "\n[INFO] umbenannt"}]},
+    ]}
+    with ScenarioRunner("Gast", scenario=scenario) as runner:
+        runner.open("notepad")
+        runner.run(5000)
+        text = runner.desktop.mdi.subWindowList()[0].widget().edit.toPlainText()
+        assert runner.fired("rename_user") == [1000]
+        assert runner.fired("after_rename") == [2000], "Kette läuft nach dem Ersetzen weiter"
+        assert "[INFO] Benutzer: unbekannt" in text and "[INFO] Benutzer: Gast" not in text
+
+    print("\n✅ PASS: replace_line for arbitrary lines")
+    return True
+
+def test_phrase_joined_by_deletion():
+    """Test: Löschen fügt eine Phrase aus beiden Seiten zusammen -> Treffer, Löschen daneben nicht"""
+    from PySide6.QtGui import QTextCursor
+    from PySide6.QtWidgets import QApplication, QPlainTextEdit
+    from core.textmatch import DocumentPhraseWatcher, PhraseMatcher
+
+    app = QApplication.instance() or QApplication([])
+    matcher = PhraseMatcher(["Umgebung: stabil"])
+    cases = (("Umgebung: staXXbil", 13, 15, ["Umgebung: stabil"]),  # mitten in der Phrase
+             ("XXUmgebung: stabil", 0, 2, []),       # Phrase stand schon vorher da
+             ("ZZUmgebung: stabil", 1, 2, []),
+             ("Umgebung: stabilXX", 16, 18, []),
+             ("[INFO] Umgebung: stabil\nX", 23, 24, []))  # Zeilenumbruch dahinter löschen
+    for text, start, end, expected in cases:
+        edit = QPlainTextEdit()
+        edit.setPlainText(text)
+        hits = []
+        DocumentPhraseWatcher(edit.document(), lambda: matcher, hits.append)
+        cursor = QTextCursor(edit.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        cursor.removeSelectedText()
+        assert hits == expected, f"{text!r}: {hits}"
+
+    print("\n✅ PASS: Phrase across deletion")
+    return True
+
+def test_hidden_notepad_pauses_script():
+    """Test: minimiertes Notepad hält das Skript an, die Restzeit läuft danach weiter"""
+    from core.headless import ScenarioRunner
+
+    with ScenarioRunner("Milan") as runner:
+        runner.open("notepad")
+        runner.run(3000)
+        sub = runner.desktop.mdi.subWindowList()[0]
+        sub.showMinimized()
+        runner.run(60_000)
+        assert runner.fired("notepad_unstable") == [], "Versteckt: nichts feuert"
+        runner.desktop.taskbar.toggle(sub)
+        runner.run(10_000)
+        assert runner.fired("notepad_unstable") == [65000], "Restzeit 2 s nach dem Anzeigen"
+
+    print("\n✅ PASS: Hidden window suspended")
+    return True
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_notepad_script_fast_forward, test_username_trigger_only_for_milan,
+                 test_replace_line_from_scenario, test_phrase_joined_by_deletion,
+                 test_hidden_notepad_pauses_script):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ FAILED: {e}")
+            ok = False
+    sys.exit(0 if ok else 1)
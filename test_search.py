@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""
+Automatisierter Test für die Taskleisten-Suche
+Testet: SearchIndex (Präfix- und Teilwortsuche, Einfügen und Entfernen)
+"""
+import sys
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(PROJECT_DIR))
+
+def test_search_index_add_remove():
+    """Test: Wortanfänge vor Teilwörtern, add/remove halten Wortliste und Trigramme aktuell"""
+    from core.search import SearchEntry, SearchIndex
+
+    def keys(index, text, limit=8):
+        return [e.key for e in index.search(text, limit)]
+
+    index = SearchIndex([
+        SearchEntry("file", "a", "Bericht Überwachung.txt"),
+        SearchEntry("file", "b", "Notizen.txt"),
+        SearchEntry("file", "c", "Zugangsbericht.txt"),
+    ])
+    assert len(index) == 3
+    assert keys(index, "bericht") == ["a", "c"], "Wortanfang vor Teilwort"
+    assert keys(index, "uberwachung") == ["a"], "Umlaute gefaltet"
+    assert keys(index, "bericht zugang") == ["c"], "alle Wörter müssen vorkommen"
+    assert keys(index, "bericht", limit=1) == ["a"]
+    assert keys(index, "xy") == [] and keys(index, "  ") == []
+
+    index.add(SearchEntry("file", "d", "Bericht 2.txt"))
+    assert keys(index, "bericht") == ["a", "d", "c"]
+    index.add(SearchEntry("file", "b", "Protokoll.txt"))  # gleicher Schlüssel -> ersetzt
+    assert len(index) == 4
+    assert keys(index, "notizen") == [] and keys(index, "tokoll") == ["b"]
+
+    index.remove("a")
+    index.remove("fehlt")  # unbekannte Schlüssel sind kein Fehler
+    assert "a" not in index and len(index) == 3
+    assert keys(index, "bericht") == ["d", "c"]
+    assert keys(index, "wachung") == [], "Trigramme des entfernten Eintrags sind weg"
+    assert not any(num == 0 for _, num in index._words), "keine verwaisten Wort-Einträge"
+    assert all(index._trigrams.values()), "keine leeren Trigramm-Listen"
+
+    print("\n✅ PASS: Search index add/remove")
+    return True
+
+if __name__ == "__main__":
+    ok = True
+    for test in (test_search_index_add_remove,):
+        try:
+            test()
+        except AssertionError as e:
+            print(f"\n❌ FAILED: {e}")
+            ok = False
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,138 @@
+from collections import OrderedDict
+from math import ceil
+from pathlib import Path
+from PySide6.QtCore import Qt, QSize
+from PySide6.QtGui import QPixmap, QPainter, QPainterPath, QColor, QPen
+
+from core.assets import get_asset_loader, PROFILE_IMG
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Gerenderte Avatare (Größen x Benutzer x DPR); klein genug für viele Kacheln
+AVATAR_CACHE_SIZE = 128
+
+
+def render_avatar(size: int, fg="#d0d0d0", image=None, dpr: float = 1.0):
+    """Runder Avatar mit Rahmen: Profilbild (QImage) oder graue Silhouette."""
+    px = ceil(size * dpr)
+    out = QPixmap(px, px)
+    out.fill(Qt.transparent)
+    path = QPainterPath()
+    path.addEllipse(0, 0, px, px)
+    p = QPainter(out)
+    p.setRenderHint(QPainter.Antialiasing, True)
+    p.setClipPath(path)
+    if image is not None and not image.isNull():
+        original = QPixmap.fromImage(image)
+        if original.width() != px:
+            original = original.scaledToWidth(px, Qt.SmoothTransformation)
+        x = (px - original.width()) // 2
+        y = (px - original.height()) // 2
+        p.drawPixmap(x, y, original)
+    else:
+        # Fallback: Graue Silhouette
+        p.setBrush(QColor(fg))
+        p.setPen(Qt.NoPen)
+        r = int(px*0.44)
+        x = int((px-r)/2)
+        y = int(px*0.12)
+        p.drawEllipse(x, y, r, r)
+        p.drawRoundedRect(int(px*0.16), int(px*0.52), int(px*0.68), int(px*0.34), 22, 22)
+    p.setClipping(False)
+    p.setPen(QPen(QColor("#d0d0d0"), 2 * dpr))
+    p.setBrush(Qt.NoBrush)
+    p.drawEllipse(0, 0, px-1, px-1)
+    p.end()
+    out.setDevicePixelRatio(dpr)
+    return out
+
+
+class AvatarCache:
+    """Memoisierte Avatare, Schlüssel (user, size, use_profile, dpr), begrenzte LRU.
+
+    Profilbilder werden pro Benutzer aufgelöst (users.yaml: `avatar: <pfad>`),
+    sonst gilt assets/profile/profile.png. Ist das Bild noch nicht dekodiert,
+    liefert get() die (ebenfalls gecachte) Silhouette und ruft `callback` mit
+    dem fertigen Avatar auf.
+    """
+    def __init__(self, capacity=AVATAR_CACHE_SIZE):
+        self.capacity = capacity
+        self._pixmaps = OrderedDict()
+        self._profiles = {}  # user -> Path
+
+    def set_profile(self, user, path):
+        path = Path(path)
+        if not path.is_absolute():
+            path = ROOT / path
+        if self._profiles.get(user) != path:
+            self._profiles[user] = path
+            for key in [k for k in self._pixmaps if k[0] == user]:
+                del self._pixmaps[key]
+
+    def profile_path(self, user):
+        path = self._profiles.get(user, PROFILE_IMG)
+        return path if path.exists() else None
+
+    def _store(self, key, pixmap):
+        self._pixmaps[key] = pixmap
+        self._pixmaps.move_to_end(key)
+        while len(self._pixmaps) > self.capacity:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def _silhouette(self, size, dpr):
+        key = (None, size, False, dpr)
+        pm = self._pixmaps.get(key)
+        if pm is None:
+            pm = self._store(key, render_avatar(size, dpr=dpr))
+        else:
+            self._pixmaps.move_to_end(key)
+        return pm
+
+    def get(self, user, size: int, use_profile=True, dpr: float = 1.0, callback=None):
+        dpr = round(dpr, 3)
+        path = self.profile_path(user) if use_profile else None
+        if path is None:
+            return self._silhouette(size, dpr)
+        key = (user, size, True, dpr)
+        pm = self._pixmaps.get(key)
+        if pm is not None:
+            self._pixmaps.move_to_end(key)
+            return pm
+        px = ceil(size * dpr)
+
+        def decoded(img):
+            done = self._pixmaps.get(key)
+            if done is None:
+                done = self._store(key, render_avatar(size, image=img, dpr=dpr))
+            if callback:
+                callback(done)
+
+        img = get_asset_loader().cached(path, QSize(px, px), Qt.KeepAspectRatioByExpanding)
+        if img is not None:
+            return self._store(key, render_avatar(size, image=img, dpr=dpr))
+        get_asset_loader().request(path, QSize(px, px), decoded, Qt.KeepAspectRatioByExpanding)
+        return self._silhouette(size, dpr)
+
+
+_cache = None
+
+def get_avatar_cache():
+    """Prozessweiter Avatar-Cache."""
+    global _cache
+    if _cache is None:
+        _cache = AvatarCache()
+    return _cache
+
+
+def set_avatar(label, user, size: int, use_profile=True):
+    """Avatar eines Benutzers in ein QLabel setzen (Platzhalter bis dekodiert)."""
+    label._avatar_user = user
+
+    def ready(pm):
+        if getattr(label, "_avatar_user", None) == user:
+            label.setPixmap(pm)
+
+    label.setPixmap(get_avatar_cache().get(
+        user, size, use_profile, label.devicePixelRatioF(), callback=ready
+    ))
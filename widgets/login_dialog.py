@@ -1,13 +1,18 @@
 from pathlib import Path
 from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QFrame, QMenu, QToolButton, QMessageBox
+    QFrame, QToolButton, QMessageBox
 )
 from PySide6.QtCore import Qt, Signal, QPoint
-from PySide6.QtGui import QFont, QPixmap, QPainter, QPainterPath, QColor, QAction, QPen
+from PySide6.QtGui import QFont, QPainter
+
+from core.theme import ensure_theme, set_style_state
+from core.users import UserDirectory
+from core.wallpaper import get_wallpaper_cache
+from widgets.avatar import get_avatar_cache, set_avatar
+from widgets.user_picker import UserPicker
 
 ROOT = Path(__file__).resolve().parents[1]
-WALL = ROOT / "assets" / "wallpapers" / "win10.jpg"
 
 # Sound-Import (optional fallback)
 try:
@@ -17,64 +22,6 @@ except Exception:
     SOUND_AVAILABLE = False
     SoundPlayer = None
 
-# ---------- Avatar-Helfer ----------
-def _avatar(size: int, fg="#d0d0d0", use_profile=True):
-    ROOT = Path(__file__).resolve().parents[1]
-    PROFILE_IMG = ROOT / "assets" / "profile" / "profile.png"
-    
-    # Versuche Profilbild zu laden (nur wenn use_profile=True)
-    if use_profile and PROFILE_IMG.exists():
-        original = QPixmap(str(PROFILE_IMG))
-        if not original.isNull():
-            original = original.scaledToWidth(size, Qt.SmoothTransformation)
-            out = QPixmap(size, size)
-            out.fill(Qt.transparent)
-            path = QPainterPath()
-            path.addEllipse(0, 0, size, size)
-            p = QPainter(out)
-            p.setRenderHint(QPainter.Antialiasing, True)
-            p.setClipPath(path)
-            x = (size - original.width()) // 2
-            y = (size - original.height()) // 2
-            p.drawPixmap(x, y, original)
-            p.end()
-            p = QPainter(out)
-            p.setRenderHint(QPainter.Antialiasing, True)
-            p.setPen(QPen(QColor("#d0d0d0"), 2))
-            p.setBrush(Qt.NoBrush)
-            p.drawEllipse(0, 0, size-1, size-1)
-            p.end()
-            return out
-    
-    # Fallback: Graue Silhouette
-    pm = QPixmap(size, size)
-    pm.fill(Qt.transparent)
-    base = QPixmap(size, size)
-    base.fill(Qt.transparent)
-    p = QPainter(base)
-    p.setRenderHint(QPainter.Antialiasing, True)
-    p.setBrush(QColor(fg))
-    p.setPen(Qt.NoPen)
-    r = int(size*0.44)
-    x = int((size-r)/2)
-    y = int(size*0.12)
-    p.drawEllipse(x, y, r, r)
-    p.drawRoundedRect(int(size*0.16), int(size*0.52), int(size*0.68), int(size*0.34), 22, 22)
-    p.end()
-    path = QPainterPath()
-    path.addEllipse(0, 0, size, size)
-    out = QPixmap(size, size)
-    out.fill(Qt.transparent)
-    p = QPainter(out)
-    p.setRenderHint(QPainter.Antialiasing, True)
-    p.setClipPath(path)
-    p.drawPixmap(0, 0, base)
-    p.setPen(QPen(QColor("#d0d0d0"), 2))
-    p.setBrush(Qt.NoBrush)
-    p.drawEllipse(0, 0, size-1, size-1)
-    p.end()
-    return out
-
 # ---------- Kachel unten links (wie Win10) ----------
 class TileButton(QFrame):
     clicked = Signal()
@@ -88,26 +35,17 @@ class TileButton(QFrame):
         h.setSpacing(12)
         self.icon = QLabel(self)
         # Nutze Profilbild nur wenn use_profile=True
-        self.icon.setPixmap(_avatar(28, use_profile=use_profile))
+        set_avatar(self.icon, text, 28, use_profile=use_profile)
         self.icon.setFixedSize(28, 28)
         self.lbl = QLabel(text, self)
-        self.lbl.setStyleSheet("color: white; font-size: 14px;")
+        self.lbl.setObjectName("tiletext")
         h.addWidget(self.icon, 0, Qt.AlignVCenter)
         h.addWidget(self.lbl, 1, Qt.AlignVCenter)
         h.addStretch(0)
         self._apply()
     def _apply(self):
-        if self._selected:
-            # Windows-10 Blau
-            self.setStyleSheet("""
-                TileButton { background: #136fd1; border-radius: 4px; }
-                TileButton > QLabel { background: transparent; }
-            """)
-        else:
-            self.setStyleSheet("""
-                TileButton { background: rgba(0,0,0,0.25); border-radius: 4px; }
-                TileButton > QLabel { background: transparent; }
-            """)
+        # ausgewählt = Windows-10 Blau (Stylesheet: core.theme)
+        set_style_state(self, "selected", self._selected)
     def setSelected(self, sel: bool):
         self._selected = sel
         self._apply()
@@ -125,23 +63,21 @@ class LoginDialog(QDialog):
         # Fenstergröße/Look
         self.setWindowTitle("Windows-Anmeldung")
         self.setFixedSize(1920, 1080)
-        if WALL.exists():
-            self.setStyleSheet(f"""
-                QDialog {{
-                    background-image: url("{WALL.as_posix().replace('\\', '/')}");
-                    background-position: center;
-                    background-repeat: no-repeat;
-                    background-attachment: fixed;
-                    background-color: #0b1e3a;
-                    font-family: 'Segoe UI';
-                }}
-            """)
-        else:
-            self.setStyleSheet("QDialog{background:#0b1e3a;font-family:'Segoe UI';}")
-
-        # Benutzer & Passwörter
-        self._user_to_pwd = {u["username"]: u.get("password","") for u in users}
-        self._current_user = next(iter(self._user_to_pwd.keys()), "Benutzer")
+        # Wallpaper kommt aus dem gemeinsamen Cache (siehe paintEvent) statt
+        # aus einem Stylesheet-background-image.
+        self._wallpaper = get_wallpaper_cache()
+        self._wallpaper.changed.connect(self.update)
+        self._wallpaper.source()
+        ensure_theme()
+
+        # Benutzer & Passwörter (UserDirectory oder Liste aus load_users())
+        self._users = users if isinstance(users, UserDirectory) else UserDirectory.from_dicts(users)
+        # optionale Profilbilder pro Benutzer (users.yaml: avatar: <pfad>)
+        avatars = get_avatar_cache()
+        for name, path in self._users.avatars().items():
+            avatars.set_profile(name, path)
+        self._current_user = self._users.entry(0).username if len(self._users) else "Benutzer"
+        self._picker = None  # Auswahl-Popup, beim ersten Öffnen erzeugt
 
         # ===== Layout-Gerüst =====
         root = QVBoxLayout(self)
@@ -153,15 +89,15 @@ class LoginDialog(QDialog):
         center = QVBoxLayout()
         center.setSpacing(12)
 
-        avatar_lbl = QLabel(self)
-        avatar_lbl.setPixmap(_avatar(120, use_profile=True))
-        avatar_lbl.setFixedSize(120, 120)
-        avatar_lbl.setAlignment(Qt.AlignHCenter|Qt.AlignVCenter)
-        center.addWidget(avatar_lbl, 0, Qt.AlignHCenter)
+        self.avatar_lbl = QLabel(self)
+        set_avatar(self.avatar_lbl, self._current_user, 120)
+        self.avatar_lbl.setFixedSize(120, 120)
+        self.avatar_lbl.setAlignment(Qt.AlignHCenter|Qt.AlignVCenter)
+        center.addWidget(self.avatar_lbl, 0, Qt.AlignHCenter)
 
         self.user_lbl = QLabel(self._current_user, self)
         self.user_lbl.setAlignment(Qt.AlignHCenter)
-        self.user_lbl.setStyleSheet("color:white;")
+        self.user_lbl.setObjectName("username")
         self.user_lbl.setFont(QFont("Segoe UI", 28))
         center.addWidget(self.user_lbl, 0, Qt.AlignHCenter)
 
@@ -170,34 +106,6 @@ class LoginDialog(QDialog):
         pw_row.setSpacing(0)
         pw_container = QFrame(self)
         pw_container.setObjectName("pwbox")
-        pw_container.setStyleSheet("""
-            #pwbox { 
-                background: white; 
-                border: 1px solid #ccc; 
-                border-radius: 3px; 
-            }
-            #pwedit { 
-                border: none; 
-                padding: 8px 12px; 
-                color: black; 
-                font-size: 14px; 
-                background: white;
-                selection-background-color: #0078d4; 
-            }
-            #pwedit::placeholder { 
-                color: #999; 
-            }
-            #arrow { 
-                border-left: 1px solid #ddd; 
-                background: white; 
-                color: black; 
-                font-size: 16px; 
-            }
-            #arrow:hover { 
-                background: #f0f0f0; 
-            }
-        """)
-        pw_container.setObjectName("pwbox")
         h = QHBoxLayout(pw_container)
         h.setContentsMargins(6,3,6,3)
         h.setSpacing(0)
@@ -220,7 +128,7 @@ class LoginDialog(QDialog):
 
         # Fehlermeldung
         self.msg = QLabel("", self)
-        self.msg.setStyleSheet("color:#ffb3b3;")
+        self.msg.setObjectName("loginmsg")
         self.msg.setAlignment(Qt.AlignHCenter)
         center.addWidget(self.msg, 0, Qt.AlignHCenter)
 
@@ -236,7 +144,7 @@ class LoginDialog(QDialog):
         left.setSpacing(6)
         left.setContentsMargins(0, 0, 0, 0)
         subtitle = QLabel("Anderer Benutzer:", self)
-        subtitle.setStyleSheet("color:rgba(255,255,255,0.85); font-size:12px; margin:0px;")
+        subtitle.setObjectName("subtitle")
         left.addWidget(subtitle, 0, Qt.AlignLeft)
 
         self.tile_current = TileButton(self._current_user, selected=True, use_profile=True, parent=self)
@@ -255,11 +163,8 @@ class LoginDialog(QDialog):
             b = QToolButton(self)
             b.setText(txt)
             b.setToolTip(tooltip)
+            b.setObjectName("sysbtn")
             b.setFixedSize(36, 36)
-            b.setStyleSheet("""
-                QToolButton { color:white; background:rgba(0,0,0,0.35); border-radius:4px; }
-                QToolButton:hover { background:rgba(255,255,255,0.12); }
-            """)
             if callback:
                 b.clicked.connect(callback)
             return b
@@ -276,35 +181,39 @@ class LoginDialog(QDialog):
         # Fokus
         self.pw.setFocus()
 
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        self._wallpaper.paint(painter, self, event.rect())
+        painter.end()
+
     # ---- Logik ----
     def _select_user(self, name: str):
         self._current_user = name
         self.user_lbl.setText(name)
+        set_avatar(self.avatar_lbl, name, 120)
         self.tile_current.lbl.setText(name)
+        set_avatar(self.tile_current.icon, name, 28)
         self.tile_current.setSelected(True)
         self.tile_other.setSelected(False)
         self.msg.clear()
         self.pw.clear()
 
     def _choose_other_user(self):
-        menu = QMenu(self)
         # alle Nutzer anbieten, außer aktuellem
-        for uname in self._user_to_pwd.keys():
-            if uname == self._current_user:
-                continue
-            act = QAction(uname, menu)
-            act.triggered.connect(lambda chk=False, u=uname: self._select_user(u))
-            menu.addAction(act)
-        if not menu.actions():
+        others = len(self._users) - (self._current_user in self._users)
+        if others <= 0:
             # nur ein Nutzer vorhanden -> nichts zu wählen
             self.tile_other.setSelected(False)
             return
-        # Menü unter der Kachel öffnen
-        p = self.tile_other.mapToGlobal(QPoint(self.tile_other.width()//2, self.tile_other.height()))
-        menu.exec(p)
+        if self._picker is None:
+            self._picker = UserPicker(self._users, self)
+            self._picker.chosen.connect(self._select_user)
+        # Popup unter der Kachel öffnen
+        p = self.tile_other.mapToGlobal(QPoint(0, self.tile_other.height() + 4))
+        self._picker.popup(p, max(self.tile_other.width(), 280), exclude=self._current_user)
 
     def try_login(self):
-        if self._user_to_pwd.get(self._current_user, "") == self.pw.text():
+        if self._users.check(self._current_user, self.pw.text()):
             if self.sound:
                 self.sound.play_unlock()
             self.accept()
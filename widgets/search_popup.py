@@ -0,0 +1,130 @@
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QEvent, QModelIndex, QPoint
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QListView, QAbstractItemView
+
+from core.search import get_search_service
+
+ROW_HEIGHT = 34
+POPUP_WIDTH = 340
+_KIND_ICONS = {"app": "▣", "document": "🗎", "file": "📄"}
+
+
+class SearchResultModel(QAbstractListModel):
+    """Trefferliste (höchstens MAX_RESULTS Zeilen)."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._entries = []
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self._entries = list(entries)
+        self.endResetModel()
+
+    def entry(self, row):
+        return self._entries[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._entries)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        e = self._entries[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{_KIND_ICONS.get(e.kind, '')}  {e.title}"
+        if role == Qt.ToolTipRole:
+            return e.detail or None
+        return None
+
+
+class SearchPopup(QFrame):
+    """Ergebnisliste der Taskleisten-Suche, über dem Suchfeld eingeblendet.
+
+    Kind des Desktop-Fensters statt eigenem Popup-Fenster: der Fokus bleibt
+    im Suchfeld, getippt wird weiter. Jeder Tastendruck fragt die Indizes
+    des SearchService direkt ab; ↑/↓ wählt, Enter öffnet, Esc schließt.
+    """
+    chosen = Signal(object)  # SearchEntry
+
+    def __init__(self, edit, parent):
+        super().__init__(parent)
+        self.setObjectName("searchpopup")  # Aussehen: core.theme
+        self.edit = edit
+        self.service = get_search_service()
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        self.model = SearchResultModel(self)
+        # höchstens MAX_RESULTS Zeilen -> QListView reicht (lange Listen: siehe user_picker)
+        self.view = QListView(self)
+        self.view.setModel(self.model)
+        self.view.setUniformItemSizes(True)
+        self.view.setFocusPolicy(Qt.NoFocus)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.view.clicked.connect(lambda idx: self._choose(idx.row()))
+        layout.addWidget(self.view)
+        self.hide()
+        edit.textChanged.connect(self._on_text)
+        edit.returnPressed.connect(self._choose_current)
+        edit.installEventFilter(self)
+        self.service.changed.connect(self._refresh)
+
+    def _on_text(self, text):
+        entries = self.service.search(text) if text.strip() else []
+        self.model.set_entries(entries)
+        if not entries:
+            self.hide()
+            return
+        self.view.setCurrentIndex(self.model.index(0))
+        self._show_above_edit(len(entries))
+
+    def _refresh(self):
+        # Index hat sich geändert (Dateien, Szenario) - offene Liste nachziehen
+        if self.isVisible():
+            self._on_text(self.edit.text())
+
+    def _show_above_edit(self, rows):
+        height = rows * ROW_HEIGHT + 10
+        self.view.setFixedHeight(rows * ROW_HEIGHT + 2)
+        top_left = self.edit.mapTo(self.parentWidget(), QPoint(0, 0))
+        self.setGeometry(top_left.x(), top_left.y() - height - 6, POPUP_WIDTH, height)
+        self.raise_()
+        self.show()
+
+    def dismiss(self):
+        self.hide()
+        self.edit.blockSignals(True)
+        self.edit.clear()
+        self.edit.blockSignals(False)
+        self.model.set_entries([])
+
+    def _choose_current(self):
+        idx = self.view.currentIndex()
+        if self.isVisible() and idx.isValid():
+            self._choose(idx.row())
+
+    def _choose(self, row):
+        entry = self.model.entry(row)
+        self.dismiss()
+        self.edit.clearFocus()
+        self.chosen.emit(entry)
+
+    def eventFilter(self, obj, event):
+        if obj is self.edit:
+            kind = event.type()
+            if kind == QEvent.ShortcutOverride and event.key() == Qt.Key_Escape and self.edit.text():
+                event.accept()  # Esc leert die Suche, statt den Desktop zu schließen
+                return True
+            if kind == QEvent.KeyPress:
+                if event.key() == Qt.Key_Escape and self.edit.text():
+                    self.dismiss()
+                    return True
+                if event.key() in (Qt.Key_Up, Qt.Key_Down) and self.isVisible():
+                    row = self.view.currentIndex().row() + (1 if event.key() == Qt.Key_Down else -1)
+                    if 0 <= row < self.model.rowCount():
+                        self.view.setCurrentIndex(self.model.index(row))
+                    return True
+            elif kind == QEvent.FocusOut and not self.underMouse():
+                self.hide()
+            elif kind == QEvent.FocusIn and self.edit.text():
+                self._on_text(self.edit.text())
+        return super().eventFilter(obj, event)
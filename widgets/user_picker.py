@@ -0,0 +1,155 @@
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QSize, QTimer
+from PySide6.QtWidgets import QFrame, QVBoxLayout, QLineEdit, QTableView, QHeaderView, QAbstractItemView
+
+from widgets.avatar import get_avatar_cache
+
+AVATAR_SIZE = 28
+PICKER_ROWS = 8  # sichtbare Zeilen
+ROW_HEIGHT = 36
+
+
+class UserListModel(QAbstractListModel):
+    """Gefilterte Sicht auf ein UserDirectory.
+
+    Ohne Filter wird nichts kopiert: Zeile -> Position rechnet direkt über
+    das Verzeichnis (aktueller Benutzer wird übersprungen). Avatare werden
+    erst angefragt, wenn die View eine Zeile zeichnet.
+    """
+    def __init__(self, directory, parent=None):
+        super().__init__(parent)
+        self._directory = directory
+        self._rows = None      # None = alle Benutzer, sonst Liste von Positionen
+        self._exclude = None   # Position des aktuellen Benutzers
+        self._dpr = 1.0
+        self._refresh = QTimer(self)
+        self._refresh.setSingleShot(True)
+        self._refresh.setInterval(0)
+        self._refresh.timeout.connect(self._avatars_ready)
+
+    def set_device_pixel_ratio(self, dpr):
+        self._dpr = dpr
+
+    def configure(self, text="", exclude=None):
+        """Filter (Wortpräfix) und ausgeschlossenen Benutzer setzen."""
+        self.beginResetModel()
+        self._exclude = self._directory.position(exclude) if exclude else None
+        if text.strip():
+            self._rows = [p for p in self._directory.search(text) if p != self._exclude]
+        else:
+            self._rows = None
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        if self._rows is not None:
+            return len(self._rows)
+        return len(self._directory) - (self._exclude is not None)
+
+    def position(self, row):
+        if self._rows is not None:
+            return self._rows[row]
+        if self._exclude is not None and row >= self._exclude:
+            return row + 1
+        return row
+
+    def user_at(self, row):
+        return self._directory.entry(self.position(row)).username
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            return self.user_at(index.row())
+        if role == Qt.DecorationRole:
+            return get_avatar_cache().get(self.user_at(index.row()), AVATAR_SIZE, True, self._dpr,
+                                          callback=lambda _pm: self._refresh.start())
+        return None
+
+    def _avatars_ready(self):
+        # mehrere fertig dekodierte Avatare zusammenfassen; neu gezeichnet wird nur Sichtbares
+        rows = self.rowCount()
+        if rows:
+            self.dataChanged.emit(self.index(0), self.index(rows - 1), [Qt.DecorationRole])
+
+
+class UserPicker(QFrame):
+    """Popup zur Benutzerauswahl: Filterfeld + virtualisierte Liste.
+
+    Wird einmal erzeugt und bei jedem Öffnen wiederverwendet; das Öffnen
+    kostet unabhängig von der Benutzerzahl gleich viel.
+    """
+    chosen = Signal(str)
+
+    def __init__(self, directory, parent=None):
+        super().__init__(parent, Qt.Popup)
+        self.setObjectName("userpicker")  # Aussehen: core.theme
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(4, 4, 4, 4)
+        layout.setSpacing(4)
+        self.filter_edit = QLineEdit(self)
+        self.filter_edit.setPlaceholderText("Benutzer suchen")
+        self.filter_edit.textChanged.connect(self._on_filter)
+        self.filter_edit.returnPressed.connect(self._choose_current)
+        self.filter_edit.installEventFilter(self)
+        layout.addWidget(self.filter_edit)
+        self.model = UserListModel(directory, self)
+        # Tabelle mit einer Spalte und fester Zeilenhöhe: das Layout kostet unabhängig
+        # von der Zeilenzahl gleich viel. QListView legt auch mit setUniformItemSizes(True)
+        # für jede Zeile eine Position an (200 000 Benutzer: ~1 s statt ~3 ms beim Öffnen);
+        # für kurze Listen wie die Taskleisten-Suche spielt das keine Rolle.
+        self.view = QTableView(self)
+        self.view.setModel(self.model)
+        self.view.horizontalHeader().hide()
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.view.setShowGrid(False)
+        self.view.setWordWrap(False)
+        self.view.setIconSize(QSize(AVATAR_SIZE, AVATAR_SIZE))
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.view.setFixedHeight(ROW_HEIGHT * PICKER_ROWS + 4)
+        self.view.clicked.connect(lambda idx: self._choose(idx.row()))
+        self.view.activated.connect(lambda idx: self._choose(idx.row()))
+        layout.addWidget(self.view)
+        self._exclude = None
+
+    def popup(self, pos, width, exclude=None):
+        """Unter `pos` (global) öffnen; `exclude` wird nicht angeboten."""
+        self._exclude = exclude
+        self.model.set_device_pixel_ratio(self.devicePixelRatioF())
+        self.filter_edit.blockSignals(True)
+        self.filter_edit.clear()
+        self.filter_edit.blockSignals(False)
+        self._on_filter("")
+        self.setFixedWidth(width)
+        self.move(pos)
+        self.show()
+        self.filter_edit.setFocus()
+
+    def _on_filter(self, text):
+        self.model.configure(text, self._exclude)
+        if self.model.rowCount():
+            self.view.setCurrentIndex(self.model.index(0))
+        self.view.scrollToTop()
+
+    def _choose_current(self):
+        idx = self.view.currentIndex()
+        if idx.isValid():
+            self._choose(idx.row())
+
+    def _choose(self, row):
+        user = self.model.user_at(row)
+        self.hide()
+        self.chosen.emit(user)
+
+    def eventFilter(self, obj, event):
+        # Pfeiltasten im Filterfeld bewegen die Auswahl in der Liste
+        if obj is self.filter_edit and event.type() == event.Type.KeyPress \
+                and event.key() in (Qt.Key_Up, Qt.Key_Down, Qt.Key_PageUp, Qt.Key_PageDown):
+            self.view.keyPressEvent(event)
+            return True
+        return super().eventFilter(obj, event)